@@ -1,8 +1,72 @@
 import sys, os, random, pygame
-sys.path.append(os.path.join("objects"))
-import SudokuSquare
-from utils import *
-from GameResources import *
+from .objects import SudokuSquare
+from .utils import *
+from .objects.GameResources import *
+
+BACKGROUND_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images", "sudoku-board-bare.jpg")
+TILE_SIZE = (45, 40)
+FILLED_COLOR = (2, 204, 186)
+EMPTY_COLOR = (255, 255, 255)
+
+
+def square_position(x, y):
+    """The top left corner of the square in column x and row y of the board image."""
+    if x in (0, 1, 2):  startX = (x * 57) + 38
+    if x in (3, 4, 5):  startX = (x * 57) + 99
+    if x in (6, 7, 8):  startX = (x * 57) + 159
+
+    if y in (0, 1, 2):  startY = (y * 57) + 35
+    if y in (3, 4, 5):  startY = (y * 57) + 100
+    if y in (6, 7, 8):  startY = (y * 57) + 165
+    return startX, startY
+
+
+def square_digit(value):
+    """The digit to show for a box value, or '' when the box is not yet solved."""
+    if len(value) > 1 or value == '' or value == '.':
+        return ''
+    return value
+
+
+class BoardRenderer:
+    """Draws a board onto a surface, redrawing only the squares that changed.
+
+    The two tile styles and the ten glyphs (blank and 1-9) are rendered once, so
+    drawing a square is just two blits. draw() returns the dirty rects to pass to
+    pygame.display.update().
+    """
+    def __init__(self, surface, background):
+        self.surface = surface
+        self.background = background
+        font = SudokuSquare.getFont()
+        self.glyphs = {digit: font.render(digit, 1, (255, 255, 255))
+                       for digit in [''] + list(cols)}
+        self.tiles = {False: SudokuSquare.getTile(EMPTY_COLOR, TILE_SIZE),
+                      True: SudokuSquare.getTile(FILLED_COLOR, TILE_SIZE)}
+        self.rects = {}
+        for y in range(9):
+            for x in range(9):
+                self.rects[rows[y] + cols[x]] = pygame.Rect(square_position(x, y), TILE_SIZE)
+        self.shown = None
+
+    def draw(self, values):
+        """Draw the board for values; returns the list of rects that changed."""
+        digits = {box: square_digit(values[box]) for box in self.rects}
+        if self.shown is None:
+            self.surface.blit(self.background, (0, 0))
+            changed = list(self.rects)
+            dirty = [self.surface.get_rect()]
+        else:
+            changed = [box for box in self.rects if digits[box] != self.shown[box]]
+            dirty = [self.rects[box] for box in changed]
+        for box in changed:
+            rect = self.rects[box]
+            # Restore the background behind the rounded corners first
+            self.surface.blit(self.background, rect, rect)
+            self.surface.blit(self.tiles[digits[box] != ''], rect)
+            self.surface.blit(self.glyphs[digits[box]], rect.move(17, 4))
+        self.shown = digits
+        return dirty
 
 
 def play(values, result, history):
@@ -12,38 +76,14 @@ def play(values, result, history):
     size = width, height = 700, 700
     screen = pygame.display.set_mode(size)
 
-    background_image = pygame.image.load("./images/sudoku-board-bare.jpg").convert()
+    background_image = pygame.image.load(BACKGROUND_IMAGE).convert()
+    renderer = BoardRenderer(screen, background_image)
 
     clock = pygame.time.Clock()
 
     while True:
         pygame.event.pump()
-        theSquares = []
-        initXLoc = 0
-        initYLoc = 0
-        startX, startY, editable, number = 0, 0, "N", 0
-        for y in range(9):
-            for x in range(9):
-                if x in (0, 1, 2):  startX = (x * 57) + 38
-                if x in (3, 4, 5):  startX = (x * 57) + 99
-                if x in (6, 7, 8):  startX = (x * 57) + 159
-
-                if y in (0, 1, 2):  startY = (y * 57) + 35
-                if y in (3, 4, 5):  startY = (y * 57) + 100
-                if y in (6, 7, 8):  startY = (y * 57) + 165
-                string_number = values[rows[y] + cols[x]]
-                if len(string_number) > 1 or string_number == '' or string_number == '.':
-                    number = None
-                else:
-                    number = int(string_number)
-                theSquares.append(SudokuSquare.SudokuSquare(number, startX, startY, editable, x, y))
-
-        screen.blit(background_image, (0, 0))
-        for num in theSquares:
-            num.draw()
-
-        pygame.display.flip()
-        pygame.display.update()
+        pygame.display.update(renderer.draw(values))
         clock.tick(5)
 
         if len(assignments) == 0:
@@ -0,0 +1,228 @@
+"""Conflict-directed backjumping search for Sudoku puzzles
+
+This is an optional alternative to `solution.search`. Every candidate removal is
+tagged with the set of search decisions that caused it, stored as a bitmask of
+decision levels (bit k is set when the decision made at depth k is involved; the
+givens are facts and never appear in a mask). When a branch fails, the mask of the
+contradiction tells the search which earlier decisions were responsible, so it can
+jump straight back over the levels that had nothing to do with the failure instead
+of retrying their remaining candidates. Each failure is also recorded as a nogood
+(a combination of assignments that cannot all hold), and a bounded store of those
+nogoods prunes the same conflict when it shows up again elsewhere in the tree.
+"""
+from collections import OrderedDict, defaultdict
+
+from . import utils
+from .solution import peers, unitlist
+
+DIGITS = "123456789"
+
+
+class NogoodStore:
+    """A bounded store of learned nogoods
+
+    A nogood is a frozenset of (box, digit) assignments that can never all hold in
+    a solution of the current puzzle. When the store is full the least recently
+    used nogood is evicted.
+
+    Parameters
+    ----------
+    max_nogoods(int)
+        the maximum number of nogoods kept for the rest of the solve
+    """
+
+    def __init__(self, max_nogoods=1000):
+        self.max_nogoods = max_nogoods
+        self._nogoods = OrderedDict()
+        self._index = defaultdict(set)
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._nogoods)
+
+    def add(self, nogood):
+        """Record a nogood, evicting the least recently used one if needed"""
+        if not nogood or self.max_nogoods <= 0:
+            return
+        if nogood in self._nogoods:
+            self._nogoods.move_to_end(nogood)
+            return
+        self._nogoods[nogood] = None
+        for assignment in nogood:
+            self._index[assignment].add(nogood)
+        if len(self._nogoods) > self.max_nogoods:
+            evicted, _ = self._nogoods.popitem(last=False)
+            for assignment in evicted:
+                self._index[assignment].discard(evicted)
+
+    def match(self, values, assignment):
+        """Return a nogood containing `assignment` whose assignments all hold in
+        `values`, or None if there is no such nogood"""
+        for nogood in self._index.get(assignment, ()):
+            if all(values[box] == digit for box, digit in nogood):
+                self._nogoods.move_to_end(nogood)
+                self.hits += 1
+                return nogood
+        return None
+
+
+def _solved_reason(values, reasons, box):
+    """The decisions responsible for `box` being reduced to its single value"""
+    mask = 0
+    for digit in DIGITS:
+        if digit not in values[box]:
+            mask |= reasons.get((box, digit), 0)
+    return mask
+
+
+def _remove(values, reasons, box, digit, mask):
+    """Remove `digit` from `box` because of the decisions in `mask`
+
+    Returns the conflict mask if the box is left empty, otherwise None.
+    """
+    values[box] = values[box].replace(digit, "")
+    reasons[(box, digit)] = mask
+    if not values[box]:
+        return _solved_reason(values, reasons, box)
+    return None
+
+
+def propagate(values, reasons):
+    """Apply the eliminate and only choice strategies to a fixpoint while keeping
+    track of the decisions responsible for every candidate removal
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}; updated in place
+
+    reasons(dict)
+        a dictionary of the form {(box, digit): mask} recording the decision levels
+        that caused each removal; updated in place
+
+    Returns
+    -------
+    int or None
+        None if no contradiction was found, otherwise the bitmask of the decision
+        levels responsible for the contradiction
+    """
+    changed = True
+    while changed:
+        changed = False
+
+        # Eliminate
+        for box in utils.boxes:
+            if len(values[box]) != 1:
+                continue
+            digit = values[box]
+            mask = None
+            for peer in peers[box]:
+                if digit in values[peer]:
+                    if mask is None:
+                        mask = _solved_reason(values, reasons, box)
+                    conflict = _remove(values, reasons, peer, digit, mask)
+                    if conflict is not None:
+                        return conflict | mask
+                    changed = True
+
+        # Only choice
+        for unit in unitlist:
+            for digit in DIGITS:
+                dplaces = [box for box in unit if digit in values[box]]
+                if not dplaces:
+                    mask = 0
+                    for box in unit:
+                        mask |= reasons.get((box, digit), 0)
+                    return mask
+                if len(dplaces) == 1 and len(values[dplaces[0]]) > 1:
+                    place = dplaces[0]
+                    mask = 0
+                    for box in unit:
+                        if box != place:
+                            mask |= reasons.get((box, digit), 0)
+                    for other in values[place].replace(digit, ""):
+                        _remove(values, reasons, place, other, mask)
+                    changed = True
+
+    return None
+
+
+def _search(values, reasons, nogoods, path, budget):
+    """Recursive worker for `search_backjump`
+
+    `path` holds the (box, digit) decision made at each level, with None standing
+    in for the root at level 0. Returns a (solution, conflict) pair; the solution is
+    None when the subtree fails, in which case conflict is the bitmask of the
+    responsible decisions.
+    """
+    if budget is not None:
+        budget.check()
+    conflict = propagate(values, reasons)
+    if conflict is None and budget is not None:
+        budget.record(values)
+    if conflict is None and path[-1] is not None:
+        nogood = nogoods.match(values, path[-1])
+        if nogood is not None:
+            conflict = 0
+            for box, _ in nogood:
+                conflict |= _solved_reason(values, reasons, box)
+    if conflict is not None:
+        return None, conflict
+
+    if all(len(values[s]) == 1 for s in utils.boxes):
+        return values, 0
+
+    # Choose one of the unfilled squares with the fewest possibilities
+    unsolved_values = {key: value for key, value in values.items() if len(value) != 1}
+    s = min(unsolved_values, key=lambda key: len(unsolved_values[key]))
+
+    level = len(path)
+    bit = 1 << level
+    # The candidates already missing from s are part of the reason it runs dry
+    conflict_set = _solved_reason(values, reasons, s)
+    for digit in values[s]:
+        new_values = values.copy()
+        new_reasons = reasons.copy()
+        for other in values[s].replace(digit, ""):
+            _remove(new_values, new_reasons, s, other, bit)
+        attempt, conflict = _search(
+            new_values, new_reasons, nogoods, path + ((s, digit),), budget
+        )
+        if attempt is not None:
+            return attempt, 0
+        if not conflict & bit:
+            # This decision had nothing to do with the failure: jump over it
+            return None, conflict
+        conflict_set |= conflict & ~bit
+
+    # The decisions in the conflict set can never all hold together
+    nogoods.add(frozenset(path[k] for k in range(1, level) if conflict_set & (1 << k)))
+    return None, conflict_set
+
+
+def search_backjump(values: dict, max_nogoods: int = 1000, budget=None) -> dict | bool:
+    """Apply depth first search with conflict-directed backjumping and nogood
+    recording to solve a Sudoku puzzle
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}; the candidates it
+        already excludes are treated as facts, like the givens
+
+    max_nogoods(int)
+        the maximum number of learned nogoods kept for the rest of the solve
+
+    budget(solution.Budget)
+        if given, checked at every node; raises BudgetExhausted once exceeded
+
+    Returns
+    -------
+    dict or False
+        The values dictionary with all boxes assigned or False
+    """
+    nogoods = NogoodStore(max_nogoods)
+    attempt, _ = _search(dict(values), {}, nogoods, (None,), budget)
+    if attempt is None:
+        return False
+    return attempt
@@ -0,0 +1,321 @@
+"""Batch solving over shared memory
+
+Fanning `solution.solve` out with a `multiprocessing.Pool` pickles every grid on the
+way in and every 81-key values dictionary on the way out, which for easy puzzles
+costs more than solving them. `BatchSolver` instead copies the whole batch into
+one `multiprocessing.shared_memory` block laid out as
+
+    [ puzzles: 81 bytes each | solutions: 81 bytes each | status: 1 byte each ]
+
+and hands its long-lived workers nothing but (block name, start, stop) index
+ranges. Each worker reads its puzzles straight out of the block and writes the
+solved grids and a status byte straight back in.
+
+The workers import `solution` once when they start, so the unit and peer tables
+are already loaded (and, with the fork start method, shared with the parent)
+before the first batch arrives.
+
+Long jobs can be given a memory budget: a worker whose resident size has grown
+past it finishes its index range and exits, and a fresh one takes its place,
+which returns whatever the old one had accumulated to the operating system.
+"""
+import itertools
+import multiprocessing
+import os
+import queue
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+from . import solution
+from . import utils
+
+PENDING, SOLVED, UNSOLVED = 0, 1, 2
+
+CELLS = 81
+
+
+def encode(grids):
+    """Pack grid strings into one bytes object of 81 bytes per puzzle"""
+    data = bytearray()
+    for grid in grids:
+        if len(grid) != CELLS:
+            raise ValueError(f"A grid must have {CELLS} characters, not {len(grid)}")
+        data += grid.encode("ascii")
+    return data
+
+
+def _solve_range(buf, count, start, stop, method):
+    """Solve the puzzles start to stop of a batch buffer in place"""
+    solutions = count * CELLS
+    status = 2 * count * CELLS
+    for i in range(start, stop):
+        grid = bytes(buf[i * CELLS : (i + 1) * CELLS]).decode("ascii")
+        result = solution.solve(grid, method)
+        if result:
+            offset = solutions + i * CELLS
+            buf[offset : offset + CELLS] = utils.values2grid(result).encode("ascii")
+            buf[status + i] = SOLVED
+        else:
+            buf[status + i] = UNSOLVED
+
+
+def _decode(buf, count):
+    """Unpack the solutions of a batch buffer; None for puzzles with no solution"""
+    solutions = count * CELLS
+    status = 2 * count * CELLS
+    results = []
+    for i in range(count):
+        if buf[status + i] == SOLVED:
+            offset = solutions + i * CELLS
+            results.append(bytes(buf[offset : offset + CELLS]).decode("ascii"))
+        else:
+            results.append(None)
+    return results
+
+
+def resident_memory():
+    """Return the resident set size of this process in bytes, or None if unknown"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Only the peak is available here; it is in kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _worker(tasks, done, method, max_memory=None):
+    """Solve index ranges of shared batches until told to stop
+
+    With a memory budget, the worker exits after the range that took it over the
+    budget, reporting that it retired along with the range.
+    """
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        name, count, start, stop = task
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            _solve_range(block.buf, count, start, stop, method)
+        finally:
+            block.close()
+        # Nothing in a batch job replays the history, so do not let it pile up
+        utils.history.clear()
+        retire = max_memory is not None and (resident_memory() or 0) > max_memory
+        done.put((start, stop, os.getpid() if retire else None))
+        if retire:
+            return
+
+
+class BatchSolver:
+    """A pool of long-lived worker processes that solve batches in shared memory
+
+    Use it as a context manager, or call `close` when done, so the workers exit.
+
+    Parameters
+    ----------
+    processes(int)
+        the number of worker processes; defaults to the number of CPUs
+
+    method(string)
+        the search engine the workers pass on to `solution.solve`
+
+    chunksize(int)
+        the number of puzzles in each index range handed to a worker
+
+    max_memory(int)
+        the resident size in bytes a worker may grow to; a worker over it is
+        replaced by a fresh one once it finishes its current index range
+
+    Attributes
+    ----------
+    recycled(int)
+        the number of workers replaced for going over `max_memory`
+    """
+
+    def __init__(self, processes=None, method="search", chunksize=256, max_memory=None):
+        if method not in solution.SEARCH_METHODS:
+            raise ValueError(f"Unknown search method: {method}")
+        self.processes = processes or multiprocessing.cpu_count()
+        self.method = method
+        self.chunksize = chunksize
+        self.max_memory = max_memory
+        self.recycled = 0
+        self.tasks = multiprocessing.Queue()
+        self.done = multiprocessing.Queue()
+        # Workers register every block they attach to with the resource tracker;
+        # sharing the parent's tracker means the parent's unlink clears them too
+        resource_tracker.ensure_running()
+        self.workers = [self._start_worker() for _ in range(self.processes)]
+
+    def _start_worker(self):
+        worker = multiprocessing.Process(
+            target=_worker,
+            args=(self.tasks, self.done, self.method, self.max_memory),
+            daemon=True,
+        )
+        worker.start()
+        return worker
+
+    def _replace(self, pid):
+        """Replace the worker that retired for going over the memory budget"""
+        for i, worker in enumerate(self.workers):
+            if worker.pid == pid:
+                worker.join()
+                self.workers[i] = self._start_worker()
+                self.recycled += 1
+                return
+
+    def solve(self, grids):
+        """Solve a batch of puzzles
+
+        Parameters
+        ----------
+        grids(iterable)
+            the puzzles, as 81-character grid strings
+
+        Returns
+        -------
+        list
+            the solved grid strings in the order the puzzles were given, with None
+            for every puzzle that has no solution
+        """
+        data = encode(grids)
+        count = len(data) // CELLS
+        if not count:
+            return []
+        block = shared_memory.SharedMemory(create=True, size=count * (2 * CELLS + 1))
+        try:
+            block.buf[: len(data)] = data
+            block.buf[2 * count * CELLS : 2 * count * CELLS + count] = bytes(count)
+            ranges = 0
+            for start in range(0, count, self.chunksize):
+                stop = min(start + self.chunksize, count)
+                self.tasks.put((block.name, count, start, stop))
+                ranges += 1
+            while ranges:
+                try:
+                    _, _, retired = self.done.get(timeout=1)
+                except queue.Empty:
+                    # A retiring worker exits cleanly after reporting its range
+                    if any(worker.exitcode for worker in self.workers):
+                        raise RuntimeError("A batch worker exited unexpectedly")
+                    continue
+                if retired is not None:
+                    self._replace(retired)
+                ranges -= 1
+            return _decode(block.buf, count)
+        finally:
+            block.close()
+            block.unlink()
+
+    def close(self):
+        """Stop the workers once they finish any queued work"""
+        for _ in self.workers:
+            self.tasks.put(None)
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def solve_batch(grids, processes=None, method="search", chunksize=256, max_memory=None):
+    """Solve many puzzles across worker processes sharing memory
+
+    Parameters
+    ----------
+    grids(iterable)
+        the puzzles, as 81-character grid strings
+
+    processes(int)
+        the number of worker processes; defaults to the number of CPUs, and 1
+        solves in the current process without starting any workers
+
+    method(string)
+        the search engine passed on to `solution.solve`
+
+    chunksize(int)
+        the number of puzzles in each index range handed to a worker
+
+    max_memory(int)
+        the resident size in bytes a worker may grow to before it is replaced; see
+        `BatchSolver`. Ignored when solving in the current process.
+
+    Returns
+    -------
+    list
+        the solved grid strings in order, with None for puzzles with no solution
+    """
+    if processes == 1:
+        data = encode(grids)
+        count = len(data) // CELLS
+        buf = data + bytes(count * (CELLS + 1))
+        _solve_range(buf, count, 0, count, method)
+        return _decode(buf, count)
+    with BatchSolver(processes, method, chunksize, max_memory) as solver:
+        return solver.solve(grids)
+
+
+def solve_stream(
+    grids,
+    processes=None,
+    method="search",
+    batch_size=10000,
+    chunksize=256,
+    max_memory=None,
+):
+    """Solve a stream of puzzles, holding at most `batch_size` of them at a time
+
+    Parameters
+    ----------
+    grids(iterable)
+        the puzzles, as 81-character grid strings, e.g. from `corpus.read_puzzles`
+
+    processes(int)
+        the number of worker processes; see `solve_batch`
+
+    method(string)
+        the search engine passed on to `solution.solve`
+
+    batch_size(int)
+        the number of puzzles read and solved at a time
+
+    chunksize(int)
+        the number of puzzles in each index range handed to a worker
+
+    max_memory(int)
+        the resident size in bytes a worker may grow to; see `solve_batch`
+
+    Yields
+    ------
+    tuple
+        (puzzle, solved grid string or None) pairs, in the order given
+    """
+    grids = iter(grids)
+    solver = None
+    if processes != 1:
+        solver = BatchSolver(processes, method, chunksize, max_memory)
+    try:
+        while True:
+            batch = list(itertools.islice(grids, batch_size))
+            if not batch:
+                return
+            if solver is None:
+                results = solve_batch(batch, 1, method)
+            else:
+                results = solver.solve(batch)
+            yield from zip(batch, results)
+    finally:
+        if solver is not None:
+            solver.close()
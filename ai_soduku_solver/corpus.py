@@ -0,0 +1,113 @@
+"""Streaming readers for puzzle corpora
+
+Puzzles are read straight out of plain, gzip, bz2 or xz files without unpacking
+them to disk first. The compressed formats are decompressed a block at a time as
+the file is read, so memory stays bounded however large the archive is, and
+everything is a generator that yields one grid string at a time.
+
+Three layouts are understood, picked from the file name (after any compression
+suffix) unless given explicitly:
+
+- "lines": one puzzle per line, as the first whitespace separated field, so
+  trailing ratings or comments are ignored; blank lines and lines starting with
+  "#" are skipped
+- "sdm": one 81 character puzzle per line with 0 for empty boxes
+- "csv": a header row and a puzzle column (named puzzle, quizzes or quiz),
+  optionally with a solution column (named solution or solutions)
+
+Empty boxes may be written as "." or "0"; grids are always yielded with ".".
+"""
+import bz2
+import csv
+import gzip
+import lzma
+import os
+
+CELLS = 81
+COMPRESSION = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+FORMATS = ("lines", "sdm", "csv")
+PUZZLE_COLUMNS = ("puzzle", "quizzes", "quiz")
+SOLUTION_COLUMNS = ("solution", "solutions")
+
+_EMPTY = str.maketrans("0", ".")
+_CHARACTERS = set(".123456789")
+
+
+def open_text(path):
+    """Open a plain or compressed file for reading text, decompressing on the fly"""
+    opener = COMPRESSION.get(os.path.splitext(path)[1].lower())
+    if opener is None:
+        return open(path, newline="")
+    return opener(path, "rt", newline="")
+
+
+def detect_format(path):
+    """Guess the layout of a corpus from its file name"""
+    root, ext = os.path.splitext(path)
+    if ext.lower() in COMPRESSION:
+        ext = os.path.splitext(root)[1]
+    ext = ext.lower().lstrip(".")
+    return ext if ext in ("sdm", "csv") else "lines"
+
+
+def _grid(text, path, line):
+    grid = text.strip().translate(_EMPTY)
+    if len(grid) != CELLS or not _CHARACTERS.issuperset(grid):
+        raise ValueError(f"{path}:{line}: not a sudoku grid: {text!r}")
+    return grid
+
+
+def _read_lines(f, path):
+    for line, text in enumerate(f, 1):
+        fields = text.split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        yield _grid(fields[0], path, line), None
+
+
+def _read_csv(f, path):
+    reader = csv.reader(f)
+    header = [name.strip().lower() for name in next(reader, [])]
+    puzzle = next((header.index(n) for n in PUZZLE_COLUMNS if n in header), None)
+    if puzzle is None:
+        raise ValueError(f"{path}: no puzzle column in {header}")
+    solution = next((header.index(n) for n in SOLUTION_COLUMNS if n in header), None)
+    for line, row in enumerate(reader, 2):
+        if not row:
+            continue
+        answer = None if solution is None else _grid(row[solution], path, line)
+        yield _grid(row[puzzle], path, line), answer
+
+
+def read_pairs(path, format=None):
+    """Stream (puzzle, solution) pairs from a corpus file
+
+    Parameters
+    ----------
+    path(string)
+        the file to read; .gz, .bz2 and .xz files are decompressed as they are read
+
+    format(string)
+        "lines", "sdm" or "csv"; guessed from the file name if not given
+
+    Yields
+    ------
+    tuple
+        (puzzle, solution) grid strings; solution is None unless the file has a
+        solution column
+    """
+    format = format or detect_format(path)
+    if format not in FORMATS:
+        raise ValueError(f"Unknown corpus format: {format!r}")
+    with open_text(path) as f:
+        if format == "csv":
+            yield from _read_csv(f, path)
+        else:
+            # .sdm is one grid per line, which the line reader already handles
+            yield from _read_lines(f, path)
+
+
+def read_puzzles(path, format=None):
+    """Stream the puzzles of a corpus file as grid strings; see `read_pairs`"""
+    for puzzle, _ in read_pairs(path, format):
+        yield puzzle
@@ -0,0 +1,169 @@
+"""Headless export of solve traces to PNG frames or an animated GIF
+
+A trace is a sequence of boards, as grid strings or values dictionaries; the
+`record_trace` helper produces one from a puzzle. Frames are drawn with the same
+board background and square tiles as `PySudoku.play`, but onto an off-screen
+surface with no window, clock or event loop, so export runs at full speed. Only
+the squares that change between frames are redrawn.
+
+pygame is required; writing GIFs also requires Pillow. Both come with the
+`export` extra (pip install ai_sudoku_solver[export]).
+"""
+import os
+
+from . import solution
+from . import utils
+
+BOARD_SIZE = (700, 700)
+
+
+def record_trace(grid, strategies=None):
+    """Solve a puzzle and record the boards visited by the search
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+    strategies(sequence)
+        the strategy stack passed on to `solution.search`
+
+    Returns
+    -------
+    list
+        the grid strings of the puzzle followed by every board the search reduced
+        to, in visiting order
+    """
+    trace = [grid]
+    solution.search(utils.grid2values(grid), strategies, trace=trace)
+    return trace
+
+
+def render_frames(trace):
+    """Render a trace frame by frame without a display
+
+    The same surface is redrawn and yielded for every frame, so copy it if it needs
+    to outlive the next iteration.
+
+    Parameters
+    ----------
+    trace(iterable)
+        the boards to draw, as grid strings or values dictionaries
+
+    Yields
+    ------
+    pygame.Surface
+        the board surface after drawing each frame
+    """
+    import pygame
+
+    from . import PySudoku
+
+    pygame.font.init()
+    # No display is needed: the board is drawn onto a plain surface, so the
+    # background is not converted to a display format
+    background = pygame.image.load(PySudoku.BACKGROUND_IMAGE)
+    surface = pygame.Surface(BOARD_SIZE)
+    renderer = PySudoku.BoardRenderer(surface, background)
+    for board in trace:
+        if isinstance(board, str):
+            board = utils.grid2values(board)
+        renderer.draw(board)
+        yield surface
+
+
+def export_png(trace, directory, prefix="frame"):
+    """Write each frame of a trace to a numbered PNG file
+
+    Parameters
+    ----------
+    trace(iterable)
+        the boards to draw, as grid strings or values dictionaries
+
+    directory(string)
+        the directory to write to; it is created if missing
+
+    prefix(string)
+        the file name prefix, e.g. frame_00000.png
+
+    Returns
+    -------
+    list
+        the paths of the files written
+    """
+    import pygame
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i, surface in enumerate(render_frames(trace)):
+        path = os.path.join(directory, f"{prefix}_{i:05d}.png")
+        pygame.image.save(surface, path)
+        paths.append(path)
+    return paths
+
+
+def export_gif(trace, path, duration=200, loop=0, optimize=False):
+    """Write a trace to an animated GIF
+
+    Every frame is mapped onto the palette of the first one, which is far faster
+    than letting Pillow pick a palette per frame.
+
+    Frames are rendered as Pillow asks for them, but Pillow keeps every one (one
+    byte per pixel, about 490 KB for the 700x700 board) until it writes the file,
+    so memory grows with the length of the trace: a 1000-board trace needs about
+    half a gigabyte. Use `export_png`, which holds one frame at a time, for long
+    traces.
+
+    Parameters
+    ----------
+    trace(iterable)
+        the boards to draw, as grid strings or values dictionaries
+
+    path(string)
+        the file to write
+
+    duration(int)
+        how long each frame is shown, in milliseconds
+
+    loop(int)
+        how many times the animation repeats; 0 repeats forever
+
+    optimize(bool)
+        let Pillow shrink the file by storing only the changed area of each frame;
+        much smaller output, but an order of magnitude slower to write
+
+    Returns
+    -------
+    int
+        the number of frames written
+    """
+    import pygame
+    from PIL import Image
+
+    count = 0
+    palette = None
+
+    def quantized():
+        nonlocal count, palette
+        for surface in render_frames(trace):
+            frame = Image.frombytes(
+                "RGB", BOARD_SIZE, pygame.image.tobytes(surface, "RGB")
+            )
+            if palette is None:
+                palette = frame.quantize(256)
+            count += 1
+            yield frame.quantize(palette=palette, dither=Image.Dither.NONE)
+
+    frames = quantized()
+    first = next(frames, None)
+    if first is not None:
+        # Pillow takes the rest of the frames from the generator as it goes
+        first.save(
+            path,
+            save_all=True,
+            append_images=frames,
+            duration=duration,
+            loop=loop,
+            optimize=optimize,
+        )
+    return count
@@ -0,0 +1,110 @@
+"""Difficulty grading for Sudoku puzzles
+
+A puzzle is rated by the hardest tier of strategies it needs. The tiers are tried
+in a fixed escalation order, each one adding its strategies to the stack that
+`solution.reduce_puzzle` runs, and each one starting from the state the previous
+tier stalled on:
+
+1. singles: eliminate and only choice
+2. subsets: naked subsets and locked candidates
+3. fish: X-Wing, Swordfish and Jellyfish
+4. search: depth first search over the full strategy stack
+
+When search is required the grade also reports how many branches it explored.
+"""
+from collections import namedtuple
+
+from . import corpus
+from . import solution
+from . import strategies
+from . import utils
+
+TIERS = (
+    ("singles", (solution.eliminate, solution.only_choice)),
+    ("subsets", (strategies.naked_subsets, strategies.locked_candidates)),
+    ("fish", (strategies.x_wing, strategies.swordfish, strategies.jellyfish)),
+)
+
+Grade = namedtuple("Grade", ["tier", "level", "branches"])
+Grade.__doc__ = """The difficulty of a puzzle
+
+tier is the name of the hardest tier needed ("singles", "subsets", "fish" or
+"search"), or "invalid" if the puzzle has no solution; level is its position in the
+escalation order (1 to 4, or 0 when invalid); branches is the number of branches
+search explored, 0 unless search was needed.
+"""
+
+
+def grade(grid):
+    """Rate a Sudoku puzzle by the hardest strategy tier needed to solve it
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+        Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    Returns
+    -------
+    Grade
+        the tier, its level and the number of search branches
+    """
+    values = utils.grid2values(grid)
+    stack = ()
+    for level, (tier, tier_strategies) in enumerate(TIERS, 1):
+        stack += tier_strategies
+        values = solution.reduce_puzzle(values, stack)
+        if values is False:
+            return Grade("invalid", 0, 0)
+        if all(len(values[box]) == 1 for box in utils.boxes):
+            return Grade(tier, level, 0)
+
+    stats = solution.SolveStats()
+    if not solution.search(values, stack, stats):
+        return Grade("invalid", 0, stats.branches)
+    return Grade("search", len(TIERS) + 1, stats.branches)
+
+
+def grade_many(grids, processes=None, chunksize=64):
+    """Grade many puzzles across worker processes
+
+    Parameters
+    ----------
+    grids(iterable)
+        the puzzles to grade, as grid strings
+
+    processes(int)
+        the number of worker processes; defaults to the number of CPUs, and 1
+        grades in the current process without starting a pool
+
+    chunksize(int)
+        the number of puzzles sent to a worker at a time
+
+    Yields
+    ------
+    tuple
+        (grid, Grade) pairs, in the order the grids were given
+    """
+    if processes == 1:
+        for grid in grids:
+            yield grid, grade(grid)
+        return
+
+    import multiprocessing
+
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap(_grade_pair, grids, chunksize)
+
+
+def _grade_pair(grid):
+    return grid, grade(grid)
+
+
+def grade_file(path, processes=None, chunksize=64, format=None):
+    """Grade every puzzle in a corpus file; see `grade_many`
+
+    The file is read with `corpus.read_puzzles`, so any corpus format it knows,
+    compressed or not, can be graded.
+    """
+    yield from grade_many(corpus.read_puzzles(path, format), processes, chunksize)
@@ -0,0 +1,235 @@
+"""Iterative depth first search with an explicit stack
+
+`solution.search` recurses once per branching level, so deep searches on large
+boards risk the recursion limit and every node pays for a Python frame. This
+engine visits the same nodes in the same order in a single loop. Each stack entry
+is just (box, remaining candidates, trail mark), where the mark indexes the trail
+of reduced boards saved at the branch points; backtracking restores the board from
+the trail.
+
+The trail saves whole boards rather than logging individual changes: in CPython,
+copying an 81-entry dictionary costs about as much as logging two or three
+candidate removals through a Python-level hook, and a node typically removes
+hundreds of candidates.
+
+Because all of its state is in the `IterativeSearch` object rather than on the
+Python call stack, a search can be paused after a number of nodes and resumed
+later, or interrupted by a `solution.Budget` and picked up again.
+"""
+from . import solution
+from . import utils
+
+
+class IterativeSearch:
+    """A pausable, resumable depth first search
+
+    It explores the same nodes in the same order as `solution.search` and finds
+    the same solution.
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}; it is not modified
+
+    strategies(sequence)
+        the strategy stack passed on to `solution.reduce_puzzle` at every node
+
+    stats(solution.SolveStats)
+        if given, counts the nodes and branches of the search
+
+    trace(list)
+        if given, receives the grid string of every board the search reduces to,
+        in the order they are visited
+
+    budget(solution.Budget)
+        if given, checked at every node; BudgetExhausted propagates out of `run`,
+        after which the search can be resumed with a new budget
+
+    shard(tuple)
+        (index, count) to explore only every count-th subtree at `split_depth`,
+        starting with the index-th; solutions found above that depth belong to
+        shard 0. The count shards partition the solutions between them.
+
+    split_depth(int)
+        the branching level the subtrees are dealt out at; 1 splits by the
+        top-level branch
+    """
+
+    def __init__(
+        self,
+        values,
+        strategies=None,
+        stats=None,
+        trace=None,
+        budget=None,
+        shard=None,
+        split_depth=1,
+    ):
+        self.values = dict(values)
+        self.strategies = strategies
+        self.stats = stats
+        self.trace = trace
+        self.budget = budget
+        self.shard_index, self.shard_count = shard or (0, 1)
+        if not 0 <= self.shard_index < self.shard_count:
+            raise ValueError(f"Invalid shard: {shard!r}")
+        self.split_depth = split_depth
+        # The number of subtrees met at split_depth so far
+        self._subtrees = 0
+        # Entries of (box, remaining candidates, trail mark)
+        self.stack = []
+        # The reduced board at each branch point
+        self.trail = []
+        # The outcome once the search has finished: a solution dict or False
+        self.result = None
+        self._enter = True
+
+    @property
+    def done(self):
+        """True once the search has found a solution or exhausted the tree"""
+        return self.result is not None
+
+    def run(self, max_nodes=None):
+        """Run the search until it finishes or visits `max_nodes` more nodes
+
+        Returns
+        -------
+        dict or False or None
+            The values dictionary with all boxes assigned, False if there is no
+            solution, or None if the search paused before finishing
+        """
+        if self.result is not None:
+            return self.result
+        stack = self.stack
+        trail = self.trail
+        stats = self.stats
+        budget = self.budget
+        visited = 0
+        while True:
+            if self._enter:
+                if max_nodes is not None and visited >= max_nodes:
+                    return None
+                if budget is not None:
+                    budget.check()
+                visited += 1
+                if stats is not None:
+                    stats.nodes += 1
+                self._enter = False
+
+                values = solution.reduce_puzzle(self.values, self.strategies, stats)
+                if values is not False:
+                    if budget is not None:
+                        budget.record(values)
+                    if self.trace is not None:
+                        self.trace.append(utils.values2grid(values))
+                    if not all(len(values[s]) == 1 for s in utils.boxes):
+                        # Choose one of the unfilled squares with the fewest
+                        # possibilities
+                        s = None
+                        for box, candidates in values.items():
+                            if len(candidates) > 1 and (
+                                s is None or len(candidates) < len(values[s])
+                            ):
+                                s = box
+                        stack.append((s, values[s], len(trail)))
+                        trail.append(values)
+                    elif len(stack) >= self.split_depth or self.shard_index == 0:
+                        self.result = dict(values)
+                        return self.result
+
+            # Move on to the next untried candidate, backtracking as needed
+            while stack:
+                s, remaining, mark = stack[-1]
+                if remaining:
+                    stack[-1] = (s, remaining[1:], mark)
+                    if len(stack) == self.split_depth:
+                        self._subtrees += 1
+                        if (self._subtrees - 1) % self.shard_count != self.shard_index:
+                            continue
+                    if stats is not None:
+                        stats.branches += 1
+                    self.values = trail[mark].copy()
+                    self.values[s] = remaining[0]
+                    self._enter = True
+                    break
+                stack.pop()
+                del trail[mark:]
+            else:
+                self.result = False
+                return False
+
+    def solutions(self):
+        """Yield every solution in turn, resuming the search after each one
+
+        Only the stack and trail of the current path are kept, so memory does not
+        grow with the number of solutions.
+        """
+        while True:
+            result = self.run()
+            if not result:
+                return
+            yield result
+            # The next run backtracks from the solution just found
+            self.result = None
+
+
+def search_iterative(
+    values: dict, strategies=None, stats=None, trace=None, budget=None
+) -> dict | bool:
+    """Apply depth first search with an explicit stack to solve a Sudoku puzzle
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    strategies(sequence)
+        the strategy stack passed on to `solution.reduce_puzzle` at every node
+
+    stats(solution.SolveStats)
+        if given, counts the nodes and branches of the search
+
+    trace(list)
+        if given, receives the grid string of every board the search reduces to
+
+    budget(solution.Budget)
+        if given, checked at every node; raises BudgetExhausted once exceeded
+
+    Returns
+    -------
+    dict or False
+        The values dictionary with all boxes assigned or False
+    """
+    return IterativeSearch(values, strategies, stats, trace, budget).run()
+
+
+def iter_solutions(grid, shard=None, strategies=None, split_depth=1):
+    """Lazily enumerate every solution of a Sudoku puzzle
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid, or a values dictionary.
+
+        Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    shard(tuple)
+        (index, count) to enumerate only this worker's share of the solutions;
+        the subtrees at `split_depth` are dealt out round-robin, so `count` workers
+        with indexes 0 to count - 1 between them yield every solution exactly once
+
+    strategies(sequence)
+        the strategy stack passed on to `solution.reduce_puzzle` at every node
+
+    split_depth(int)
+        the branching level to shard at; 1 splits by the top-level branch, deeper
+        levels give more, smaller subtrees to deal out
+
+    Yields
+    ------
+    dict
+        each solution as a values dictionary, in depth first order
+    """
+    values = utils.grid2values(grid) if isinstance(grid, str) else grid
+    search = IterativeSearch(values, strategies, shard=shard, split_depth=split_depth)
+    yield from search.solutions()
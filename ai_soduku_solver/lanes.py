@@ -0,0 +1,187 @@
+"""Two-lane solving for mixed-difficulty traffic
+
+Most puzzles are solved outright by one `solution.reduce_puzzle` pass, in
+microseconds; the rest need a search that can take thousands of times longer.
+Sent through one first-in first-out queue, every easy puzzle that lands behind a
+burst of hard ones waits for them. `TwoLaneExecutor` splits them:
+
+- the easy lane is the propagation pass, run straight away on the submitting
+  thread; a puzzle it solves (or proves unsolvable) never queues at all
+- the puzzles it leaves unsolved go to the hard lane, a `warmpool.WarmPool` of
+  worker processes fed from a heap ordered by deadline (earliest first, then in
+  order of arrival), with at most one task per worker handed over at a time so
+  that a later, more urgent puzzle can still overtake the ones waiting
+
+The hard lane is sent the reduced board, so the workers do not redo the pass. A
+deadline is enforced as well as used for ordering: a puzzle still queued when
+its deadline passes is dropped with `DeadlineExceeded` rather than handed to a
+worker, and `solve` stops waiting at the deadline. A puzzle a worker has already
+taken is solved to the end, but its answer is only delivered to callers still
+waiting for it.
+"""
+import heapq
+import itertools
+import math
+import threading
+import time
+from concurrent import futures
+from concurrent.futures import Future
+
+from . import solution
+from . import utils
+from . import warmpool
+
+
+class DeadlineExceeded(TimeoutError):
+    """A puzzle was not solved by its deadline"""
+
+
+def triage(grid):
+    """Run the propagation-only pass on a puzzle
+
+    Returns
+    -------
+    tuple
+        (solved, grid): if solved is True, grid is the solved grid string, or
+        None if the puzzle has no solution; otherwise grid is the reduced puzzle,
+        with every box the pass filled in
+    """
+    values = solution.reduce_puzzle(utils.grid2values(grid))
+    if values is False:
+        return True, None
+    reduced = utils.values2grid(values)
+    return "." not in reduced, reduced
+
+
+class TwoLaneExecutor:
+    """Solves easy puzzles at once and hard ones on workers, earliest deadline first
+
+    Parameters
+    ----------
+    processes(int)
+        the number of hard lane worker processes; defaults to the number of CPUs
+
+    method(string)
+        the search engine the hard lane passes on to `solution.solve`
+
+    Attributes
+    ----------
+    easy(int)
+        the number of puzzles the propagation pass settled
+
+    hard(int)
+        the number of puzzles sent to the hard lane
+    """
+
+    def __init__(self, processes=None, method="search"):
+        self.pool = warmpool.WarmPool(processes, method)
+        self.easy = 0
+        self.hard = 0
+        # Entries of (deadline, arrival, reduced grid, future)
+        self._queue = []
+        self._arrivals = itertools.count()
+        self._in_flight = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    @property
+    def processes(self):
+        return self.pool.processes
+
+    def submit(self, grid, deadline=None):
+        """Solve a puzzle; returns a Future for its solved grid string or None
+
+        Parameters
+        ----------
+        grid(string)
+            a string representing a sudoku grid
+
+        deadline(float)
+            the `time.monotonic()` time the answer is wanted by, which orders the
+            hard lane; puzzles without one go after every puzzle with one. The
+            future raises `DeadlineExceeded` if the puzzle is still queued then
+        """
+        solved, reduced = triage(grid)
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The executor is closed")
+            if solved:
+                self.easy += 1
+                future.set_result(reduced)
+                return future
+            self.hard += 1
+            key = math.inf if deadline is None else deadline
+            heapq.heappush(self._queue, (key, next(self._arrivals), reduced, future))
+            self._condition.notify_all()
+        return future
+
+    def solve(self, grid, deadline=None):
+        """Return the solved grid string, or None if the puzzle has no solution
+
+        Raises `DeadlineExceeded` if there is no answer by `deadline`.
+        """
+        future = self.submit(grid, deadline)
+        if deadline is None:
+            return future.result()
+        try:
+            return future.result(max(deadline - time.monotonic(), 0))
+        except futures.TimeoutError:
+            # Not the builtin TimeoutError before Python 3.11. Still queued, the
+            # puzzle is dropped; already taken, its answer is discarded
+            future.cancel()
+            raise DeadlineExceeded("No answer by the deadline") from None
+
+    def _dispatch(self):
+        """Hand the most urgent hard puzzle to the pool whenever a worker is free"""
+        while True:
+            with self._condition:
+                while not self._queue or self._in_flight >= self.pool.processes:
+                    if self._closed and not self._queue:
+                        return
+                    self._condition.wait()
+                deadline, _, grid, future = heapq.heappop(self._queue)
+                if not future.set_running_or_notify_cancel():
+                    # The caller stopped waiting
+                    continue
+                if deadline < time.monotonic():
+                    future.set_exception(DeadlineExceeded("Expired while queued"))
+                    continue
+                self._in_flight += 1
+            self.pool.submit(grid).add_done_callback(
+                lambda done, future=future: self._finished(done, future)
+            )
+
+    def _finished(self, done, future):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+        if done.exception() is None:
+            future.set_result(done.result())
+        else:
+            future.set_exception(done.exception())
+
+    def resize(self, processes):
+        """Change the number of hard lane workers"""
+        self.pool.resize(processes)
+        with self._condition:
+            self._condition.notify_all()
+
+    def close(self):
+        """Finish the queued hard puzzles, then stop the workers"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._dispatcher.join()
+        with self._condition:
+            while self._in_flight:
+                self._condition.wait()
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
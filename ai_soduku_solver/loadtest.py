@@ -0,0 +1,391 @@
+"""Load testing for the solve service
+
+Replays a corpus against `sudoku-solver serve` and reports throughput, latency
+percentiles and the error rate. Two ways of generating load are supported:
+
+- closed loop (the default): `concurrency` clients each send a puzzle, wait for
+  the answer and send the next, so the load adapts to how fast the service is
+- open loop (with a rate): puzzles arrive on a fixed schedule whether or not
+  earlier ones have been answered, each sent on a thread of its own, and latency
+  is measured from when a request was due, so a backed up service shows up as
+  growing latency instead of as a slower arrival rate
+
+If nothing answers at the URL, the puzzles are solved in this process through the
+same `service.SolveService` the server uses, so the harness runs anywhere.
+Passing --workers runs the load once per worker count against a local service
+started for it, and charts how the results scale.
+
+usage: python -m ai_soduku_solver.loadtest [--url URL] [--input PATH]
+           [--requests N] [--concurrency N] [--rate PER_SECOND]
+           [--workers N,N,...] [--method METHOD] [--deadline-ms MS]
+"""
+import http.client
+import sys
+import threading
+import time
+import urllib.parse
+
+from . import corpus
+from . import service
+from . import solution
+
+DEFAULT_URL = "http://127.0.0.1:8081"
+
+PUZZLES = [
+    "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+    "6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....",
+    "48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5....",
+]
+
+
+class RequestError(Exception):
+    """A request the service did not answer with a solution or a 422"""
+
+
+class HttpTarget:
+    """Sends puzzles to a running service, one keep-alive connection per thread
+
+    Parameters
+    ----------
+    url(string)
+        the base URL of the service, e.g. http://127.0.0.1:8081
+
+    timeout(float)
+        the seconds to wait for each answer
+
+    deadline_ms(float)
+        sent as the X-Deadline-Ms of every request, if given
+    """
+
+    def __init__(self, url=DEFAULT_URL, timeout=30, deadline_ms=None):
+        parts = urllib.parse.urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.headers = {}
+        if deadline_ms is not None:
+            self.headers["X-Deadline-Ms"] = str(deadline_ms)
+        self.name = f"http://{self.host}:{self.port}"
+        self._local = threading.local()
+
+    def _request(self, method, path, body=None):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = http.client.HTTPConnection(
+                self.host, self.port, timeout=self.timeout
+            )
+            self._local.connection = connection
+        try:
+            connection.request(method, path, body, self.headers)
+            response = connection.getresponse()
+            return response.status, response.read().decode("ascii").strip()
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            self._local.connection = None
+            raise RequestError(str(e)) from e
+
+    def is_up(self):
+        """True if the service answers its health check"""
+        try:
+            return self._request("GET", "/health")[0] == 200
+        except RequestError:
+            return False
+
+    def solve(self, grid):
+        """Return the solved grid string, or None if the puzzle has no solution"""
+        status, body = self._request("POST", "/solve", grid.encode("ascii"))
+        if status == 200:
+            return body
+        if status == 422:
+            return None
+        raise RequestError(f"HTTP {status}: {body}")
+
+    def close(self):
+        pass
+
+
+class LocalTarget:
+    """Solves puzzles in this process, standing in for a service that is not running
+
+    Parameters
+    ----------
+    processes(int)
+        the number of worker processes, as for the service
+
+    method(string)
+        the search engine passed on to `solution.solve`
+
+    deadline_ms(float)
+        the milliseconds each answer is wanted within, if given
+    """
+
+    def __init__(self, processes=1, method="search", deadline_ms=None):
+        self.service = service.SolveService(processes, method)
+        self.deadline_ms = deadline_ms
+        self.name = f"in-process ({processes} worker{'s' if processes > 1 else ''})"
+
+    def solve(self, grid):
+        deadline = None
+        if self.deadline_ms is not None:
+            deadline = time.monotonic() + self.deadline_ms / 1000
+        return self.service.solve(grid, deadline)
+
+    def close(self):
+        self.service.close()
+
+
+def connect(url=DEFAULT_URL, method="search", deadline_ms=None):
+    """Return an HttpTarget if the service at `url` is up, else a LocalTarget"""
+    target = HttpTarget(url, deadline_ms=deadline_ms)
+    if target.is_up():
+        return target
+    return LocalTarget(method=method, deadline_ms=deadline_ms)
+
+
+class LoadResult:
+    """The outcome of one load run
+
+    Attributes
+    ----------
+    requests(int)
+        the number of requests sent
+
+    errors(int)
+        the number of requests that failed
+
+    seconds(float)
+        the wall time of the run
+
+    latencies(list)
+        the seconds each successful request took, sorted
+    """
+
+    def __init__(self, requests, errors, seconds, latencies):
+        self.requests = requests
+        self.errors = errors
+        self.seconds = seconds
+        self.latencies = sorted(latencies)
+
+    @property
+    def throughput(self):
+        """Successful requests per second"""
+        return len(self.latencies) / self.seconds if self.seconds else 0.0
+
+    @property
+    def error_rate(self):
+        return self.errors / self.requests if self.requests else 0.0
+
+    def percentile(self, p):
+        """The latency in seconds that p percent of successful requests beat"""
+        if not self.latencies:
+            return float("nan")
+        rank = max(int(len(self.latencies) * p / 100 + 0.5), 1)
+        return self.latencies[min(rank, len(self.latencies)) - 1]
+
+    def format(self):
+        """Return the result as one line of text"""
+        return (
+            f"{self.requests} requests in {self.seconds:.2f}s: "
+            f"{self.throughput:.1f}/s, p50 {self.percentile(50) * 1000:.1f}ms, "
+            f"p90 {self.percentile(90) * 1000:.1f}ms, "
+            f"p99 {self.percentile(99) * 1000:.1f}ms, "
+            f"errors {self.error_rate:.1%}"
+        )
+
+
+def run_load(target, grids, requests=200, concurrency=4, rate=None):
+    """Replay puzzles against a target
+
+    Parameters
+    ----------
+    target(HttpTarget or LocalTarget)
+        where to send the puzzles
+
+    grids(sequence)
+        the puzzles, replayed in order and from the start again as needed
+
+    requests(int)
+        the number of requests to send
+
+    concurrency(int)
+        the number of clients sending requests at once in a closed loop
+
+    rate(float)
+        requests per second for an open loop; None for a closed loop. Every
+        request is sent on its own thread when it is due, however many earlier
+        ones are still waiting for an answer, and `concurrency` does not apply
+
+    Returns
+    -------
+    LoadResult
+    """
+    if not grids:
+        raise ValueError("No puzzles to replay")
+    lock = threading.Lock()
+    sent = 0
+    errors = 0
+    latencies = []
+
+    def send(i, due):
+        nonlocal errors
+        try:
+            target.solve(grids[i % len(grids)])
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        latency = time.perf_counter() - due
+        with lock:
+            latencies.append(latency)
+
+    def client():
+        nonlocal sent
+        while True:
+            with lock:
+                i = sent
+                if i >= requests:
+                    return
+                sent += 1
+            send(i, time.perf_counter())
+
+    started = time.perf_counter()
+    if rate is None:
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+    else:
+        threads = []
+        for i in range(requests):
+            due = started + i / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            thread = threading.Thread(target=send, args=(i, due))
+            thread.start()
+            threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return LoadResult(requests, errors, time.perf_counter() - started, latencies)
+
+
+def sweep(
+    grids,
+    workers,
+    requests=200,
+    concurrency=4,
+    rate=None,
+    method="search",
+    deadline_ms=None,
+):
+    """Run the same load against a local service with each number of workers
+
+    A service is started on a free localhost port for every worker count; if no
+    server can be started, the solves run in this process instead.
+
+    Returns
+    -------
+    list
+        (worker count, LoadResult) pairs
+    """
+    results = []
+    for count in workers:
+        try:
+            server = service.make_server(port=0, processes=count, method=method)
+        except OSError:
+            target, server = LocalTarget(count, method, deadline_ms), None
+        else:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            target = HttpTarget(url, deadline_ms=deadline_ms)
+        try:
+            results.append(
+                (count, run_load(target, grids, requests, concurrency, rate))
+            )
+        finally:
+            target.close()
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+    return results
+
+
+def format_chart(results, width=40):
+    """Chart throughput and latency against the number of workers"""
+    best = max((result.throughput for _, result in results), default=0) or 1
+    lines = [
+        f"{'workers':>7}  {'req/s':>8}  {'p50 ms':>7}  {'p99 ms':>7}  {'errors':>6}"
+    ]
+    for count, result in results:
+        bar = "#" * round(width * result.throughput / best)
+        lines.append(
+            f"{count:>7}  {result.throughput:>8.1f}  "
+            f"{result.percentile(50) * 1000:>7.1f}  "
+            f"{result.percentile(99) * 1000:>7.1f}  "
+            f"{result.error_rate:>6.1%}  {bar}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    try:
+        options, arguments = solution.parse_options(argv)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if options is None:
+        print(__doc__)
+        return 0
+    if arguments:
+        print(f"Unexpected argument: {arguments[0]}", file=sys.stderr)
+        return 2
+    url = options.pop("url", DEFAULT_URL)
+    path = options.pop("input", None)
+    requests = int(options.pop("requests", 200))
+    concurrency = int(options.pop("concurrency", 4))
+    rate = options.pop("rate", None)
+    rate = None if rate is None else float(rate)
+    workers = options.pop("workers", None)
+    method = options.pop("method", "search")
+    deadline_ms = options.pop("deadline_ms", None)
+    deadline_ms = None if deadline_ms is None else float(deadline_ms)
+    if options:
+        print(f"Unknown option: --{next(iter(options))}", file=sys.stderr)
+        return 2
+
+    grids = PUZZLES
+    if path is not None:
+        # Only as many puzzles as will be sent are held in memory
+        grids = []
+        for grid in corpus.read_puzzles(path):
+            grids.append(grid)
+            if len(grids) == requests:
+                break
+    if rate is None:
+        print(f"{requests} requests, {concurrency} clients, closed loop")
+    else:
+        print(f"{requests} requests, open loop at {rate:g}/s")
+
+    if workers is not None:
+        counts = [int(count) for count in workers.split(",")]
+        print(
+            format_chart(
+                sweep(grids, counts, requests, concurrency, rate, method, deadline_ms)
+            )
+        )
+        return 0
+    target = connect(url, method, deadline_ms)
+    print(f"target: {target.name}")
+    try:
+        result = run_load(target, grids, requests, concurrency, rate)
+    finally:
+        target.close()
+    print(result.format())
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+"""Per-solve memory reports
+
+Boards are dictionaries of 81 strings and `solution.search` copies one at every
+branch, so the memory a solve needs depends on how deep and wide its search goes
+rather than on the puzzle size. `profile_solve` runs one solve under tracemalloc
+and reports its peak, what it left allocated afterwards and the source lines
+holding that memory.
+
+Run it as a script to print a report for each puzzle:
+
+usage: python -m ai_soduku_solver.memory [--method METHOD] [GRID ...]
+       (default: a built-in set)
+"""
+import sys
+import tracemalloc
+
+from . import solution
+from . import utils
+
+PUZZLES = [
+    "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+]
+
+
+class MemoryReport:
+    """What one solve allocated
+
+    Attributes
+    ----------
+    peak(int)
+        the most bytes allocated at once during the solve, over what was allocated
+        before it started
+
+    retained(int)
+        the bytes still allocated after the solve returned, not counting the result
+
+    blocks(int)
+        the number of memory blocks still allocated after the solve returned
+
+    peak_live_blocks(int)
+        the most memory blocks the whole process had allocated at once during the
+        solve, over its count before the solve, from `sys.getallocatedblocks`
+        sampled at every reduction pass; other threads count too, and blocks
+        allocated and freed between two passes are missed. None for the engines
+        that do not take a strategy stack
+
+    sites(list)
+        (file:line, bytes, blocks) for the source lines holding the most retained
+        memory, largest first
+    """
+
+    def __init__(self, peak, retained, blocks, peak_live_blocks, sites):
+        self.peak = peak
+        self.retained = retained
+        self.blocks = blocks
+        self.peak_live_blocks = peak_live_blocks
+        self.sites = sites
+
+    def __repr__(self):
+        return (
+            f"MemoryReport(peak={self.peak}, retained={self.retained}, "
+            f"blocks={self.blocks}, peak_live_blocks={self.peak_live_blocks})"
+        )
+
+    def format(self):
+        """Return the report as lines of text"""
+        lines = [
+            f"peak {self.peak} B, {self.peak_live_blocks or '?'} live blocks; "
+            f"retained {self.retained} B, {self.blocks} blocks"
+        ]
+        for site, size, count in self.sites:
+            lines.append(f"  {size:>8} B {count:>6} blocks  {site}")
+        return "\n".join(lines)
+
+
+class _PeakBlocks:
+    """Tracks the process's most live blocks, sampled on every reduction pass"""
+
+    __name__ = "peak_blocks"
+
+    def __init__(self, start):
+        self.start = start
+        self.most = 0
+
+    def __call__(self, values):
+        self.most = max(self.most, sys.getallocatedblocks() - self.start)
+        return values
+
+
+def profile_solve(grid, method="search", top=5):
+    """Solve a puzzle while tracing its memory allocations
+
+    tracemalloc slows the solve down several times over, so the report is for
+    finding where memory goes rather than for timing.
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid.
+
+        Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    method(string)
+        the search engine passed on to `solution.solve`
+
+    top(int)
+        the number of source lines to list in `MemoryReport.sites`
+
+    Returns
+    -------
+    tuple
+        (the result of `solution.solve`, MemoryReport)
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        peak_blocks = _PeakBlocks(blocks)
+        if method in ("search", "iterative"):
+            # Sample the block count on every reduction pass by riding along as
+            # the last strategy
+            strategies = (solution.eliminate, solution.only_choice, peak_blocks)
+            if method == "search":
+                result = solution.search(utils.grid2values(grid), strategies)
+            else:
+                from . import iterative
+
+                result = iterative.search_iterative(utils.grid2values(grid), strategies)
+        else:
+            peak_blocks = None
+            result = solution.solve(grid, method)
+        current, peak = tracemalloc.get_traced_memory()
+        if peak_blocks is not None:
+            peak_blocks(None)
+        result_size = 0
+        if result:
+            result_size = sys.getsizeof(result) + sum(
+                sys.getsizeof(v) for v in result.values()
+            )
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    # Leave out the bookkeeping of the profiler itself
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ]
+    stats = after.filter_traces(ignore).compare_to(
+        before.filter_traces(ignore), "lineno"
+    )
+    sites = [
+        (
+            f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            stat.size_diff,
+            stat.count_diff,
+        )
+        for stat in stats
+        if stat.size_diff > 0
+    ][:top]
+    return result, MemoryReport(
+        peak=peak - start,
+        retained=max(current - start - result_size, 0),
+        blocks=sum(stat.count_diff for stat in stats),
+        peak_live_blocks=None if peak_blocks is None else peak_blocks.most,
+        sites=sites,
+    )
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    method = "search"
+    if argv[:1] == ["--method"]:
+        method, argv = argv[1], argv[2:]
+    for grid in argv or PUZZLES:
+        result, report = profile_solve(grid, method)
+        print(grid, "solved" if result else "no solution")
+        print(report.format())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
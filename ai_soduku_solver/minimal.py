@@ -0,0 +1,151 @@
+"""Minimality checks for Sudoku puzzles
+
+A puzzle with a unique solution is minimal when every clue is necessary: taking
+any one of them away lets a second solution in. Checking that naively means one
+from-scratch uniqueness solve (counting up to two solutions) per clue. The checks
+here share their work instead:
+
+- the puzzle is solved once, and its solution S is reused by every check. Without
+  clue c, any solution other than S must put a different digit in c, so a clue is
+  necessary exactly when the board without it has a solution with c != S[c]; each
+  check is a single search for one solution on a board where S[c] is struck from
+  c, not a count of two
+- how many givens in each box's peers hold each digit is counted once; removing a
+  clue only changes the candidates of its 20 peers, so the starting board of each
+  check is patched from the shared one rather than rebuilt and re-eliminated, and
+  a clue whose box has no candidate but S[c] once it is empty is redundant without
+  any search at all
+
+The checks are independent of each other, so `redundant_clues` can also spread
+them over worker processes.
+"""
+import itertools
+import multiprocessing
+
+from . import iterative
+from . import solution
+from . import utils
+
+DIGITS = "123456789"
+
+
+class _Base:
+    """The work shared by every clue check of one puzzle"""
+
+    def __init__(self, grid):
+        values = utils.grid2values(grid)
+        solutions = list(itertools.islice(iterative.iter_solutions(values), 2))
+        if len(solutions) != 1:
+            raise ValueError(
+                "The puzzle has no solution"
+                if not solutions
+                else "The puzzle has more than one solution"
+            )
+        self.solution = solutions[0]
+        self.givens = {box: d for box, d in zip(utils.boxes, grid) if d in DIGITS}
+        # blocked[box][digit]: the number of givens among the peers of box holding digit
+        self.blocked = {box: dict.fromkeys(DIGITS, 0) for box in utils.boxes}
+        for box, digit in self.givens.items():
+            for peer in solution.peers[box]:
+                self.blocked[peer][digit] += 1
+        self.values = {
+            box: self.givens.get(box) or self._candidates(box) for box in utils.boxes
+        }
+
+    def _candidates(self, box, removed=None):
+        """The digits no given peer of box holds, ignoring the given in `removed`"""
+        blocked = self.blocked[box]
+        freed = self.givens[removed] if removed is not None else None
+        return "".join(
+            digit
+            for digit in DIGITS
+            if not blocked[digit] or (digit == freed and blocked[digit] == 1)
+        )
+
+    def is_redundant(self, box):
+        """Check whether the puzzle keeps a unique solution without the clue in box"""
+        others = self._candidates(box).replace(self.solution[box], "")
+        if not others:
+            return True
+        values = self.values.copy()
+        values[box] = others
+        for peer in solution.peers[box]:
+            if peer not in self.givens:
+                values[peer] = self._candidates(peer, removed=box)
+        return not solution.search(values)
+
+
+_base = None
+
+
+def _init_worker(base):
+    global _base
+    _base = base
+
+
+def _check(box):
+    return _base.is_redundant(box)
+
+
+def redundant_clues(grid, processes=1):
+    """Find the clues that can be removed without losing uniqueness
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid with a unique solution.
+
+        Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    processes(int)
+        the number of worker processes to spread the clue checks over; None for
+        the number of CPUs, 1 to check them in this process
+
+    Returns
+    -------
+    list
+        the boxes whose clue is not necessary, in board order; each one on its own
+        can be removed and the puzzle still has a unique solution
+
+    Raises
+    ------
+    ValueError
+        if the puzzle has no solution or more than one
+    """
+    base = _Base(grid)
+    clues = list(base.givens)
+    if processes == 1 or len(clues) < 2:
+        redundant = [base.is_redundant(box) for box in clues]
+    else:
+        with multiprocessing.Pool(
+            processes, initializer=_init_worker, initargs=(base,)
+        ) as pool:
+            redundant = pool.map(_check, clues)
+    return [box for box, r in zip(clues, redundant) if r]
+
+
+def is_minimal(grid, processes=1):
+    """Check whether every clue of a puzzle is needed for its solution to be unique
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid with a unique solution
+
+    processes(int)
+        see `redundant_clues`
+
+    Returns
+    -------
+    bool
+        True if removing any single clue gives a puzzle with more than one solution
+
+    Raises
+    ------
+    ValueError
+        if the puzzle has no solution or more than one
+    """
+    if processes != 1:
+        return not redundant_clues(grid, processes)
+    base = _Base(grid)
+    return not any(base.is_redundant(box) for box in base.givens)
@@ -14,11 +14,24 @@ def AAfilledRoundedRect(surface,rect,color,radius=0.4):
     """
 
     rect         = Rect(rect)
+    return surface.blit(AAroundedRectSurface(rect.size,color,radius),rect.topleft)
+
+def AAroundedRectSurface(size,color,radius=0.4):
+
+    """
+    AAroundedRectSurface(size,color,radius=0.4)
+
+    size    : (width, height)
+    color   : rgb or rgba
+    radius  : 0 <= radius <= 1
+
+    Returns a new per-pixel alpha surface holding the rounded rectangle.
+    """
+
+    rect         = Rect((0,0),size)
     color        = Color(*color)
     alpha        = color.a
     color.a      = 0
-    pos          = rect.topleft
-    rect.topleft = 0,0
     rectangle    = Surface(rect.size,SRCALPHA)
 
     circle       = Surface([min(rect.size)*3]*2,SRCALPHA)
@@ -39,7 +52,33 @@ def AAfilledRoundedRect(surface,rect,color,radius=0.4):
     rectangle.fill(color,special_flags=BLEND_RGBA_MAX)
     rectangle.fill((255,255,255,alpha),special_flags=BLEND_RGBA_MIN)
 
-    return surface.blit(rectangle,pos)
+    return rectangle
+
+# Tiles and fonts are cached: building them allocates and smoothscales fresh
+# surfaces, which is far too slow to repeat for every square on every frame
+_tiles = {}
+_fonts = {}
+
+def clearCache():
+    """Forget the cached tiles and fonts; pygame.quit() invalidates the fonts."""
+    _tiles.clear()
+    _fonts.clear()
+
+pygame.register_quit(clearCache)
+
+def getTile(color,size=(45,40)):
+    """The rounded tile of the given color and size, rendered once and reused."""
+    key = (tuple(color),tuple(size))
+    if key not in _tiles:
+        _tiles[key] = AAroundedRectSurface(size,color)
+    return _tiles[key]
+
+def getFont(name='opensans',size=21):
+    """The system font of the given name and size, loaded once and reused."""
+    key = (name,size)
+    if key not in _fonts:
+        _fonts[key] = pygame.font.SysFont(name,size)
+    return _fonts[key]
 
 class SudokuSquare:
     """A sudoku square class."""
@@ -51,7 +90,7 @@ class SudokuSquare:
             number = ""
             self.color = (255, 255, 255)
         # print("FONTS", pygame.font.get_fonts())
-        self.font = pygame.font.SysFont('opensans', 21)
+        self.font = getFont()
         self.text = self.font.render(number, 1, (255, 255, 255))
         self.textpos = self.text.get_rect()
         self.textpos = self.textpos.move(offsetX + 17, offsetY + 4)
@@ -72,7 +111,7 @@ class SudokuSquare:
 
     def draw(self):
         screen = pygame.display.get_surface()
-        AAfilledRoundedRect(screen, (self.offsetX, self.offsetY, 45, 40), self.color)
+        screen.blit(getTile(self.color), (self.offsetX, self.offsetY))
 
         # screen.blit(self.collide, self.collideRect)
         screen.blit(self.text, self.textpos)
@@ -0,0 +1,455 @@
+"""SAT-based engine for Sudoku puzzles
+
+The puzzle is encoded as CNF over one boolean variable per (box, digit) pair and
+solved with a small, self-contained CDCL (conflict-driven clause learning) solver:
+two watched literals per clause for unit propagation, first-UIP conflict analysis
+with non-chronological backtracking, VSIDS variable activities with phase saving
+for decisions, and restarts on the Luby sequence. No external binaries are used.
+
+The encoding is built from whatever units are passed in (by default the active
+`solution.unitlist`), so variant units such as diagonals are covered, and it does
+not assume a 9x9 board.
+"""
+import heapq
+
+DIGITS = "123456789"
+
+
+def encode(values, unitlist, digits=DIGITS):
+    """Encode a Sudoku puzzle as CNF
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    unitlist(list)
+        a list containing "units" (rows, columns, diagonals, etc.) of boxes
+
+    digits(string)
+        the digits that can be placed in a box
+
+    Returns
+    -------
+    tuple
+        (num_vars, clauses, variables) where clauses is a list of lists of non-zero
+        integers in DIMACS style and variables maps each (box, digit) pair to its
+        variable number
+    """
+    variables = {}
+    for box in values:
+        for digit in digits:
+            variables[(box, digit)] = len(variables) + 1
+
+    clauses = []
+
+    def exactly_one(literals, at_least=True):
+        if at_least:
+            clauses.append(list(literals))
+        for i, a in enumerate(literals):
+            for b in literals[i + 1 :]:
+                clauses.append([-a, -b])
+
+    for box in values:
+        exactly_one([variables[(box, digit)] for digit in digits])
+        # Candidates already ruled out are unit facts
+        for digit in digits:
+            if digit not in values[box]:
+                clauses.append([-variables[(box, digit)]])
+
+    for unit in unitlist:
+        # Every digit appears at most once per unit, and exactly once if the unit
+        # has a box for every digit
+        for digit in digits:
+            exactly_one(
+                [variables[(box, digit)] for box in unit],
+                at_least=len(unit) == len(digits),
+            )
+
+    return len(variables), clauses, variables
+
+
+def decode(model, variables):
+    """Convert a satisfying assignment back into a values dictionary
+
+    Parameters
+    ----------
+    model(list)
+        the value of each variable, indexed by variable number
+
+    variables(dict)
+        the mapping from (box, digit) pairs to variable numbers returned by `encode`
+
+    Returns
+    -------
+    dict
+        a dictionary of the form {'box_name': '1', ...}
+    """
+    values = {}
+    for (box, digit), var in variables.items():
+        if model[var]:
+            values[box] = digit
+    return values
+
+
+def implied_values(assigns, variables):
+    """Convert a partial assignment into the candidates it still allows
+
+    Parameters
+    ----------
+    assigns(list)
+        the value of each variable, indexed by variable number: 1 true, -1 false
+        and 0 unassigned
+
+    variables(dict)
+        the mapping from (box, digit) pairs to variable numbers returned by `encode`
+
+    Returns
+    -------
+    dict
+        a dictionary of the form {'box_name': '123456789', ...} without the
+        digits the assignment rules out
+    """
+    values = {}
+    for (box, digit), var in variables.items():
+        if assigns[var] != -1:
+            values[box] = values.get(box, "") + digit
+        else:
+            values.setdefault(box, "")
+    return values
+
+
+def luby(i):
+    """Return the i-th term (starting from 1) of the Luby restart sequence"""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+class CDCLSolver:
+    """A conflict-driven clause learning SAT solver
+
+    Parameters
+    ----------
+    num_vars(int)
+        the number of variables; variables are numbered from 1
+
+    clauses(list)
+        a list of clauses, each a list of non-zero integers in DIMACS style
+
+    restart_base(int)
+        the number of conflicts in one unit of the Luby restart sequence
+
+    var_decay(float)
+        the VSIDS activity decay factor applied after every conflict
+    """
+
+    def __init__(self, num_vars, clauses, restart_base=100, var_decay=0.95):
+        self.num_vars = num_vars
+        self.restart_base = restart_base
+        self.var_decay = var_decay
+
+        # Per variable state: 1 true, -1 false, 0 unassigned
+        self.assigns = [0] * (num_vars + 1)
+        self.levels = [0] * (num_vars + 1)
+        self.reasons = [None] * (num_vars + 1)
+        self.activity = [0.0] * (num_vars + 1)
+        self.phase = [-1] * (num_vars + 1)
+        self.var_inc = 1.0
+
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        # Watch lists, indexed by literal; a clause sits in the list of each of its
+        # first two literals
+        self.watches = {}
+        for var in range(1, num_vars + 1):
+            self.watches[var] = []
+            self.watches[-var] = []
+        self.order = [(0.0, var) for var in range(1, num_vars + 1)]
+
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.restarts = 0
+
+        self.ok = True
+        for clause in clauses:
+            if not self.add_clause(clause):
+                self.ok = False
+                break
+
+    def value(self, literal):
+        """Return 1 if the literal is true, -1 if it is false and 0 if unassigned"""
+        value = self.assigns[abs(literal)]
+        return value if literal > 0 else -value
+
+    def add_clause(self, clause):
+        """Add an input clause at decision level 0; returns False if the clause
+        makes the problem trivially unsatisfiable"""
+        clause = list(dict.fromkeys(clause))
+        if any(-literal in clause for literal in clause):
+            return True
+        clause = [literal for literal in clause if self.value(literal) != -1]
+        if any(self.value(literal) == 1 for literal in clause):
+            return True
+        if not clause:
+            return False
+        if len(clause) == 1:
+            self._enqueue(clause[0], None)
+            return self._propagate() is None
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+        return True
+
+    def _enqueue(self, literal, reason):
+        var = abs(literal)
+        self.assigns[var] = 1 if literal > 0 else -1
+        self.levels[var] = len(self.trail_lim)
+        self.reasons[var] = reason
+        self.trail.append(literal)
+
+    def _propagate(self):
+        """Run unit propagation over the watched literals
+
+        Returns the conflicting clause, or None if no conflict was found.
+        """
+        assigns = self.assigns
+        watches = self.watches
+        trail = self.trail
+        while self.qhead < len(trail):
+            literal = trail[self.qhead]
+            self.qhead += 1
+            self.propagations += 1
+            false_literal = -literal
+            watchers = watches[false_literal]
+            kept = []
+            i = 0
+            n = len(watchers)
+            while i < n:
+                clause = watchers[i]
+                i += 1
+                # Keep the false literal in the second slot
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], false_literal
+                first = clause[0]
+                first_value = assigns[abs(first)]
+                if first < 0:
+                    first_value = -first_value
+                if first_value == 1:
+                    kept.append(clause)
+                    continue
+                # Look for a new literal to watch
+                for k in range(2, len(clause)):
+                    other = clause[k]
+                    other_value = assigns[abs(other)]
+                    if other < 0:
+                        other_value = -other_value
+                    if other_value != -1:
+                        clause[1], clause[k] = other, false_literal
+                        watches[other].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if first_value == -1:
+                        # Conflict: keep the remaining watchers and stop
+                        kept.extend(watchers[i:])
+                        watches[false_literal] = kept
+                        self.qhead = len(trail)
+                        return clause
+                    self._enqueue(first, clause)
+            watches[false_literal] = kept
+        return None
+
+    def _bump(self, var):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.var_inc *= 1e-100
+            self.order = [(-self.activity[v], v) for v in range(1, self.num_vars + 1)]
+            heapq.heapify(self.order)
+        elif self.assigns[var] == 0:
+            heapq.heappush(self.order, (-self.activity[var], var))
+
+    def _analyze(self, conflict):
+        """Derive a first-UIP learnt clause from a conflict
+
+        Returns the learnt clause, with the asserting literal first and a literal
+        from the backtrack level second, and the level to backtrack to.
+        """
+        seen = set()
+        learnt = [None]
+        current_level = len(self.trail_lim)
+        counter = 0
+        literal = None
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for other in clause if literal is None else clause[1:]:
+                var = abs(other)
+                if var not in seen and self.levels[var] > 0:
+                    seen.add(var)
+                    self._bump(var)
+                    if self.levels[var] == current_level:
+                        counter += 1
+                    else:
+                        learnt.append(other)
+            # Walk back along the trail to the next literal involved in the conflict
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            clause = self.reasons[abs(literal)]
+            seen.discard(abs(literal))
+            counter -= 1
+            if counter == 0:
+                break
+        learnt[0] = -literal
+
+        if len(learnt) == 1:
+            return learnt, 0
+        best = max(range(1, len(learnt)), key=lambda i: self.levels[abs(learnt[i])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, self.levels[abs(learnt[1])]
+
+    def _backtrack(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        for literal in self.trail[self.trail_lim[level] :]:
+            var = abs(literal)
+            self.phase[var] = self.assigns[var]
+            self.assigns[var] = 0
+            self.reasons[var] = None
+            heapq.heappush(self.order, (-self.activity[var], var))
+        del self.trail[self.trail_lim[level] :]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+        # Drop the stale heap entries once they outnumber the variables
+        if len(self.order) > 4 * self.num_vars:
+            self.order = [
+                (-self.activity[var], var)
+                for var in range(1, self.num_vars + 1)
+                if self.assigns[var] == 0
+            ]
+            heapq.heapify(self.order)
+
+    def _decide(self):
+        """Pick the unassigned variable with the highest activity, or None"""
+        while self.order:
+            _, var = heapq.heappop(self.order)
+            if self.assigns[var] == 0:
+                return var if self.phase[var] > 0 else -var
+        return None
+
+    def solve(self, max_conflicts=None, budget=None):
+        """Search for a satisfying assignment
+
+        Parameters
+        ----------
+        max_conflicts(int)
+            give up after this many conflicts; None means no limit
+
+        budget(solution.Budget)
+            if given, checked at every decision; raises BudgetExhausted once
+            exceeded
+
+        Returns
+        -------
+        list or None
+            the value (True or False) of each variable indexed by variable number
+            if the clauses are satisfiable, otherwise None. Also None if the
+            conflict limit was reached, in which case `self.ok` is still True.
+        """
+        if not self.ok or self._propagate() is not None:
+            self.ok = False
+            return None
+
+        restart_count = 1
+        restart_limit = self.restart_base * luby(restart_count)
+        conflicts_since_restart = 0
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts_since_restart += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return None
+                learnt, level = self._analyze(conflict)
+                self._backtrack(level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self.watches[learnt[0]].append(learnt)
+                    self.watches[learnt[1]].append(learnt)
+                    self._enqueue(learnt[0], learnt)
+                self.var_inc /= self.var_decay
+                if max_conflicts is not None and self.conflicts >= max_conflicts:
+                    self._backtrack(0)
+                    return None
+                continue
+
+            if conflicts_since_restart >= restart_limit:
+                self.restarts += 1
+                restart_count += 1
+                restart_limit = self.restart_base * luby(restart_count)
+                conflicts_since_restart = 0
+                self._backtrack(0)
+                continue
+
+            literal = self._decide()
+            if literal is None:
+                return [False] + [value == 1 for value in self.assigns[1:]]
+            if budget is not None:
+                budget.check()
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(literal, None)
+
+
+def search_sat(
+    values: dict, unitlist: list = None, digits: str = DIGITS, budget=None
+) -> dict | bool:
+    """Solve a Sudoku puzzle by encoding it as CNF and running the CDCL solver
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    unitlist(list)
+        the units to encode; defaults to the active `solution.unitlist`
+
+    digits(string)
+        the digits that can be placed in a box
+
+    budget(solution.Budget)
+        if given, checked at every decision; raises BudgetExhausted once
+        exceeded, after recording the board the current trail implies
+
+    Returns
+    -------
+    dict or False
+        The values dictionary with all boxes assigned or False
+    """
+    from . import solution
+
+    if unitlist is None:
+        unitlist = solution.unitlist
+    num_vars, clauses, variables = encode(values, unitlist, digits)
+    solver = CDCLSolver(num_vars, clauses)
+    try:
+        model = solver.solve(budget=budget)
+    except solution.BudgetExhausted:
+        # The trail is fully propagated whenever the budget is checked
+        budget.record(implied_values(solver.assigns, variables))
+        raise
+    if model is None:
+        return False
+    return decode(model, variables)
@@ -0,0 +1,185 @@
+"""Cost-aware scheduling of constraint strategies
+
+`solution.reduce_puzzle` runs every strategy of its stack on every pass, so an
+expensive strategy such as a Jellyfish is paid for on every pass of every node
+even while eliminate and only choice are still making progress on their own.
+
+A `Scheduler` is a single strategy that can stand in for the whole stack. It keeps
+the strategies ranked from cheapest to most expensive per candidate removed and
+runs them as an escalation ladder: the cheapest runs until it stops removing
+candidates, then the next one is tried, and as soon as any strategy makes progress
+the ladder starts again from the bottom. Expensive strategies only run when every
+cheaper one has stalled, so easy puzzles never pay for them while hard ones still
+get their eliminations.
+
+The ranking is learned from the `solution.SolveStats` counters the scheduler
+keeps as it runs, and can be seeded with a profile tuned offline on a corpus with
+`tune` and stored with `save_profile`.
+"""
+
+import json
+
+from . import solution
+from . import strategies
+from . import utils
+
+DEFAULT_STRATEGIES = (
+    solution.eliminate,
+    solution.only_choice,
+    strategies.naked_subsets,
+    strategies.locked_candidates,
+    strategies.x_wing,
+    strategies.swordfish,
+    strategies.jellyfish,
+)
+
+
+class Scheduler:
+    """A strategy that escalates through a stack from cheap to expensive
+
+    Use it anywhere a strategy stack is accepted, e.g.
+    `solution.search(values, (Scheduler(),))`.
+
+    Parameters
+    ----------
+    strategies(sequence)
+        the strategies to schedule, in the order to try them until there are
+        counters to rank them by; defaults to DEFAULT_STRATEGIES
+
+    profile(dict)
+        counters from `tune` or `load_profile` to rank the strategies by from the
+        start
+
+    rerank_every(int)
+        re-rank the strategies from the counters after this many calls; 0 keeps
+        the initial ranking
+
+    Attributes
+    ----------
+    stats(solution.SolveStats)
+        the calls, eliminations and seconds of every strategy so far
+    """
+
+    __name__ = "scheduler"
+
+    def __init__(self, strategies=None, profile=None, rerank_every=64):
+        self.strategies = tuple(strategies or DEFAULT_STRATEGIES)
+        self.stats = solution.SolveStats()
+        if profile:
+            for name, counters in profile.items():
+                self.stats.calls[name] = counters["calls"]
+                self.stats.eliminations[name] = counters["eliminations"]
+                self.stats.seconds[name] = counters["seconds"]
+        self.rerank_every = rerank_every
+        self.order = self.rank()
+        self._calls = 0
+
+    def score(self, strategy):
+        """The expected seconds per candidate removed by a strategy
+
+        Strategies with no counters yet score None; see `rank`.
+        """
+        name = strategy.__name__
+        calls = self.stats.calls.get(name, 0)
+        if not calls:
+            return None
+        cost = self.stats.seconds[name] / calls
+        # One removal is added so that strategies that never make progress are
+        # still ranked by cost rather than all scoring infinity
+        return cost / (self.stats.eliminations.get(name, 0) / calls + 1)
+
+    def rank(self):
+        """Return the strategies ordered from cheapest to most expensive per removal
+
+        Strategies that have not run yet go after every measured one, in their
+        given order, so a ladder that has never needed them keeps them last.
+        """
+        scores = [self.score(strategy) for strategy in self.strategies]
+        order = sorted(
+            range(len(self.strategies)),
+            key=lambda i: (0, scores[i], i) if scores[i] is not None else (1, 0, i),
+        )
+        return tuple(self.strategies[i] for i in order)
+
+    def __call__(self, values):
+        """Reduce `values` until every scheduled strategy has stalled
+
+        Parameters
+        ----------
+        values(dict)
+            a dictionary of the form {'box_name': '123456789', ...}
+
+        Returns
+        -------
+        dict or False
+            The values dictionary after no strategy removes any more candidates, or
+            False if one of them runs into a contradiction
+        """
+        self._calls += 1
+        if self.rerank_every and self._calls % self.rerank_every == 0:
+            self.order = self.rank()
+
+        order = self.order
+        eliminations = self.stats.eliminations
+        level = 0
+        while level < len(order):
+            strategy = order[level]
+            name = strategy.__name__
+            removed = eliminations.get(name, 0)
+            values = self.stats.run(strategy, values)
+            if values is False:
+                return False
+            if eliminations[name] > removed:
+                level = 0
+            elif all(len(candidates) == 1 for candidates in values.values()):
+                # Solved; there is nothing left for the next strategy to find
+                break
+            else:
+                level += 1
+        return values
+
+    def profile(self):
+        """Return the counters of every strategy, as accepted by `Scheduler`"""
+        return {
+            name: {
+                "calls": self.stats.calls[name],
+                "eliminations": self.stats.eliminations.get(name, 0),
+                "seconds": self.stats.seconds[name],
+            }
+            for name in self.stats.calls
+        }
+
+
+def tune(grids, strategies=None):
+    """Learn a strategy profile by solving a corpus of puzzles
+
+    Parameters
+    ----------
+    grids(iterable)
+        the puzzles, as grid strings
+
+    strategies(sequence)
+        the strategies to profile; defaults to DEFAULT_STRATEGIES
+
+    Returns
+    -------
+    dict
+        the counters of every strategy, keyed by strategy name
+    """
+    scheduler = Scheduler(strategies)
+    for grid in grids:
+        solution.search(utils.grid2values(grid), (scheduler,))
+    return scheduler.profile()
+
+
+def save_profile(profile, path):
+    """Write a profile from `tune` to a JSON file"""
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_profile(path):
+    """Read a profile written by `save_profile`"""
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,211 @@
+"""A minimal HTTP solve service
+
+`sudoku-solver serve` answers on localhost:
+
+- POST /solve with a grid string as the body: 200 with the solved grid, 422 with
+  an empty body if the puzzle has no solution, 400 if the body is not a grid (or
+  its Content-Length is not a number), 413 if it is over MAX_BODY bytes; an
+  optional X-Deadline-Ms header gives the milliseconds the answer is wanted
+  within, which orders the puzzles waiting for a worker; 504 if there is no
+  answer by then, 503 if the worker solving it died and 500 if the solve failed
+- GET /health: 200 with the number of worker processes
+
+Requests are handled on threads; with more than one worker process the solves
+themselves run in a `lanes.TwoLaneExecutor`: puzzles the propagation pass solves
+are answered on the request thread, and only the rest queue for the worker pool,
+earliest deadline first. With a single process the search runs on the request
+thread, given the time left before the deadline as its budget. The worker count can be changed without restarting the
+service. Only the standard library is used, like the rest of the command line.
+"""
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from . import lanes
+from . import solution
+from . import utils
+from . import warmpool
+
+CELLS = 81
+GRID_CHARACTERS = set(".0123456789")
+# A grid is 81 characters; leave room for surrounding whitespace but no more
+MAX_BODY = 1024
+
+
+def _solve(grid, method, deadline=None):
+    if deadline is not None:
+        # As in the two lanes, a puzzle the propagation pass settles is answered
+        # whatever its deadline; only the search is given the time that is left
+        solved, grid = lanes.triage(grid)
+        if solved:
+            return grid
+    timeout = None if deadline is None else deadline - time.monotonic()
+    result = solution.solve(grid, method, timeout=timeout)
+    if isinstance(result, solution.BudgetExceeded):
+        raise lanes.DeadlineExceeded("No answer by the deadline")
+    return utils.values2grid(result) if result else None
+
+
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+class SolveService:
+    """Solves puzzles for the request handlers
+
+    Parameters
+    ----------
+    processes(int)
+        the number of worker processes; 1 solves on the request threads
+
+    method(string)
+        the search engine passed on to `solution.solve`
+    """
+
+    def __init__(self, processes=1, method="search"):
+        if method not in solution.SEARCH_METHODS:
+            raise ValueError(f"Unknown search method: {method}")
+        self.processes = 1
+        self.method = method
+        self.pool = None
+        self.resize(processes)
+
+    def resize(self, processes):
+        """Change the number of worker processes; 1 solves on the request threads"""
+        if processes > 1 and self.pool is None:
+            self.pool = lanes.TwoLaneExecutor(processes, self.method)
+        elif processes > 1:
+            self.pool.resize(processes)
+        elif self.pool is not None:
+            self.pool.close()
+            self.pool = None
+        self.processes = processes
+
+    def solve(self, grid, deadline=None):
+        """Return the solved grid string, or None if the puzzle has no solution
+
+        `deadline` is the `time.monotonic()` time the answer is wanted by;
+        `lanes.DeadlineExceeded` is raised if there is no answer by then.
+        """
+        if self.pool is None:
+            return _solve(grid, self.method, deadline)
+        return self.pool.solve(grid, deadline)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep connections open between requests from the same client
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status, body=""):
+        data = body.encode("ascii")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, f"ok {self.server.service.processes}\n")
+        else:
+            self._reply(404)
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY:
+            # The body is left unread, so the connection cannot carry on
+            self.close_connection = True
+            if length < 0:
+                self._reply(400, "bad Content-Length\n")
+            else:
+                self._reply(413, "body too large\n")
+            return
+        grid = self.rfile.read(length).decode("ascii", "replace").strip()
+        deadline = self.headers.get("X-Deadline-Ms")
+        if self.path != "/solve":
+            self._reply(404)
+        elif len(grid) != CELLS or not GRID_CHARACTERS.issuperset(grid):
+            self._reply(400, "not a sudoku grid\n")
+        elif deadline is not None and not _is_number(deadline):
+            self._reply(400, "X-Deadline-Ms must be a number\n")
+        else:
+            if deadline is not None:
+                deadline = time.monotonic() + float(deadline) / 1000
+            try:
+                result = self.server.service.solve(grid.replace("0", "."), deadline)
+            except lanes.DeadlineExceeded:
+                self._reply(504, "deadline exceeded\n")
+                return
+            except warmpool.WorkerDied:
+                # A replacement is started, so the request can be retried
+                self._reply(503, "worker died\n")
+                return
+            except RuntimeError:
+                self._reply(500, "solve failed\n")
+                return
+            if result is None:
+                self._reply(422)
+            else:
+                self._reply(200, result + "\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8081, processes=1, method="search"):
+    """Create the HTTP server; call its `serve_forever`, then `server_close`
+
+    Parameters
+    ----------
+    host(string)
+        the address to listen on
+
+    port(int)
+        the port to listen on; 0 picks a free one, found in `server_address`
+
+    processes(int)
+        the number of worker processes solving the puzzles
+
+    method(string)
+        the search engine passed on to `solution.solve`
+
+    Returns
+    -------
+    ThreadingHTTPServer
+        the server, with its `SolveService` as the `service` attribute; its
+        `server_close` also stops the workers
+    """
+    service = SolveService(processes, method)
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = service
+    close = server.server_close
+
+    def server_close():
+        close()
+        service.close()
+
+    server.server_close = server_close
+    return server
+
+
+def serve(host="127.0.0.1", port=8081, processes=1, method="search"):
+    """Run the service until interrupted"""
+    server = make_server(host, port, processes, method)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,158 @@
+"""Incremental solving state for interactive play
+
+An interactive front end that rebuilds the board with `utils.grid2values` and runs
+a full `solution.solve` on every keystroke repeats almost all of its work. A
+`SudokuSession` keeps the state between edits instead:
+
+- for every box, how many of its peers hold each digit, so placing or clearing a
+  digit only touches the 20 peers of that box, and the candidates of any box are
+  the digits none of its peers hold
+- the last solution found, which stays valid for as long as every digit on the
+  board agrees with it, so "is this still solvable" and "give me a hint" are
+  answered without searching again until the player places a digit the solution
+  does not have
+"""
+from . import solution
+from . import utils
+
+DIGITS = "123456789"
+
+
+class SudokuSession:
+    """The board of a game in progress
+
+    Parameters
+    ----------
+    grid(string)
+        the puzzle, as a grid string; its digits are the givens, which cannot be
+        changed
+    """
+
+    def __init__(self, grid):
+        self.givens = {}
+        self.placed = {}
+        # blocked[box][digit]: the number of peers of box that hold digit
+        self.blocked = {box: dict.fromkeys(DIGITS, 0) for box in utils.boxes}
+        self._solution = None
+        # The number of placed boxes that disagree with _solution
+        self._mismatches = 0
+        # Bumped on every edit; the edit count at which a search found no solution
+        self._version = 0
+        self._unsolvable_at = None
+        for box, digit in zip(utils.boxes, grid):
+            if digit in DIGITS:
+                self.givens[box] = digit
+                self._place(box, digit)
+
+    def _place(self, box, digit):
+        self.placed[box] = digit
+        for peer in solution.peers[box]:
+            self.blocked[peer][digit] += 1
+        if self._solution is not None and self._solution[box] != digit:
+            self._mismatches += 1
+        self._version += 1
+
+    def _clear(self, box):
+        digit = self.placed.pop(box)
+        for peer in solution.peers[box]:
+            self.blocked[peer][digit] -= 1
+        if self._solution is not None and self._solution[box] != digit:
+            self._mismatches -= 1
+        self._version += 1
+
+    def set(self, box, digit):
+        """Place a digit in a box, replacing any digit the player put there
+
+        Raises
+        ------
+        ValueError
+            if the box holds a given or the digit is not 1-9
+        """
+        if box in self.givens:
+            raise ValueError(f"{box} holds a given")
+        if digit not in DIGITS or len(digit) != 1:
+            raise ValueError(f"Not a digit: {digit!r}")
+        if box in self.placed:
+            self._clear(box)
+        self._place(box, digit)
+
+    def unset(self, box):
+        """Clear the digit the player put in a box; clearing an empty box is a no-op
+
+        Raises
+        ------
+        ValueError
+            if the box holds a given
+        """
+        if box in self.givens:
+            raise ValueError(f"{box} holds a given")
+        if box in self.placed:
+            self._clear(box)
+
+    def candidates(self, box):
+        """Return the digits a box can still take, as a string
+
+        A placed box has just its digit; an empty box has every digit that none of
+        its peers holds.
+        """
+        if box in self.placed:
+            return self.placed[box]
+        blocked = self.blocked[box]
+        return "".join(digit for digit in DIGITS if not blocked[digit])
+
+    def values(self):
+        """Return the board as a dictionary of the form {'box_name': '123456789', ...}"""
+        return {box: self.candidates(box) for box in utils.boxes}
+
+    def conflicts(self):
+        """Return the placed boxes that share their digit with a peer"""
+        return [box for box, digit in self.placed.items() if self.blocked[box][digit]]
+
+    def is_solvable(self):
+        """Check whether the board can still be completed
+
+        Searches only if the last solution found disagrees with a digit that has
+        been placed since, and remembers the result until the next edit.
+        """
+        if self._solution is not None and not self._mismatches:
+            return True
+        if self._unsolvable_at == self._version:
+            return False
+        result = False
+        if not self.conflicts():
+            result = solution.search(self.values())
+        if not result:
+            self._unsolvable_at = self._version
+            return False
+        self._solution = result
+        self._mismatches = 0
+        return True
+
+    def hint(self):
+        """Suggest the next digit to place
+
+        Returns
+        -------
+        tuple or None
+            (box, digit) for an empty box with the fewest candidates, with its digit
+            from a solution, or None if the board is complete or cannot be solved
+        """
+        if not self.is_solvable():
+            return None
+        best = None
+        for box in utils.boxes:
+            if box in self.placed:
+                continue
+            count = len(self.candidates(box))
+            if best is None or count < best[0]:
+                best = count, box
+                if count == 1:
+                    break
+        if best is None:
+            return None
+        box = best[1]
+        return box, self._solution[box]
+
+    def is_complete(self):
+        """True once every box holds a digit and no two peers share one"""
+        return len(self.placed) == len(utils.boxes) and not self.conflicts()
@@ -1,4 +1,8 @@
-import utils
+import sys
+import time
+
+from . import utils
+from . import zobrist
 
 row_units = [utils.cross(r, utils.cols) for r in utils.rows]
 column_units = [utils.cross(utils.rows, c) for c in utils.cols]
@@ -68,16 +72,33 @@ def eliminate(values: dict) -> dict:
 
     Returns
     -------
-    dict
-        The values dictionary with the assigned values eliminated from peers
+    dict or False
+        The values dictionary with the assigned values eliminated from peers, or
+        False as soon as a box is left with no available values (this includes two
+        solved boxes in the same unit holding the same digit)
     """
 
-    solved_boxes: list = [box for box in units if len(values[box]) == 1]
+    return _eliminate(values, peers)
+
+
+def _eliminate(values, peers, assign=None):
+    """`eliminate` on the given peers, recording changes through `assign` if given
+
+    Shared with `solver.Solver`, which passes its own topology and history.
+    """
+    solved_boxes: list = [box for box in peers if len(values[box]) == 1]
 
     for box in solved_boxes:
         solved_value: int = values[box]
         for peer in peers[box]:
-            values[peer] = values[peer].replace(solved_value, "")
+            if solved_value in values[peer]:
+                if assign is None:
+                    values[peer] = values[peer].replace(solved_value, "")
+                else:
+                    assign(values, peer, values[peer].replace(solved_value, ""))
+                # A solved peer holding the same digit is emptied here as well
+                if not values[peer]:
+                    return False
 
     return values
 
@@ -95,26 +116,170 @@ def only_choice(values: dict) -> dict:
 
     Returns
     -------
-    dict
-        The values dictionary with all single-valued boxes assigned
+    dict or False
+        The values dictionary with all single-valued boxes assigned, or False as
+        soon as a digit has no place left in one of the units
 
     Notes
     -----
     You should be able to complete this function by copying your code from the classroom
     """
 
+    return _only_choice(values, unitlist)
+
+
+def _only_choice(values, unitlist, assign=None):
+    """`only_choice` on the given units, recording changes through `assign` if given
+
+    Shared with `solver.Solver`, which passes its own topology and history.
+    """
     for unit in unitlist:
         for digit in "123456789":
             # For the given digit, find all boxes that contain the digit in their values
             dplaces: list = [box for box in unit if digit in values[box]]
-            if len(dplaces) == 1:
+            if not dplaces:
+                # Every unit must hold every digit somewhere
+                return False
+            if len(dplaces) == 1 and values[dplaces[0]] != digit:
                 # If the digit appears in only one location, then it is the only choice
-                values[dplaces[0]] = digit
+                if assign is None:
+                    values[dplaces[0]] = digit
+                else:
+                    assign(values, dplaces[0], digit)
 
     return values
 
 
-def reduce_puzzle(values: dict) -> dict | bool:
+class SolveStats:
+    """Counters collected while solving a puzzle
+
+    Attributes
+    ----------
+    nodes(int)
+        the number of calls to `search`
+
+    branches(int)
+        the number of guesses `search` tried, i.e. the children it explored
+
+    calls(dict)
+        the number of times each strategy ran, keyed by strategy name
+
+    eliminations(dict)
+        the number of candidates each strategy removed, keyed by strategy name
+
+    seconds(dict)
+        the time spent in each strategy, keyed by strategy name
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.branches = 0
+        self.calls = {}
+        self.eliminations = {}
+        self.seconds = {}
+
+    def run(self, strategy, values):
+        """Apply a strategy to `values` while recording its cost and yield"""
+        name = strategy.__name__
+        before = sum(map(len, values.values()))
+        start = time.perf_counter()
+        result = strategy(values)
+        self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if result is not False:
+            removed = before - sum(map(len, result.values()))
+            self.eliminations[name] = self.eliminations.get(name, 0) + removed
+        return result
+
+
+class BudgetExhausted(Exception):
+    """Raised inside the search engines when a solve runs out of budget"""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Budget:
+    """Limits on a single solve, checked at every search node
+
+    The checks are a counter increment, a clock read and an Event lookup, so they
+    are cheap enough to leave on for every solve.
+
+    Parameters
+    ----------
+    timeout(float)
+        the number of seconds the solve may take, or None for no limit
+
+    max_nodes(int)
+        the number of search nodes the solve may visit, or None for no limit
+
+    cancel(threading.Event)
+        stops the solve as soon as it is set, or None
+    """
+
+    def __init__(self, timeout=None, max_nodes=None, cancel=None):
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.max_nodes = max_nodes
+        self.cancel = cancel
+        self.nodes = 0
+        self.best = None
+        self.best_candidates = None
+
+    def check(self):
+        """Count a search node; raises BudgetExhausted once a limit is reached
+
+        The node that hits a limit is not counted, so `nodes` is the number of
+        nodes actually visited.
+        """
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise BudgetExhausted("max_nodes")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExhausted("timeout")
+        if self.cancel is not None and self.cancel.is_set():
+            raise BudgetExhausted("cancelled")
+        self.nodes += 1
+
+    def record(self, values):
+        """Keep `values` as the best partial state if it has the fewest candidates"""
+        candidates = sum(map(len, values.values()))
+        if self.best_candidates is None or candidates < self.best_candidates:
+            self.best = values.copy()
+            self.best_candidates = candidates
+
+
+class BudgetExceeded:
+    """The result of a solve that ran out of budget before it finished
+
+    It is falsy, like the False returned for unsolvable puzzles, so it can never
+    be mistaken for a solution; check for it with isinstance.
+
+    Attributes
+    ----------
+    reason(string)
+        "timeout", "max_nodes" or "cancelled"
+
+    values(dict)
+        the best partial candidate state reached (the one with the fewest
+        candidates left)
+
+    nodes(int)
+        the number of search nodes visited
+    """
+
+    def __init__(self, reason, values, nodes):
+        self.reason = reason
+        self.values = values
+        self.nodes = nodes
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return f"BudgetExceeded(reason={self.reason!r}, nodes={self.nodes})"
+
+
+def reduce_puzzle(values: dict, strategies=None, stats=None) -> dict | bool:
     """Reduce a Sudoku puzzle by repeatedly applying all constraint strategies
 
     Parameters
@@ -122,31 +287,42 @@ def reduce_puzzle(values: dict) -> dict | bool:
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
+    strategies(sequence)
+        the strategy stack to apply in order on each pass; each strategy takes and
+        returns a values dictionary, or returns False on a contradiction. Defaults
+        to `eliminate` followed by `only_choice`.
+
+    stats(SolveStats)
+        if given, records the cost and yield of every strategy call
+
     Returns
     -------
     dict or False
         The values dictionary after continued application of the constraint strategies
         no longer produces any changes, or False if the puzzle is unsolvable
     """
+    if strategies is None:
+        strategies = (eliminate, only_choice)
+
     stalled: bool = False
     while not stalled:
-        # Check how many boxes have a determined value
-        solved_values_before: int = len(
-            [box for box in values.keys() if len(values[box]) == 1]
-        )
-
-        # Your code here: Use the Eliminate Strategy
-        values = eliminate(values)
-
-        # Your code here: Use the Only Choice Strategy
-        values = only_choice(values)
-
-        # Check how many boxes have a determined value, to compare
-        solved_values_after: int = len(
-            [box for box in values.keys() if len(values[box]) == 1]
-        )
-        # If no new values were added, stop the loop.
-        stalled = solved_values_before == solved_values_after
+        # Count the remaining candidates; strategies such as naked subsets make
+        # progress without solving any box
+        candidates_before: int = sum(map(len, values.values()))
+
+        # Each strategy returns False the moment it runs into a contradiction, so a
+        # dead branch is pruned without finishing the pass
+        for strategy in strategies:
+            if stats is None:
+                values = strategy(values)
+            else:
+                values = stats.run(strategy, values)
+            if values is False:
+                return False
+
+        # If no candidates were removed, stop the loop.
+        candidates_after: int = sum(map(len, values.values()))
+        stalled = candidates_before == candidates_after
         # Sanity check, return False if there is a box with zero available values:
         if len([box for box in values.keys() if len(values[box]) == 0]):
             return False
@@ -154,7 +330,16 @@ def reduce_puzzle(values: dict) -> dict | bool:
     return values
 
 
-def search(values: dict) -> dict | bool:
+def search(
+    values: dict,
+    strategies=None,
+    stats=None,
+    trace=None,
+    ttable=None,
+    key=None,
+    budget=None,
+    assign=None,
+) -> dict | bool:
     """Apply depth first search to solve Sudoku puzzles in order to solve puzzles
     that cannot be solved by repeated reduction alone.
 
@@ -163,6 +348,32 @@ def search(values: dict) -> dict | bool:
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
+    strategies(sequence)
+        the strategy stack passed on to `reduce_puzzle` at every node
+
+    stats(SolveStats)
+        if given, counts the nodes and branches of the search
+
+    trace(list)
+        if given, receives the grid string of every board the search reduces to,
+        in the order they are visited
+
+    ttable(zobrist.TranspositionTable)
+        if given, boards already known to be dead are pruned on sight, and boards
+        found to be dead are recorded in it. One solve seldom reaches the same
+        board twice, so this pays off only when the table is reused across solves
+
+    key(int)
+        the Zobrist hash of `values` if already known; the search passes each child
+        the hash of its board, updated incrementally from the parent's
+
+    budget(Budget)
+        if given, checked at every node; raises BudgetExhausted once exceeded
+
+    assign(callable)
+        if given, makes every guess as assign(values, box, digit), e.g. to record
+        it like `utils.assign_value`
+
     Returns
     -------
     dict or False
@@ -173,40 +384,78 @@ def search(values: dict) -> dict | bool:
     You should be able to complete this function by copying your code from the classroom
     and extending it to call the naked twins strategy.
     """
+    if stats is not None:
+        stats.nodes += 1
+    if budget is not None:
+        budget.check()
+
+    if ttable is not None:
+        if key is None:
+            key = zobrist.zobrist_hash(values)
+        if key in ttable:
+            return False
 
     # First, reduce the puzzle using the previous function
-    reduced_values = reduce_puzzle(values)
+    reduced_values = reduce_puzzle(values, strategies, stats)
 
     # Return Statements
     # -----------------
     # Check if reduce_puzzle was unsuccessful
     if reduced_values is False:
+        if ttable is not None:
+            ttable.store(key)
         return False
 
     values = reduced_values
+    if budget is not None:
+        budget.record(values)
+    if ttable is not None:
+        # The reduced board may have been reached before from another start
+        reduced_key = zobrist.zobrist_hash(values)
+        if reduced_key != key and reduced_key in ttable:
+            ttable.store(key)
+            return False
+    if trace is not None:
+        trace.append(utils.values2grid(values))
     # Check is all lengths are 1, then puzzle is solved!
     if all(len(values[s]) == 1 for s in utils.boxes):
         return values
 
     # Choose one of the unfilled squares with the fewest possibilities
-    unsolved_values = {key: value for key, value in values.items() if len(value) != 1}
+    unsolved_values = {box: value for box, value in values.items() if len(value) != 1}
     sorted_values = sorted(
-        unsolved_values.keys(), key=lambda key: len(unsolved_values[key])
+        unsolved_values.keys(), key=lambda box: len(unsolved_values[box])
     )
     s = sorted_values[0]
 
     # Recursively solve for each character in unfilled square's string representation
     for value in values[s]:
+        if stats is not None:
+            stats.branches += 1
         new_sudoku = values.copy()
-        new_sudoku[s] = value
+        if assign is None:
+            new_sudoku[s] = value
+        else:
+            assign(new_sudoku, s, value)
+        new_key = None
+        if ttable is not None:
+            new_key = zobrist.update(reduced_key, s, values[s], value)
         # Recursive call:
         # --------------
-        attempt = search(new_sudoku)
+        attempt = search(
+            new_sudoku, strategies, stats, trace, ttable, new_key, budget, assign
+        )
         if attempt:
             return attempt
 
+    if ttable is not None:
+        # Every branch failed, so both the board and its reduction are dead
+        ttable.store(key, len(values[s]))
+        ttable.store(reduced_key, len(values[s]))
+    return False
+
 
-def solve(grid):
+def solve(grid, method="search", timeout=None, max_nodes=None, cancel=None):
     """Find the solution to a Sudoku puzzle using search and constraint propagation
 
     Parameters
@@ -216,31 +465,278 @@ def solve(grid):
 
         Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
 
+    method(string)
+        the search engine to use: "search" for plain depth first search,
+        "iterative" for the same search run on an explicit stack, "backjump" for
+        conflict-directed backjumping with nogood recording or "sat" for the CDCL
+        SAT engine
+
+    timeout(float)
+        give up after this many seconds
+
+    max_nodes(int)
+        give up after visiting this many search nodes (decisions for "sat")
+
+    cancel(threading.Event)
+        give up as soon as this event is set, e.g. from another thread
+
     Returns
     -------
-    dict or False
+    dict or False or BudgetExceeded
         The dictionary representation of the final sudoku grid or False if no solution exists.
+        A BudgetExceeded holding the best partial state is returned instead if a
+        limit was reached first.
     """
     values = utils.grid2values(grid)
-    values = search(values)
+    budget = None
+    if timeout is not None or max_nodes is not None or cancel is not None:
+        budget = Budget(timeout, max_nodes, cancel)
+    try:
+        if method == "search":
+            values = search(values, budget=budget)
+        elif method == "iterative":
+            from . import iterative
+
+            values = iterative.search_iterative(values, budget=budget)
+        elif method == "backjump":
+            from . import backjump
+
+            values = backjump.search_backjump(values, budget=budget)
+        elif method == "sat":
+            from . import sat
+
+            values = sat.search_sat(values, unitlist, budget=budget)
+        else:
+            raise ValueError(f"Unknown search method: {method!r}")
+    except BudgetExhausted as e:
+        best = budget.best if budget.best is not None else utils.grid2values(grid)
+        return BudgetExceeded(e.reason, best, budget.nodes)
     return values
 
 
-if __name__ == "__main__":
-    diag_sudoku_grid = "2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3"
-    utils.display(utils.grid2values(diag_sudoku_grid))
-    result = solve(diag_sudoku_grid)
-    utils.display(result)
+USAGE = """usage: sudoku-solver <command> [options] [GRID ...]
+
+commands:
+  solve    print the solution of each grid as an 81 character string (an empty
+           line if there is none); grids are read from stdin, one per line, when
+           none are given
+  display  print each grid and its solution as a 2-D board
+  play     solve a grid and replay the solution with pygame
+  grade    print each grid with the hardest strategy tier it needs and the
+           number of search branches, tab separated
+  export   render the search trace of a grid to an animated GIF (if --out ends
+           in .gif) or to a directory of PNG frames, without a display
+  serve    answer POST /solve requests over HTTP on localhost until interrupted
+           (see service.py); loadtest.py drives it
+
+options:
+  --method METHOD     the search engine: search (default), iterative,
+                      backjump or sat
+  --processes N       solve, grade, serve: the number of worker processes
+                      (default: solve and serve run in-process, grade uses all
+                      CPUs)
+  --max-memory MB     solve --processes: replace a worker once its resident size
+                      grows past this many megabytes
+  --out PATH          export: the GIF file or frame directory to write
+  --port N            serve: the port to listen on (default: 8081)
+  --input PATH        solve, grade: read the puzzles from a corpus file (one
+                      per line, .sdm or .csv, optionally .gz, .bz2 or .xz
+                      compressed) instead of the command line or stdin
+"""
+
+SEARCH_METHODS = ("search", "iterative", "backjump", "sat")
+
+DIAG_SUDOKU_GRID = (
+    "2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3"
+)
+
+
+def parse_options(argv):
+    """Split arguments into (options, positional arguments)
+
+    Options are given as --name VALUE or --name=VALUE and keyed by name, with
+    dashes turned into underscores. This deliberately avoids argparse, whose import
+    alone costs several times more than solving an easy puzzle.
+
+    Returns
+    -------
+    tuple
+        (options, arguments), or (None, []) if help was asked for
+
+    Raises
+    ------
+    ValueError
+        if an option is missing its value
+    """
+    options, arguments = {}, []
+    args = iter(argv)
+    for arg in args:
+        if arg in ("-h", "--help"):
+            return None, []
+        if arg.startswith("--"):
+            name, sep, value = arg[2:].partition("=")
+            if not sep:
+                value = next(args, None)
+                if value is None:
+                    raise ValueError(f"Option --{name} expects a value")
+            options[name.replace("-", "_")] = value
+        else:
+            arguments.append(arg)
+    return options, arguments
+
+
+def _parse_args(argv):
+    """Split command line arguments into (command, options, grids)"""
+    if not argv or argv[0] in ("-h", "--help"):
+        return None, {}, []
+    options, grids = parse_options(argv[1:])
+    if options is None:
+        return None, {}, []
+    return argv[0], options, grids
+
+
+def _read_grids(grids, path=None):
+    """Yield the grids given on the command line, the puzzles of a corpus file, or
+    the lines of stdin"""
+    if path is not None:
+        from . import corpus
+
+        yield from corpus.read_puzzles(path)
+        return
+    if grids:
+        yield from grids
+        return
+    for line in sys.stdin:
+        line = line.strip()
+        if line:
+            yield line
 
-    try:
-        import PySudoku
 
-        PySudoku.play(utils.grid2values(diag_sudoku_grid), result, utils.history)
+def main(argv=None):
+    """Command line entry point for the `sudoku-solver` script
 
-    except Exception as e:
-        if type(e).__name__ == "SystemExit":
-            pass
+    Each command imports only what it needs: pygame is loaded by `play` alone.
+
+    Parameters
+    ----------
+    argv(list)
+        the command line arguments, without the program name; defaults to sys.argv
+
+    Returns
+    -------
+    int
+        the exit status: 0 on success, 1 if a grid had no solution, 2 on usage errors
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    try:
+        command, options, grids = _parse_args(argv)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if command is None:
+        print(USAGE, end="")
+        return 0
+
+    method = options.pop("method", "search")
+    processes = options.pop("processes", None)
+    out = options.pop("out", None)
+    path = options.pop("input", None)
+    max_memory = options.pop("max_memory", None)
+    port = options.pop("port", None)
+    if method not in SEARCH_METHODS:
+        print(f"Unknown search method: {method}", file=sys.stderr)
+        return 2
+    if options:
+        print(f"Unknown option: --{next(iter(options))}", file=sys.stderr)
+        return 2
+    if path is not None and command not in ("solve", "grade"):
+        print(f"--input does not apply to {command}", file=sys.stderr)
+        return 2
+
+    status = 0
+    if command == "solve" and processes is not None:
+        from . import batch
+
+        if max_memory is not None:
+            max_memory = int(float(max_memory) * 1024 * 1024)
+        for _, result in batch.solve_stream(
+            _read_grids(grids, path), int(processes), method, max_memory=max_memory
+        ):
+            if result is None:
+                status = 1
+                result = ""
+            sys.stdout.write(result + "\n")
+    elif command == "solve":
+        write = sys.stdout.write
+        for grid in _read_grids(grids, path):
+            result = solve(grid, method)
+            if not result:
+                status = 1
+                write("\n")
+            else:
+                write(utils.values2grid(result) + "\n")
+    elif command == "display":
+        for grid in _read_grids(grids):
+            utils.display(utils.grid2values(grid))
+            result = solve(grid, method)
+            if not result:
+                status = 1
+                print("No solution\n")
+            else:
+                utils.display(result)
+    elif command == "play":
+        grid = grids[0] if grids else DIAG_SUDOKU_GRID
+        utils.display(utils.grid2values(grid))
+        result = solve(grid, method)
+        if not result:
+            print("No solution")
+            return 1
+        utils.display(result)
+
+        try:
+            from . import PySudoku
+
+            PySudoku.play(utils.grid2values(grid), result, utils.history)
+
+        except Exception as e:
+            if type(e).__name__ == "SystemExit":
+                pass
+            else:
+                print(
+                    "We could not visualize your board due to a pygame issue. Not a problem! It is not a requirement."
+                )
+    elif command == "grade":
+        from . import grading
+
+        processes = None if processes is None else int(processes)
+        for grid, grade in grading.grade_many(_read_grids(grids, path), processes):
+            if grade.tier == "invalid":
+                status = 1
+            print(f"{grid}\t{grade.tier}\t{grade.branches}")
+    elif command == "export":
+        from . import export
+
+        if out is None:
+            print("export needs --out PATH", file=sys.stderr)
+            return 2
+        trace = export.record_trace(grids[0] if grids else DIAG_SUDOKU_GRID)
+        if out.endswith(".gif"):
+            export.export_gif(trace, out)
         else:
-            print(
-                "We could not visualize your board due to a pygame issue. Not a problem! It is not a requirement."
-            )
+            export.export_png(trace, out)
+    elif command == "serve":
+        from . import service
+
+        port = 8081 if port is None else int(port)
+        processes = 1 if processes is None else int(processes)
+        print(f"Serving on http://127.0.0.1:{port}/solve", file=sys.stderr)
+        service.serve(port=port, processes=processes, method=method)
+    else:
+        print(f"Unknown command: {command}\n\n{USAGE}", end="", file=sys.stderr)
+        return 2
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
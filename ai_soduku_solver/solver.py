@@ -0,0 +1,152 @@
+"""Reentrant solver contexts
+
+The functions in `solution` work on module-level topology (`unitlist`, `units`,
+`peers`) fixed at import, update the values dictionaries they are given in place,
+and `utils.assign_value` records into the process-wide `utils.history`. A `Solver`
+owns everything a solve needs instead: its unit list, units and peers, the
+assignment history and the trace of the boards it visits. It never modifies the
+dictionaries passed to it, so any number of solvers can run at once, one per
+thread, with no shared mutable state; only the read-only tables `solution`
+builds for the standard board are shared between them.
+
+The strategies and the search are those of `solution`, given the solver's
+topology and history instead of the module-level ones.
+
+`thread_scaling.py` measures how throughput scales with the number of threads.
+"""
+from . import solution
+from . import utils
+
+
+class Solver:
+    """A self-contained Sudoku solver
+
+    Create one per thread; creating one for the standard board is cheap since the
+    tables of `solution` are shared.
+
+    Parameters
+    ----------
+    unitlist(list)
+        the units that must each hold every digit once; defaults to
+        `solution.unitlist`. Add the two diagonals for diagonal Sudoku.
+
+    record(bool)
+        keep the assignment history (for `utils.reconstruct`) and the trace of
+        the boards visited by `search`
+
+    strategies(sequence)
+        strategies to run after this solver's eliminate and only choice on every
+        reduction pass. They must not share mutable state between threads, and
+        those from `solution` (such as `naked_twins`) use its module-level
+        topology rather than this solver's
+
+    stats(solution.SolveStats)
+        if given, counts the nodes and branches of every search and the cost of
+        every strategy; give each thread its own
+
+    Attributes
+    ----------
+    history(dict)
+        the assignments made so far, in the form used by `utils.reconstruct`
+
+    trace(list)
+        the grid string of every board `search` reduced to, if recording
+
+    nodes(int)
+        the number of search nodes visited so far
+
+    strategies(tuple)
+        the strategy stack of every reduction pass
+    """
+
+    def __init__(self, unitlist=None, record=False, strategies=(), stats=None):
+        if unitlist is None:
+            unitlist = solution.unitlist
+        self.unitlist = [list(unit) for unit in unitlist]
+        if self.unitlist == solution.unitlist:
+            self.units = solution.units
+            self.peers = solution.peers
+        else:
+            self.units = utils.extract_units(self.unitlist, utils.boxes)
+            self.peers = utils.extract_peers(self.units, utils.boxes)
+        self.record = record
+        self.history = {}
+        self.trace = [] if record else None
+        self.nodes = 0
+        self.stats = stats
+        self._recorder = self._assign if record else None
+        self.strategies = (self.eliminate, self.only_choice) + tuple(strategies)
+
+    def _assign(self, values, box, digit):
+        utils.assign_value(values, box, digit, self.history)
+
+    def eliminate(self, values):
+        """`solution.eliminate` on this solver's peers; updates `values` in place"""
+        return solution._eliminate(values, self.peers, self._recorder)
+
+    def only_choice(self, values):
+        """`solution.only_choice` on this solver's units; updates `values` in place"""
+        return solution._only_choice(values, self.unitlist, self._recorder)
+
+    def reduce(self, values):
+        """Reduce a copy of `values` with this solver's strategies
+
+        Returns
+        -------
+        dict or False
+            the reduced board, or False on a contradiction; `values` is unchanged
+        """
+        return solution.reduce_puzzle(dict(values), self.strategies, self.stats)
+
+    def search(self, values, timeout=None, max_nodes=None, cancel=None):
+        """Solve a copy of `values` by constraint propagation and depth first search
+
+        The limits are those of `solution.solve`.
+
+        Returns
+        -------
+        dict or False or solution.BudgetExceeded
+            the solved board, or False if there is none; `values` is unchanged
+        """
+        budget = solution.Budget(timeout, max_nodes, cancel)
+        try:
+            return solution.search(
+                dict(values),
+                self.strategies,
+                self.stats,
+                self.trace,
+                budget=budget,
+                assign=self._recorder,
+            )
+        except solution.BudgetExhausted as e:
+            best = budget.best if budget.best is not None else dict(values)
+            return solution.BudgetExceeded(e.reason, best, budget.nodes)
+        finally:
+            self.nodes += budget.nodes
+
+    def solve(self, grid, timeout=None, max_nodes=None, cancel=None):
+        """Solve a puzzle given as a grid string
+
+        Parameters
+        ----------
+        grid(string)
+            a string representing a sudoku grid.
+
+            Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+        timeout(float)
+            give up after this many seconds
+
+        max_nodes(int)
+            give up after visiting this many search nodes
+
+        cancel(threading.Event)
+            give up as soon as this event is set
+
+        Returns
+        -------
+        dict or False or solution.BudgetExceeded
+            The dictionary representation of the final sudoku grid or False if no
+            solution exists, or a BudgetExceeded if a limit was reached first.
+        """
+        return self.search(utils.grid2values(grid), timeout, max_nodes, cancel)
@@ -0,0 +1,206 @@
+"""Advanced constraint strategies for Sudoku puzzles
+
+Every strategy here follows the same contract as `solution.eliminate` and
+`solution.only_choice`, so any of them can be slotted into the strategy stack that
+`solution.reduce_puzzle` runs: it takes a values dictionary, removes the candidates
+it can rule out (updating the dictionary in place), and returns the dictionary, or
+False as soon as a box is left with no available values.
+"""
+from itertools import combinations
+
+from .solution import column_units, row_units, unitlist
+
+DIGITS = "123456789"
+
+# Pairs of units sharing at least two boxes (a row and a square, a diagonal and a
+# column, ...), used by locked_candidates
+overlapping_units = [
+    (unit, other)
+    for unit in unitlist
+    for other in unitlist
+    if other is not unit and len(set(unit) & set(other)) > 1
+]
+
+
+def _remove(values, boxes, digits):
+    """Remove each of `digits` from each of `boxes`; returns False if a box empties"""
+    for box in boxes:
+        for digit in digits:
+            if digit in values[box]:
+                values[box] = values[box].replace(digit, "")
+                if not values[box]:
+                    return False
+    return True
+
+
+def naked_subsets(values: dict, sizes=(2, 3, 4)) -> dict | bool:
+    """Apply the naked subsets strategy to a Sudoku puzzle
+
+    The naked subsets strategy generalizes naked twins: if N unsolved boxes in a
+    unit have only N digits between them, then those digits can be eliminated from
+    all other boxes in the same unit.
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    sizes(tuple)
+        the subset sizes to look for; pairs, triples and quads by default
+
+    Returns
+    -------
+    dict or False
+        The values dictionary with the naked subsets eliminated from their units, or
+        False if a box is left with no available values
+    """
+    for unit in unitlist:
+        for size in sizes:
+            unsolved = [box for box in unit if 1 < len(values[box]) <= size]
+            for subset in combinations(unsolved, size):
+                digits = set().union(*(values[box] for box in subset))
+                if len(digits) < size:
+                    # N boxes cannot share fewer than N digits
+                    return False
+                if len(digits) > size:
+                    continue
+                others = [box for box in unit if box not in subset]
+                if not _remove(values, others, digits):
+                    return False
+    return values
+
+
+def locked_candidates(values: dict) -> dict | bool:
+    """Apply the locked candidates strategy to a Sudoku puzzle
+
+    The locked candidates strategy (also known as pointing and claiming) says that
+    if every box in a unit that allows a digit also lies in a second unit, then
+    that digit can be eliminated from the rest of the second unit.
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    Returns
+    -------
+    dict or False
+        The values dictionary with the locked candidates eliminated, or False if a
+        box is left with no available values
+    """
+    for unit, other in overlapping_units:
+        for digit in DIGITS:
+            dplaces = [box for box in unit if digit in values[box]]
+            if len(dplaces) < 2 or not all(box in other for box in dplaces):
+                continue
+            rest = [box for box in other if box not in dplaces]
+            if not _remove(values, rest, digit):
+                return False
+    return values
+
+
+def digit_masks(values):
+    """Compute the row and column occupancy bitmasks of every digit
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    Returns
+    -------
+    tuple
+        (row_masks, column_masks), dictionaries keyed by digit; row_masks[d][r] has
+        bit c set if the box in row r and column c allows digit d, and
+        column_masks[d][c] has bit r set for the same box
+    """
+    row_masks = {digit: [0] * len(row_units) for digit in DIGITS}
+    column_masks = {digit: [0] * len(column_units) for digit in DIGITS}
+    for r, unit in enumerate(row_units):
+        for c, box in enumerate(unit):
+            for digit in values[box]:
+                row_masks[digit][r] |= 1 << c
+                column_masks[digit][c] |= 1 << r
+    return row_masks, column_masks
+
+
+def _bits(mask):
+    """Yield the positions of the set bits of a mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def fish(values: dict, size: int) -> dict | bool:
+    """Apply the basic fish strategy of the given size to a Sudoku puzzle
+
+    If a digit's places in N rows all fall within the same N columns, the digit
+    must occupy those columns within those rows, so it can be eliminated from the
+    rest of the N columns; the same holds with rows and columns swapped. Size 2 is
+    the X-Wing, 3 the Swordfish and 4 the Jellyfish.
+
+    The patterns are found on the per-digit occupancy bitmasks from `digit_masks`,
+    so testing a set of base lines is an OR and a popcount rather than a scan of
+    their boxes.
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    size(int)
+        the number of base lines in the pattern
+
+    Returns
+    -------
+    dict or False
+        The values dictionary with the fish eliminations applied, or False if a box
+        is left with no available values or N lines have fewer than N places for a
+        digit
+    """
+    row_masks, column_masks = digit_masks(values)
+    for digit in DIGITS:
+        orientations = (
+            (row_masks[digit], column_masks[digit], row_units),
+            (column_masks[digit], row_masks[digit], column_units),
+        )
+        for base_masks, cover_masks, base_units in orientations:
+            lines = [
+                i for i, mask in enumerate(base_masks) if 1 < mask.bit_count() <= size
+            ]
+            for subset in combinations(lines, size):
+                covers = bases = 0
+                for i in subset:
+                    covers |= base_masks[i]
+                    bases |= 1 << i
+                count = covers.bit_count()
+                if count < size:
+                    return False
+                if count > size:
+                    continue
+                for j in _bits(covers):
+                    for i in _bits(cover_masks[j] & ~bases):
+                        box = base_units[i][j]
+                        values[box] = values[box].replace(digit, "")
+                        if not values[box]:
+                            return False
+                        # Keep both views of the digit in step for later patterns
+                        base_masks[i] &= ~(1 << j)
+                        cover_masks[j] &= ~(1 << i)
+    return values
+
+
+def x_wing(values: dict) -> dict | bool:
+    """Apply the X-Wing strategy (a fish of size 2); see `fish`"""
+    return fish(values, 2)
+
+
+def swordfish(values: dict) -> dict | bool:
+    """Apply the Swordfish strategy (a fish of size 3); see `fish`"""
+    return fish(values, 3)
+
+
+def jellyfish(values: dict) -> dict | bool:
+    """Apply the Jellyfish strategy (a fish of size 4); see `fish`"""
+    return fish(values, 4)
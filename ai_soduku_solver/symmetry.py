@@ -0,0 +1,359 @@
+"""Canonical forms of Sudoku grids under the symmetries of the board
+
+Relabeling the digits, permuting the rows within a band or the columns within a
+stack, permuting the bands or the stacks and transposing the board all turn a
+valid puzzle into another valid puzzle whose solutions map one to one onto the
+original's. `canonical_form` picks one representative of every such class, the
+lexicographically smallest grid string reachable (empty boxes sort first), along
+with the `Transform` that reaches it, so copies of one puzzle can be recognized
+and solved once with `solve_classes`.
+
+The smallest grid is built row by row. For each orientation and each choice of
+first row, every column order is tried and only the column orders and relabelings
+that tie for the smallest first row are kept; each later row then extends the
+surviving partial boards with every row the band structure still allows, again
+keeping only the ties. The ties are what make the result exact: a choice that
+looks equal so far can still win on a later row. Ties that can only be completed
+the same way (as with columns no row has told apart yet) are merged, which keeps
+sparse and highly symmetric grids from multiplying the candidates.
+
+Finding a canonical form takes tens of milliseconds, far longer than an easy
+puzzle takes to solve, so `solve_classes` only canonicalizes the puzzles the
+propagation pass leaves unsolved.
+"""
+from itertools import permutations, product
+from operator import itemgetter
+
+from . import solution
+from . import utils
+
+N = 9
+BANDS = ((0, 1, 2), (3, 4, 5), (6, 7, 8))
+
+
+def _line_orders():
+    """Every order of the 9 rows (or columns) that keeps bands (or stacks) intact"""
+    orders = []
+    for band_order in permutations(BANDS):
+        for within in product(*(permutations(band) for band in band_order)):
+            orders.append(sum(within, ()))
+    return orders
+
+
+LINE_ORDERS = _line_orders()
+
+
+class Transform:
+    """A symmetry of the Sudoku board
+
+    Applying it transposes the grid (if `transpose`), then takes the rows in the
+    order `rows` and the columns in the order `cols`, then relabels the digits
+    through `digits`.
+
+    Parameters
+    ----------
+    transpose(bool)
+        whether to transpose the grid first
+
+    rows(tuple)
+        row i of the result is row rows[i] of the (transposed) grid
+
+    cols(tuple)
+        column j of the result is column cols[j] of the (transposed) grid
+
+    digits(dict)
+        the new label of every digit; empty boxes stay empty
+    """
+
+    def __init__(self, transpose, rows, cols, digits):
+        self.transpose = transpose
+        self.rows = tuple(rows)
+        self.cols = tuple(cols)
+        self.digits = dict(digits)
+
+    def __repr__(self):
+        return (
+            f"Transform(transpose={self.transpose!r}, rows={self.rows!r}, "
+            f"cols={self.cols!r}, digits={self.digits!r})"
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, Transform) and (
+            self.transpose,
+            self.rows,
+            self.cols,
+            self.digits,
+        ) == (other.transpose, other.rows, other.cols, other.digits)
+
+    def apply(self, grid):
+        """Return the grid string the transform maps `grid` to"""
+        if isinstance(grid, dict):
+            grid = utils.values2grid(grid)
+        if self.transpose:
+            grid = "".join(grid[c * N + r] for r in range(N) for c in range(N))
+        digits = self.digits
+        return "".join(
+            digits.get(grid[r * N + c], grid[r * N + c])
+            for r in self.rows
+            for c in self.cols
+        )
+
+    def inverse(self):
+        """Return the transform that maps the result of `apply` back"""
+        rows = [0] * N
+        cols = [0] * N
+        for i, r in enumerate(self.rows):
+            rows[r] = i
+        for j, c in enumerate(self.cols):
+            cols[c] = j
+        digits = {new: old for old, new in self.digits.items()}
+        if self.transpose:
+            # Undoing the permutation and then transposing is the same as
+            # transposing first and permuting with rows and columns swapped
+            return Transform(True, cols, rows, digits)
+        return Transform(False, rows, cols, digits)
+
+
+# Digits without a label yet are translated to placeholders that cannot be
+# mistaken for labels
+PLACEHOLDERS = "abcdefghi"
+_UNLABELLED = {ord(digit): p for digit, p in zip("123456789", PLACEHOLDERS)}
+_GETTERS = [itemgetter(*cols) for cols in LINE_ORDERS]
+
+
+def _relabel(line, table, next_label):
+    """Relabel a row, labelling new digits in order of appearance
+
+    Parameters
+    ----------
+    line(string)
+        the row, already in its new column order
+
+    table(dict)
+        a str.translate table mapping every digit to its label, or to its
+        placeholder if it has no label yet
+
+    next_label(int)
+        the label for the next new digit
+
+    Returns
+    -------
+    tuple
+        the relabeled row, the table with the new labels (`table` itself if the
+        row had no new digits) and the next label
+    """
+    row = line.translate(table)
+    new = [ch for ch in dict.fromkeys(row) if ch in PLACEHOLDERS]
+    if not new:
+        return row, table, next_label
+    table = dict(table)
+    labels = {}
+    for label, placeholder in enumerate(new, next_label):
+        labels[placeholder] = str(label)
+        table[ord("1") + PLACEHOLDERS.index(placeholder)] = str(label)
+    return row.translate(str.maketrans(labels)), table, next_label + len(new)
+
+
+def _completions_key(state):
+    """A key shared by partial boards that can only be completed the same ways
+
+    What is left to choose is determined by the rows not yet used, in their column
+    order and relabeled so far, grouped by band, with the band in progress (whose
+    rows must come next) kept apart.
+    """
+    lines, rows, k, table, next_label = state[1:]
+    getter = _GETTERS[k]
+    used = set(rows)
+    current = rows[-1] // 3 if len(rows) % 3 else None
+    head, bands = (), []
+    for b, band in enumerate(BANDS):
+        if b != current and not used.isdisjoint(band):
+            continue
+        contents = tuple(
+            sorted(
+                "".join(getter(lines[r])).translate(table)
+                for r in band
+                if r not in used
+            )
+        )
+        if b == current:
+            head = contents
+        else:
+            bands.append(contents)
+    return head, tuple(sorted(bands)), next_label
+
+
+def _dedup(beam, row):
+    """Keep one partial board of every group that completes identically
+
+    Such groups come from columns that no row so far tells apart, which needs
+    empty boxes in the rows; a full row gives every column its own label, so the
+    keys are not worth computing.
+    """
+    if len(beam) < 2 or "." not in row:
+        return beam
+    return list({_completions_key(state): state for state in reversed(beam)}.values())
+
+
+def canonical_form(grid):
+    """Find the canonical representative of a grid's symmetry class
+
+    Parameters
+    ----------
+    grid(string)
+        a string representing a sudoku grid, or a values dictionary.
+
+        Ex. '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+    Returns
+    -------
+    tuple
+        (canonical grid string, Transform) where the transform maps `grid` to the
+        canonical grid; every grid in the same class has the same canonical grid
+    """
+    if isinstance(grid, dict):
+        grid = utils.values2grid(grid)
+    transposed = "".join(grid[c * N + r] for r in range(N) for c in range(N))
+
+    # Partial boards: (transpose, grid rows, rows used, index of the column order,
+    # translate table, next label)
+    best, beam = None, []
+    for transpose, g in ((False, grid), (True, transposed)):
+        lines = [g[r * N : (r + 1) * N] for r in range(N)]
+        for r in range(N):
+            line = lines[r]
+            # Sparse rows give the same first row for many column orders
+            relabeled = {}
+            for k, getter in enumerate(_GETTERS):
+                permuted = "".join(getter(line))
+                result = relabeled.get(permuted)
+                if result is None:
+                    result = relabeled[permuted] = _relabel(permuted, _UNLABELLED, 1)
+                row, table, next_label = result
+                if best is None or row < best:
+                    best, beam = row, []
+                if row == best:
+                    beam.append((transpose, lines, (r,), k, table, next_label))
+    beam = _dedup(beam, best)
+
+    for i in range(1, N):
+        best, extended = None, []
+        for transpose, lines, rows, k, table, next_label in beam:
+            if i % 3:
+                # Stay in the band of the previous row
+                band = BANDS[rows[-1] // 3]
+            else:
+                used = {row // 3 for row in rows}
+                band = sum((b for j, b in enumerate(BANDS) if j not in used), ())
+            getter = _GETTERS[k]
+            for r in band:
+                if r in rows:
+                    continue
+                row, new_table, new_label = _relabel(
+                    "".join(getter(lines[r])), table, next_label
+                )
+                if best is None or row < best:
+                    best, extended = row, []
+                if row == best:
+                    extended.append(
+                        (transpose, lines, rows + (r,), k, new_table, new_label)
+                    )
+        beam = _dedup(extended, best)
+
+    transpose, lines, rows, k, table, next_label = beam[0]
+    # Digits that never appear take the remaining labels in order
+    digits = {}
+    for digit in "123456789":
+        label = table[ord(digit)]
+        if label in PLACEHOLDERS:
+            label = str(next_label)
+            next_label += 1
+        digits[digit] = label
+    transform = Transform(transpose, rows, LINE_ORDERS[k], digits)
+    return transform.apply(grid), transform
+
+
+def group_by_class(grids):
+    """Group grids by their canonical form
+
+    Parameters
+    ----------
+    grids(iterable)
+        grid strings
+
+    Returns
+    -------
+    dict
+        canonical grid -> list of (index, Transform) for every grid in the class,
+        where the transform maps that grid to the canonical one
+    """
+    classes = {}
+    for i, grid in enumerate(grids):
+        canonical, transform = canonical_form(grid)
+        classes.setdefault(canonical, []).append((i, transform))
+    return classes
+
+
+def solve_classes(grids, solve=None, unitlist=None):
+    """Solve each symmetry class once and map the solution back to every member
+
+    Canonical forms are expensive next to an easy solve, so repeated grids are
+    looked at once and every grid first gets the propagation pass: only the
+    puzzles it leaves unsolved are canonicalized (in their reduced form, which has
+    more boxes filled in) and passed to `solve`.
+
+    Parameters
+    ----------
+    grids(sequence)
+        the puzzles, as grid strings
+
+    solve(callable)
+        takes a grid string and returns a values dictionary or False; defaults to
+        `solution.solve`
+
+    unitlist(list)
+        the units the puzzles obey; defaults to `solution.unitlist`. Only the
+        standard rows, columns and squares are preserved by the symmetries, so
+        any other unit list (diagonals, for one) raises ValueError
+
+    Returns
+    -------
+    list
+        the solved grid strings in the order the puzzles were given, with None
+        for every puzzle that has no solution
+    """
+    if unitlist is None:
+        unitlist = solution.unitlist
+    standard = solution.row_units + solution.column_units + solution.square_units
+    if unitlist != standard:
+        raise ValueError("Symmetry classes need the standard rows, columns and squares")
+    if solve is None:
+        solve = solution.solve
+
+    results = [None] * len(grids)
+    repeats = {}
+    for i, grid in enumerate(grids):
+        repeats.setdefault(grid, []).append(i)
+    unsolved = {}
+    for grid, indices in repeats.items():
+        values = solution.reduce_puzzle(utils.grid2values(grid))
+        if values is False:
+            continue
+        reduced = utils.values2grid(values)
+        if "." in reduced:
+            unsolved.setdefault(reduced, []).extend(indices)
+        else:
+            for i in indices:
+                results[i] = reduced
+
+    reduced_grids = list(unsolved)
+    for canonical, members in group_by_class(reduced_grids).items():
+        solved = solve(canonical)
+        if not solved:
+            continue
+        solved = utils.values2grid(solved)
+        for j, transform in members:
+            answer = transform.inverse().apply(solved)
+            for i in unsolved[reduced_grids[j]]:
+                results[i] = answer
+    return results
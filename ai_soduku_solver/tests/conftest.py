@@ -5,8 +5,8 @@ import os
 
 # Get the current directory (tests directory)
 current_dir = os.path.dirname(os.path.abspath(__file__))
-# Get the parent directory (project root)
-project_root = os.path.dirname(current_dir)
+# Get the repository root, the parent of the package directory
+project_root = os.path.dirname(os.path.dirname(current_dir))
 
-# Add the project root directory to sys.path
-sys.path.insert(0, project_root)
\ No newline at end of file
+# Add the repository root to sys.path so the package imports as ai_soduku_solver
+sys.path.insert(0, project_root)
@@ -0,0 +1,40 @@
+import unittest
+
+from ai_soduku_solver import backjump
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+
+
+class TestSearchBackjump(unittest.TestCase):
+    hard_grid = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+
+    def test_matches_search(self):
+        self.assertEqual(
+            solution.solve(self.hard_grid, method="backjump"),
+            solution.solve(self.hard_grid),
+        )
+
+    def test_unsolvable(self):
+        values = utils.grid2values("22" + "." * 79)
+        self.assertIs(backjump.search_backjump(values), False)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            solution.solve(self.hard_grid, method="bogus")
+
+
+class TestNogoodStore(unittest.TestCase):
+    def test_bounded(self):
+        store = backjump.NogoodStore(max_nogoods=2)
+        for box in ("A1", "A2", "A3"):
+            store.add(frozenset([(box, "1"), ("B1", "2")]))
+        self.assertEqual(len(store), 2)
+        # The least recently used nogood was evicted
+        values = {"A1": "1", "A2": "1", "A3": "1", "B1": "2"}
+        self.assertIsNone(store.match(values, ("A1", "1")))
+        self.assertIsNotNone(store.match(values, ("A3", "1")))
+        self.assertEqual(store.hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
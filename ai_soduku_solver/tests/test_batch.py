@@ -0,0 +1,49 @@
+import unittest
+
+from ai_soduku_solver import batch
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+
+
+class TestBatch(unittest.TestCase):
+    grids = [
+        "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+        "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+        "11" + "." * 79,
+    ]
+
+    def expected(self):
+        results = []
+        for grid in self.grids:
+            result = solution.solve(grid)
+            results.append(utils.values2grid(result) if result else None)
+        return results
+
+    def test_in_process(self):
+        self.assertEqual(batch.solve_batch(self.grids, processes=1), self.expected())
+
+    def test_workers(self):
+        with batch.BatchSolver(processes=2, chunksize=1) as solver:
+            self.assertEqual(solver.solve(self.grids), self.expected())
+            # The same workers serve later batches
+            self.assertEqual(solver.solve(self.grids[::-1]), self.expected()[::-1])
+            self.assertEqual(solver.solve([]), [])
+
+    def test_memory_budget(self):
+        # Every worker is over a one byte budget, so each retires after one range
+        with batch.BatchSolver(processes=2, chunksize=1, max_memory=1) as solver:
+            self.assertEqual(solver.solve(self.grids), self.expected())
+            self.assertEqual(solver.recycled, len(self.grids))
+            self.assertEqual(solver.solve(self.grids), self.expected())
+            self.assertTrue(all(worker.is_alive() for worker in solver.workers))
+
+    def test_resident_memory(self):
+        self.assertGreater(batch.resident_memory(), 0)
+
+    def test_bad_grid(self):
+        with self.assertRaises(ValueError):
+            batch.solve_batch(["123"], processes=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
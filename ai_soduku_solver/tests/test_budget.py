@@ -0,0 +1,51 @@
+import threading
+import unittest
+
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+
+
+class TestBudget(unittest.TestCase):
+    hard_grid = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+
+    def test_max_nodes(self):
+        for method in solution.SEARCH_METHODS:
+            result = solution.solve(self.hard_grid, method, max_nodes=3)
+            self.assertIsInstance(result, solution.BudgetExceeded, method)
+            self.assertFalse(result)
+            self.assertEqual(result.reason, "max_nodes")
+            self.assertEqual(len(result.values), 81)
+
+    def test_best_partial_state(self):
+        result = solution.solve(self.hard_grid, max_nodes=5)
+        self.assertLess(sum(map(len, result.values.values())), 81 * 9)
+        self.assertEqual(result.nodes, 5)
+
+    def test_sat_partial_state(self):
+        result = solution.solve(self.hard_grid, "sat", max_nodes=3)
+        self.assertEqual(result.nodes, 3)
+        # The board the trail implies, not the initial grid
+        initial = utils.grid2values(self.hard_grid)
+        self.assertLess(
+            sum(map(len, result.values.values())), sum(map(len, initial.values()))
+        )
+        for box, candidates in result.values.items():
+            self.assertTrue(set(candidates) <= set(initial[box]))
+
+    def test_timeout(self):
+        result = solution.solve(self.hard_grid, timeout=0)
+        self.assertEqual(result.reason, "timeout")
+
+    def test_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        result = solution.solve(self.hard_grid, "backjump", cancel=cancel)
+        self.assertEqual(result.reason, "cancelled")
+
+    def test_within_budget(self):
+        result = solution.solve(self.hard_grid, timeout=60, max_nodes=10**6)
+        self.assertEqual(result, solution.solve(self.hard_grid))
+
+
+if __name__ == "__main__":
+    unittest.main()
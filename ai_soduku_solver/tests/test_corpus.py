@@ -0,0 +1,78 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from ai_soduku_solver import batch
+from ai_soduku_solver import corpus
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+
+
+class TestCorpus(unittest.TestCase):
+    puzzles = [
+        "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+        "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.solutions = [utils.values2grid(solution.solve(p)) for p in self.puzzles]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        opener = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}.get(
+            os.path.splitext(name)[1], open
+        )
+        with opener(path, "wt") as f:
+            f.write(text)
+        return path
+
+    def test_lines(self):
+        text = "# a comment\n\n" + "".join(p + " 4.5\n" for p in self.puzzles)
+        for name in ("puzzles.txt", "puzzles.txt.gz", "puzzles.bz2", "puzzles.xz"):
+            path = self.write(name, text)
+            self.assertEqual(list(corpus.read_puzzles(path)), self.puzzles, name)
+
+    def test_sdm(self):
+        text = "".join(p.replace(".", "0") + "\n" for p in self.puzzles)
+        path = self.write("puzzles.sdm.gz", text)
+        self.assertEqual(corpus.detect_format(path), "sdm")
+        self.assertEqual(list(corpus.read_puzzles(path)), self.puzzles)
+
+    def test_csv(self):
+        rows = "".join(
+            f"{p.replace('.', '0')},{s}\n" for p, s in zip(self.puzzles, self.solutions)
+        )
+        path = self.write("puzzles.csv.xz", "quizzes,solutions\n" + rows)
+        pairs = list(corpus.read_pairs(path))
+        self.assertEqual(pairs, list(zip(self.puzzles, self.solutions)))
+
+    def test_bad_grid(self):
+        path = self.write("puzzles.txt", self.puzzles[0] + "\n" + "x" * 81 + "\n")
+        with self.assertRaisesRegex(ValueError, "puzzles.txt:2"):
+            list(corpus.read_puzzles(path))
+
+    def test_solve_stream(self):
+        path = self.write("puzzles.txt.gz", "\n".join(self.puzzles * 3))
+        pairs = list(batch.solve_stream(corpus.read_puzzles(path), 1, batch_size=2))
+        self.assertEqual(pairs, list(zip(self.puzzles, self.solutions)) * 3)
+
+    def test_main_input(self):
+        path = self.write("puzzles.txt.bz2", "\n".join(self.puzzles))
+        out = io.StringIO()
+        with redirect_stdout(out):
+            status = solution.main(["solve", "--input", path])
+        self.assertEqual(status, 0)
+        self.assertEqual(out.getvalue().split(), self.solutions)
+
+
+if __name__ == "__main__":
+    unittest.main()
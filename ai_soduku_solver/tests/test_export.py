@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+try:
+    import PIL
+except ImportError:
+    PIL = None
+
+from ai_soduku_solver import export
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+
+
+class TestRecordTrace(unittest.TestCase):
+    def test_record_trace(self):
+        grid = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+        trace = export.record_trace(grid)
+        self.assertEqual(trace[0], grid)
+        self.assertEqual(trace[-1], utils.values2grid(solution.solve(grid)))
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestExport(unittest.TestCase):
+    trace = [
+        "2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3",
+        "24............62....1....7...6..8...3...9...7...6..4...4....8....52.............3",
+        "24............62....1....7...6..8...3...9...7...6..4...4....8....52............93",
+    ]
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+    def test_export_png(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = export.export_png(self.trace, directory)
+            self.assertEqual(len(paths), 3)
+            self.assertEqual(
+                sorted(os.listdir(directory)), [os.path.basename(p) for p in paths]
+            )
+            last = pygame.image.load(paths[-1])
+            self.assertEqual(last.get_size(), export.BOARD_SIZE)
+
+    def test_frames_match_fresh_render(self):
+        # The incremental frames must match drawing each board from scratch
+        frames = [
+            pygame.image.tobytes(s, "RGB") for s in export.render_frames(self.trace)
+        ]
+        for board, frame in zip(self.trace, frames):
+            (fresh,) = export.render_frames([board])
+            self.assertEqual(pygame.image.tobytes(fresh, "RGB"), frame)
+
+    @unittest.skipIf(PIL is None, "Pillow is not installed")
+    def test_export_gif(self):
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.gif")
+            self.assertEqual(export.export_gif(self.trace, path), 3)
+            with Image.open(path) as image:
+                self.assertEqual(image.n_frames, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
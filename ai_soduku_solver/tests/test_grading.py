@@ -0,0 +1,99 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from ai_soduku_solver import grading
+from ai_soduku_solver import strategies
+from ai_soduku_solver import utils
+
+
+def blank_values():
+    return {box: "123456789" for box in utils.boxes}
+
+
+class TestStrategies(unittest.TestCase):
+    def test_naked_subsets(self):
+        values = blank_values()
+        values["A1"] = values["A2"] = "12"
+        values = strategies.naked_subsets(values)
+        self.assertEqual(values["A3"], "3456789")
+        self.assertEqual(values["B1"], "3456789")
+        self.assertEqual(values["D1"], "123456789")
+
+    def test_naked_subsets_contradiction(self):
+        values = blank_values()
+        values["A1"] = values["A2"] = values["A3"] = "12"
+        self.assertIs(strategies.naked_subsets(values), False)
+
+    def test_locked_candidates(self):
+        values = blank_values()
+        for box in ("B1", "B2", "B3", "C1", "C2", "C3"):
+            values[box] = "23456789"
+        values = strategies.locked_candidates(values)
+        self.assertEqual(values["A4"], "23456789")
+        self.assertEqual(values["A1"], "123456789")
+
+    def test_x_wing(self):
+        values = blank_values()
+        for row in "AE":
+            for col in "2346789":
+                values[row + col] = "23456789"
+        values = strategies.x_wing(values)
+        self.assertEqual(values["C1"], "23456789")
+        self.assertEqual(values["I5"], "23456789")
+        self.assertEqual(values["C2"], "123456789")
+
+    def test_digit_masks(self):
+        values = blank_values()
+        values["A1"] = "1"
+        values["B3"] = "23"
+        row_masks, column_masks = strategies.digit_masks(values)
+        self.assertEqual(row_masks["1"][0], 0b111111111)
+        self.assertEqual(row_masks["1"][1], 0b111111011)
+        self.assertEqual(column_masks["2"][2], 0b111111111)
+        self.assertEqual(column_masks["1"][2], 0b111111101)
+
+    def test_fish_contradiction(self):
+        values = blank_values()
+        # Digit 1 confined to columns 1 and 2 in three rows
+        for row in "ABC":
+            for col in "3456789":
+                values[row + col] = "23456789"
+        self.assertIs(strategies.swordfish(values), False)
+
+
+class TestGrade(unittest.TestCase):
+    grids = [
+        "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+        "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+        "22" + "." * 79,
+    ]
+
+    def test_grade(self):
+        self.assertEqual(grading.grade(self.grids[0]), ("singles", 1, 0))
+        self.assertEqual(grading.grade(self.grids[1]), ("subsets", 2, 0))
+        self.assertEqual(grading.grade(self.grids[2]), ("invalid", 0, 0))
+
+    def test_search_branches(self):
+        hard_grid = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+        tier, level, branches = grading.grade(hard_grid)
+        self.assertEqual((tier, level), ("search", 4))
+        self.assertGreater(branches, 0)
+
+    def test_grade_many(self):
+        expected = [(grid, grading.grade(grid)) for grid in self.grids]
+        self.assertEqual(list(grading.grade_many(self.grids, processes=2)), expected)
+
+    def test_grade_file(self):
+        expected = [(grid, grading.grade(grid)) for grid in self.grids]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "puzzles.csv.gz")
+            with gzip.open(path, "wt") as f:
+                f.write("quizzes\n")
+                f.writelines(f"{grid}\n" for grid in self.grids)
+            self.assertEqual(list(grading.grade_file(path, processes=1)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+
+from ai_soduku_solver import iterative
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+from ai_soduku_solver import verify
+
+
+class TestIterativeSearch(unittest.TestCase):
+    grids = [
+        "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+        "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    ]
+
+    def test_same_as_recursive(self):
+        for grid in self.grids:
+            expected_stats, expected_trace = solution.SolveStats(), []
+            expected = solution.search(
+                utils.grid2values(grid), stats=expected_stats, trace=expected_trace
+            )
+            stats, trace = solution.SolveStats(), []
+            result = iterative.search_iterative(
+                utils.grid2values(grid), stats=stats, trace=trace
+            )
+            self.assertEqual(result, expected)
+            self.assertEqual(stats.nodes, expected_stats.nodes)
+            self.assertEqual(stats.branches, expected_stats.branches)
+            self.assertEqual(trace, expected_trace)
+
+    def test_input_not_modified(self):
+        values = utils.grid2values(self.grids[0])
+        original = dict(values)
+        iterative.search_iterative(values)
+        self.assertEqual(values, original)
+
+    def test_pause_and_resume(self):
+        grid = self.grids[1]
+        stats = solution.SolveStats()
+        engine = iterative.IterativeSearch(utils.grid2values(grid), stats=stats)
+        self.assertIsNone(engine.run(max_nodes=5))
+        self.assertFalse(engine.done)
+        self.assertEqual(stats.nodes, 5)
+        while engine.run(max_nodes=5) is None:
+            pass
+        self.assertTrue(engine.done)
+        self.assertEqual(engine.result, solution.search(utils.grid2values(grid)))
+
+    def test_resume_after_budget(self):
+        grid = self.grids[1]
+        engine = iterative.IterativeSearch(
+            utils.grid2values(grid), budget=solution.Budget(max_nodes=3)
+        )
+        with self.assertRaises(solution.BudgetExhausted):
+            engine.run()
+        engine.budget = None
+        self.assertEqual(engine.run(), solution.search(utils.grid2values(grid)))
+
+    def test_no_solution(self):
+        values = utils.grid2values("11" + "." * 79)
+        self.assertIs(iterative.search_iterative(values), False)
+
+
+class TestIterSolutions(unittest.TestCase):
+    # 43 solutions
+    grid = "..3.2.6..9..............4....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3.."
+
+    def test_unique(self):
+        grid = TestIterativeSearch.grids[0]
+        solutions = list(iterative.iter_solutions(grid))
+        self.assertEqual(solutions, [solution.search(utils.grid2values(grid))])
+
+    def test_all_solutions(self):
+        solutions = [utils.values2grid(s) for s in iterative.iter_solutions(self.grid)]
+        self.assertEqual(len(solutions), 43)
+        self.assertEqual(len(set(solutions)), 43)
+        for grid in solutions:
+            self.assertTrue(verify.verify(utils.grid2values(grid), self.grid))
+
+    def test_lazy(self):
+        solutions = iterative.iter_solutions(self.grid)
+        first = next(solutions)
+        self.assertEqual(first, solution.search(utils.grid2values(self.grid)))
+
+    def test_shards_partition_solutions(self):
+        expected = {utils.values2grid(s) for s in iterative.iter_solutions(self.grid)}
+        for split_depth in (1, 2, 3):
+            found = []
+            for index in range(3):
+                found += [
+                    utils.values2grid(s)
+                    for s in iterative.iter_solutions(
+                        self.grid, shard=(index, 3), split_depth=split_depth
+                    )
+                ]
+            self.assertEqual(len(found), len(expected))
+            self.assertEqual(set(found), expected)
+
+    def test_invalid_shard(self):
+        with self.assertRaises(ValueError):
+            list(iterative.iter_solutions(self.grid, shard=(3, 3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import time
+import unittest
+
+from ai_soduku_solver import lanes
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+
+
+def solved(grid):
+    result = solution.solve(grid)
+    return utils.values2grid(result) if result else None
+
+
+class TestTriage(unittest.TestCase):
+    easy = "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3.."
+    hard = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+
+    def test_easy(self):
+        self.assertEqual(lanes.triage(self.easy), (True, solved(self.easy)))
+        self.assertEqual(lanes.triage("11" + "." * 79), (True, None))
+
+    def test_hard(self):
+        done, reduced = lanes.triage(self.hard)
+        self.assertFalse(done)
+        self.assertGreaterEqual(reduced.count("."), 1)
+        self.assertLess(reduced.count("."), self.hard.count("."))
+        self.assertEqual(solved(reduced), solved(self.hard))
+
+
+class TestTwoLaneExecutor(unittest.TestCase):
+    easy = TestTriage.easy
+    hard = [
+        "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+        "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+        "6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....",
+        "48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5....",
+    ]
+
+    def test_results(self):
+        grids = [self.easy, self.hard[0], "11" + "." * 79]
+        with lanes.TwoLaneExecutor(processes=2) as executor:
+            futures = [executor.submit(grid) for grid in grids]
+            self.assertEqual([f.result() for f in futures], [solved(g) for g in grids])
+            self.assertEqual((executor.easy, executor.hard), (2, 1))
+
+    def test_easy_lane_does_not_wait(self):
+        with lanes.TwoLaneExecutor(processes=1) as executor:
+            busy = [executor.submit(grid) for grid in self.hard]
+            easy = executor.submit(self.easy)
+            self.assertTrue(easy.done())
+            self.assertEqual(easy.result(), solved(self.easy))
+            self.assertFalse(all(f.done() for f in busy))
+            for future in busy:
+                future.result()
+
+    def test_earliest_deadline_first(self):
+        finished = []
+        now = time.monotonic()
+        with lanes.TwoLaneExecutor(processes=1) as executor:
+            # Puzzles without a deadline go last
+            deadlines = [now + 10, None, now + 30, now + 20]
+            for i, deadline in enumerate(deadlines):
+                future = executor.submit(self.hard[i], deadline)
+                future.add_done_callback(lambda f, i=i: finished.append(i))
+        self.assertEqual(finished, [0, 3, 2, 1])
+
+    def test_expired_while_queued(self):
+        with lanes.TwoLaneExecutor(processes=1) as executor:
+            busy = executor.submit(self.hard[0])
+            expired = executor.submit(self.hard[1], time.monotonic() - 1)
+            with self.assertRaises(lanes.DeadlineExceeded):
+                expired.result()
+            self.assertEqual(busy.result(), solved(self.hard[0]))
+            # An easy puzzle is answered whatever its deadline
+            self.assertEqual(
+                executor.solve(self.easy, time.monotonic() - 1), solved(self.easy)
+            )
+
+    def test_solve_stops_waiting_at_the_deadline(self):
+        with lanes.TwoLaneExecutor(processes=1) as executor:
+            busy = [executor.submit(grid) for grid in self.hard]
+            started = time.monotonic()
+            with self.assertRaises(lanes.DeadlineExceeded):
+                executor.solve(self.hard[0], started + 0.01)
+            self.assertLess(time.monotonic() - started, 1)
+            for future in busy:
+                future.result()
+
+    def test_resize(self):
+        with lanes.TwoLaneExecutor(processes=1) as executor:
+            executor.resize(2)
+            self.assertEqual(executor.processes, 2)
+            self.assertEqual(executor.solve(self.hard[0]), solved(self.hard[0]))
+
+    def test_closed(self):
+        executor = lanes.TwoLaneExecutor(processes=1)
+        executor.close()
+        with self.assertRaises(RuntimeError):
+            executor.submit(self.easy)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import contextlib
+import io
+import socket
+import threading
+import time
+import unittest
+
+from ai_soduku_solver import loadtest
+from ai_soduku_solver import service
+
+
+class TestLoadResult(unittest.TestCase):
+    def test_percentiles(self):
+        result = loadtest.LoadResult(102, 2, 2.0, [i / 1000 for i in range(100, 0, -1)])
+        self.assertEqual(result.percentile(50), 0.05)
+        self.assertEqual(result.percentile(99), 0.099)
+        self.assertEqual(result.percentile(100), 0.1)
+        self.assertEqual(result.throughput, 50)
+        self.assertAlmostEqual(result.error_rate, 2 / 102)
+        self.assertIn("p99 99.0ms", result.format())
+
+
+class TestRunLoad(unittest.TestCase):
+    grids = [
+        "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+        "11" + "." * 79,
+    ]
+
+    def test_closed_loop(self):
+        target = loadtest.LocalTarget()
+        result = loadtest.run_load(target, self.grids, requests=10, concurrency=3)
+        self.assertEqual(result.requests, 10)
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(len(result.latencies), 10)
+
+    def test_open_loop(self):
+        target = loadtest.LocalTarget()
+        result = loadtest.run_load(target, self.grids, requests=6, rate=200)
+        self.assertEqual(len(result.latencies), 6)
+        # The last request is not due until 25ms in
+        self.assertGreaterEqual(result.seconds, 5 / 200)
+
+    def test_open_loop_keeps_to_the_schedule(self):
+        class SlowTarget:
+            def solve(self, grid):
+                time.sleep(0.2)
+
+        # Ten requests due over 90ms, each taking 200ms: sending only when a
+        # client is free would take a second
+        started = time.perf_counter()
+        result = loadtest.run_load(SlowTarget(), self.grids, requests=10, rate=100)
+        self.assertLess(time.perf_counter() - started, 0.6)
+        self.assertEqual(len(result.latencies), 10)
+
+    def test_errors(self):
+        result = loadtest.run_load(
+            loadtest.LocalTarget(), ["123"], requests=4, concurrency=2
+        )
+        self.assertEqual(result.errors, 4)
+        self.assertEqual(result.error_rate, 1.0)
+
+    def test_http(self):
+        server = service.make_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            target = loadtest.connect(url)
+            self.assertIsInstance(target, loadtest.HttpTarget)
+            result = loadtest.run_load(target, self.grids, requests=6, concurrency=2)
+            self.assertEqual((result.errors, len(result.latencies)), (0, 6))
+            with self.assertRaises(loadtest.RequestError):
+                target.solve("123")
+            target = loadtest.HttpTarget(url, deadline_ms=100)
+            self.assertEqual(target.solve(self.grids[1]), None)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_fallback(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        target = loadtest.connect(f"http://127.0.0.1:{port}")
+        self.assertIsInstance(target, loadtest.LocalTarget)
+
+    def test_main_options(self):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+            io.StringIO()
+        ):
+            self.assertEqual(loadtest.main(["--requests"]), 2)
+            self.assertEqual(loadtest.main(["--requests", "2", "extra"]), 2)
+            self.assertEqual(loadtest.main(["--bogus", "1"]), 2)
+            self.assertEqual(loadtest.main(["--help"]), 0)
+
+    def test_sweep(self):
+        results = loadtest.sweep(self.grids[:1], [1, 2], requests=4, concurrency=2)
+        self.assertEqual([count for count, _ in results], [1, 2])
+        chart = loadtest.format_chart(results)
+        self.assertEqual(len(chart.splitlines()), 3)
+        self.assertIn("#", chart)
+
+
+if __name__ == "__main__":
+    unittest.main()
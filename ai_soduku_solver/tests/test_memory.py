@@ -0,0 +1,36 @@
+import tracemalloc
+import unittest
+
+from ai_soduku_solver import memory
+from ai_soduku_solver import solution
+
+
+class TestProfileSolve(unittest.TestCase):
+    grid = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+
+    def test_report(self):
+        result, report = memory.profile_solve(self.grid)
+        self.assertEqual(result, solution.solve(self.grid))
+        self.assertGreater(report.peak, 0)
+        self.assertGreater(report.peak_live_blocks, 0)
+        self.assertLessEqual(len(report.sites), 5)
+        self.assertIn("peak", report.format())
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_other_methods(self):
+        result, report = memory.profile_solve(self.grid, method="sat")
+        self.assertEqual(result, solution.solve(self.grid))
+        self.assertIsNone(report.peak_live_blocks)
+        self.assertGreater(report.peak, 0)
+
+    def test_already_tracing(self):
+        tracemalloc.start()
+        try:
+            memory.profile_solve(self.grid)
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import itertools
+import unittest
+
+from ai_soduku_solver import iterative
+from ai_soduku_solver import minimal
+from ai_soduku_solver import utils
+
+
+def unique_without(grid, i):
+    grid = grid[:i] + "." + grid[i + 1 :]
+    return len(list(itertools.islice(iterative.iter_solutions(grid), 2))) == 1
+
+
+class TestMinimal(unittest.TestCase):
+    easy = "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3.."
+    hard = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+
+    def test_redundant_clues(self):
+        expected = [
+            box
+            for i, box in enumerate(utils.boxes)
+            if self.easy[i] != "." and unique_without(self.easy, i)
+        ]
+        self.assertEqual(len(expected), 21)
+        self.assertEqual(minimal.redundant_clues(self.easy), expected)
+        self.assertFalse(minimal.is_minimal(self.easy))
+
+    def test_minimal(self):
+        self.assertEqual(minimal.redundant_clues(self.hard), [])
+        self.assertTrue(minimal.is_minimal(self.hard))
+
+    def test_processes(self):
+        self.assertEqual(
+            minimal.redundant_clues(self.easy, processes=2),
+            minimal.redundant_clues(self.easy),
+        )
+        self.assertFalse(minimal.is_minimal(self.easy, processes=2))
+
+    def test_not_unique(self):
+        with self.assertRaises(ValueError):
+            minimal.redundant_clues("." * 81)
+        with self.assertRaises(ValueError):
+            minimal.is_minimal("11" + "." * 79)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+"""Performance regression guard
+
+Skipped unless the SUDOKU_PERF environment variable is set:
+
+    SUDOKU_PERF=1 python -m pytest tests/test_perf.py       # compare to the baseline
+    SUDOKU_PERF=update python -m pytest tests/test_perf.py  # rewrite the baseline
+
+Each stage runs a fixed corpus and records a deterministic count (candidates
+removed or left, search nodes and branches) and a throughput in boards per second.
+The counts must match the baseline in perf_baseline.json exactly: they do not
+depend on the machine, so any change means the algorithm changed. Throughput may
+fall by at most the baseline's tolerance before the test fails. On failure the
+message is a per-stage table of baseline and measured values.
+"""
+import json
+import os
+import time
+import unittest
+
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+
+PERF = os.environ.get("SUDOKU_PERF")
+BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "perf_baseline.json"
+)
+DEFAULT_TOLERANCE = 0.5
+
+CORPUS = [
+    "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    "..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..",
+]
+
+
+def candidates(values):
+    return sum(map(len, values.values()))
+
+
+def prepare(reduce_first):
+    """The corpus as values dictionaries, optionally after eliminate or reduction"""
+    boards = []
+    for grid in CORPUS:
+        values = utils.grid2values(grid)
+        if reduce_first is not None:
+            values = reduce_first(values)
+        boards.append(values)
+    return boards
+
+
+def strategy_stage(strategy, reduce_first=None):
+    """Measure a strategy over the corpus; its count is the candidates removed"""
+    boards = prepare(reduce_first)
+
+    def run():
+        removed = 0
+        for values in boards:
+            values = values.copy()
+            before = candidates(values)
+            removed += before - candidates(strategy(values))
+        return {"removed": removed}
+
+    return run, len(boards)
+
+
+def reduce_stage():
+    boards = prepare(None)
+
+    def run():
+        left = 0
+        for values in boards:
+            left += candidates(solution.reduce_puzzle(values.copy()))
+        return {"candidates": left}
+
+    return run, len(boards)
+
+
+def search_stage():
+    boards = prepare(None)
+
+    def run():
+        stats = solution.SolveStats()
+        for values in boards:
+            solution.search(values.copy(), stats=stats)
+        return {"nodes": stats.nodes, "branches": stats.branches}
+
+    return run, len(boards)
+
+
+STAGES = {
+    "eliminate": lambda: strategy_stage(solution.eliminate),
+    "only_choice": lambda: strategy_stage(solution.only_choice, solution.eliminate),
+    "naked_twins": lambda: strategy_stage(solution.naked_twins, solution.eliminate),
+    "reduce_puzzle": reduce_stage,
+    "search": search_stage,
+}
+
+
+def measure(stage, min_seconds=0.2, repeat=3):
+    """Return the counts of a stage and its best throughput over `repeat` timings"""
+    run, boards = STAGES[stage]()
+    counts = run()
+    best = 0.0
+    for _ in range(repeat):
+        rounds, start = 0, time.perf_counter()
+        while True:
+            run()
+            rounds += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                break
+        best = max(best, rounds * boards / elapsed)
+    return dict(counts, per_second=round(best, 1))
+
+
+def compare(baseline, measured):
+    """Return the rows of the diff table and whether any of them regressed"""
+    tolerance = baseline.get("tolerance", DEFAULT_TOLERANCE)
+    rows, failed = [], False
+    for stage, metrics in baseline["stages"].items():
+        for metric, expected in metrics.items():
+            actual = measured[stage][metric]
+            if metric == "per_second":
+                bad = actual < expected * (1 - tolerance)
+            else:
+                bad = actual != expected
+            failed = failed or bad
+            change = f"{(actual - expected) / expected:+.1%}" if expected else ""
+            mark = "REGRESSED" if bad else ""
+            rows.append((stage, metric, expected, actual, change, mark))
+    return rows, failed
+
+
+def format_table(rows):
+    header = ("stage", "metric", "baseline", "measured", "change", "")
+    lines = [header] + [tuple(map(str, row)) for row in rows]
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip()
+        for line in lines
+    )
+
+
+@unittest.skipUnless(PERF, "set SUDOKU_PERF=1 to run the performance tests")
+class TestPerformance(unittest.TestCase):
+    def test_against_baseline(self):
+        measured = {stage: measure(stage) for stage in STAGES}
+        if PERF == "update":
+            tolerance = DEFAULT_TOLERANCE
+            if os.path.exists(BASELINE):
+                with open(BASELINE) as f:
+                    tolerance = json.load(f).get("tolerance", tolerance)
+            with open(BASELINE, "w") as f:
+                json.dump({"tolerance": tolerance, "stages": measured}, f, indent=2)
+                f.write("\n")
+            self.skipTest(f"baseline written to {BASELINE}")
+
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+        rows, failed = compare(baseline, measured)
+        if failed:
+            self.fail("performance regressed:\n" + format_table(rows))
+
+
+class TestCompare(unittest.TestCase):
+    baseline = {
+        "tolerance": 0.5,
+        "stages": {"search": {"nodes": 10, "per_second": 100.0}},
+    }
+
+    def test_within_tolerance(self):
+        measured = {"search": {"nodes": 10, "per_second": 60.0}}
+        rows, failed = compare(self.baseline, measured)
+        self.assertFalse(failed)
+
+    def test_regressions(self):
+        for measured in (
+            {"search": {"nodes": 11, "per_second": 100.0}},
+            {"search": {"nodes": 10, "per_second": 40.0}},
+        ):
+            rows, failed = compare(self.baseline, measured)
+            self.assertTrue(failed)
+            self.assertIn("REGRESSED", format_table(rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+from ai_soduku_solver import utils
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestBoardRenderer(unittest.TestCase):
+    grid = "2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3"
+
+    @classmethod
+    def setUpClass(cls):
+        from ai_soduku_solver import PySudoku
+        from ai_soduku_solver.objects import SudokuSquare
+
+        cls.PySudoku = PySudoku
+        cls.SudokuSquare = SudokuSquare
+        pygame.init()
+        cls.screen = pygame.display.set_mode((700, 700))
+        cls.background = pygame.image.load(PySudoku.BACKGROUND_IMAGE).convert()
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+    def draw_squares(self, values):
+        """Draw the board the way play() used to, one SudokuSquare per box"""
+        self.screen.blit(self.background, (0, 0))
+        for y in range(9):
+            for x in range(9):
+                value = values[utils.rows[y] + utils.cols[x]]
+                digit = self.PySudoku.square_digit(value)
+                number = int(digit) if digit else None
+                startX, startY = self.PySudoku.square_position(x, y)
+                self.SudokuSquare.SudokuSquare(number, startX, startY, "N", x, y).draw()
+        return pygame.image.tostring(self.screen, "RGB")
+
+    def test_matches_squares(self):
+        values = utils.grid2values(self.grid)
+        expected = self.draw_squares(values)
+        renderer = self.PySudoku.BoardRenderer(self.screen, self.background)
+        self.screen.fill((0, 0, 0))
+        renderer.draw(values)
+        self.assertEqual(pygame.image.tostring(self.screen, "RGB"), expected)
+
+    def test_dirty_rects(self):
+        values = utils.grid2values(self.grid)
+        renderer = self.PySudoku.BoardRenderer(self.screen, self.background)
+        self.assertEqual(renderer.draw(values), [self.screen.get_rect()])
+        self.assertEqual(renderer.draw(values), [])
+        values["A2"] = "4"
+        values["B1"] = "7"
+        self.assertEqual(
+            renderer.draw(values), [renderer.rects["A2"], renderer.rects["B1"]]
+        )
+        self.assertEqual(
+            pygame.image.tostring(self.screen, "RGB"), self.draw_squares(values)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
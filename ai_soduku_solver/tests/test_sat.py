@@ -0,0 +1,53 @@
+import unittest
+
+from ai_soduku_solver import sat
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+
+
+class TestSearchSat(unittest.TestCase):
+    hard_grid = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+
+    def test_matches_search(self):
+        self.assertEqual(
+            solution.solve(self.hard_grid, method="sat"),
+            solution.solve(self.hard_grid),
+        )
+
+    def test_unsolvable(self):
+        values = utils.grid2values("22" + "." * 79)
+        self.assertIs(sat.search_sat(values), False)
+
+    def test_variant_units(self):
+        # With the diagonals added as units, the solution must respect them too
+        diagonals = [
+            [r + c for r, c in zip(utils.rows, utils.cols)],
+            [r + c for r, c in zip(utils.rows, utils.cols[::-1])],
+        ]
+        grid = "2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3"
+        values = sat.search_sat(utils.grid2values(grid), solution.unitlist + diagonals)
+        for unit in diagonals:
+            self.assertEqual(sorted(values[box] for box in unit), list("123456789"))
+
+
+class TestCDCLSolver(unittest.TestCase):
+    def test_pigeonhole_unsat(self):
+        # Three pigeons, two holes: variable 2 * p + h + 1 puts pigeon p in hole h
+        clauses = [[2 * p + 1, 2 * p + 2] for p in range(3)]
+        for h in range(2):
+            for p in range(3):
+                for q in range(p + 1, 3):
+                    clauses.append([-(2 * p + h + 1), -(2 * q + h + 1)])
+        solver = sat.CDCLSolver(6, clauses)
+        self.assertIsNone(solver.solve())
+        self.assertFalse(solver.ok)
+
+    def test_luby(self):
+        self.assertEqual(
+            [sat.luby(i) for i in range(1, 16)],
+            [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
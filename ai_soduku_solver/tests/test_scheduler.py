@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from ai_soduku_solver import scheduler
+from ai_soduku_solver import solution
+from ai_soduku_solver import strategies
+from ai_soduku_solver import utils
+
+
+class TestScheduler(unittest.TestCase):
+    easy_grid = "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3.."
+    hard_grid = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+
+    def test_same_solution(self):
+        for grid in (self.easy_grid, self.hard_grid):
+            values = utils.grid2values(grid)
+            result = solution.search(values, (scheduler.Scheduler(),))
+            self.assertEqual(result, solution.solve(grid))
+
+    def test_easy_puzzles_skip_expensive_strategies(self):
+        sched = scheduler.Scheduler()
+        solution.reduce_puzzle(utils.grid2values(self.easy_grid), (sched,))
+        self.assertIn("eliminate", sched.stats.calls)
+        self.assertNotIn("jellyfish", sched.stats.calls)
+
+    def test_rerank_keeps_unmeasured_strategies_last(self):
+        sched = scheduler.Scheduler(rerank_every=1)
+        for _ in range(3):
+            solution.reduce_puzzle(utils.grid2values(self.easy_grid), (sched,))
+        measured = [s for s in sched.order if s.__name__ in sched.stats.calls]
+        self.assertEqual(list(sched.order[: len(measured)]), measured)
+        self.assertEqual(sched.order[-1], strategies.jellyfish)
+        self.assertLess(
+            sched.order.index(solution.eliminate),
+            sched.order.index(strategies.jellyfish),
+        )
+        self.assertNotIn("jellyfish", sched.stats.calls)
+
+    def test_edited_board_is_reduced_again(self):
+        sched = scheduler.Scheduler((solution.eliminate, solution.only_choice))
+        values = solution.reduce_puzzle(utils.grid2values(self.hard_grid), (sched,))
+        box = next(box for box in utils.boxes if len(values[box]) == 2)
+        digit = solution.solve(self.hard_grid)[box]
+        # Place a digit and give another box one more candidate, in place, so the
+        # candidate count is unchanged
+        values[box] = digit
+        other = next(
+            b
+            for b in utils.boxes
+            if b != box and b not in solution.peers[box] and len(values[b]) < 9
+        )
+        values[other] += next(d for d in "123456789" if d not in values[other])
+        result = sched(values)
+        for peer in solution.peers[box]:
+            self.assertNotIn(digit, result[peer])
+
+    def test_contradiction(self):
+        values = utils.grid2values("11" + "." * 79)
+        self.assertIs(scheduler.Scheduler()(values), False)
+
+    def test_profile(self):
+        profile = scheduler.tune([self.hard_grid])
+        self.assertLessEqual(
+            set(profile), {s.__name__ for s in scheduler.DEFAULT_STRATEGIES}
+        )
+        self.assertGreater(profile["eliminate"]["eliminations"], 0)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            scheduler.save_profile(profile, path)
+            self.assertEqual(scheduler.load_profile(path), profile)
+
+        # A strategy that never removes anything ranks behind one that does
+        profile["x_wing"] = {"calls": 10, "eliminations": 0, "seconds": 1.0}
+        profile["eliminate"] = {"calls": 10, "eliminations": 500, "seconds": 0.01}
+        order = scheduler.Scheduler(profile=profile).order
+        self.assertLess(order.index(solution.eliminate), order.index(strategies.x_wing))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import http.client
+import os
+import signal
+import threading
+import time
+import unittest
+
+from ai_soduku_solver import service
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+
+
+class TestService(unittest.TestCase):
+    grid = "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3.."
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = service.make_server(port=0)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def request(self, method, path, body=None, headers={}):
+        connection = http.client.HTTPConnection(*self.server.server_address)
+        try:
+            connection.request(method, path, body, headers)
+            response = connection.getresponse()
+            return response.status, response.read().decode("ascii").strip()
+        finally:
+            connection.close()
+
+    def test_solve(self):
+        status, body = self.request("POST", "/solve", self.grid)
+        self.assertEqual(status, 200)
+        self.assertEqual(body, utils.values2grid(solution.solve(self.grid)))
+
+    def test_zeros_for_empty_boxes(self):
+        status, body = self.request("POST", "/solve", self.grid.replace(".", "0"))
+        self.assertEqual(status, 200)
+        self.assertEqual(body, utils.values2grid(solution.solve(self.grid)))
+
+    def test_deadline(self):
+        status, body = self.request(
+            "POST", "/solve", self.grid, {"X-Deadline-Ms": "250"}
+        )
+        self.assertEqual(
+            (status, body), (200, utils.values2grid(solution.solve(self.grid)))
+        )
+        status, _ = self.request("POST", "/solve", self.grid, {"X-Deadline-Ms": "soon"})
+        self.assertEqual(status, 400)
+
+    def test_deadline_exceeded(self):
+        hard = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+        self.assertEqual(
+            self.request("POST", "/solve", hard, {"X-Deadline-Ms": "-1"})[0], 504
+        )
+        # The propagation pass answers an easy puzzle whatever its deadline
+        self.assertEqual(
+            self.request("POST", "/solve", self.grid, {"X-Deadline-Ms": "-1"})[0], 200
+        )
+
+    def test_no_solution(self):
+        self.assertEqual(self.request("POST", "/solve", "11" + "." * 79)[0], 422)
+
+    def test_bad_grid(self):
+        self.assertEqual(self.request("POST", "/solve", "123")[0], 400)
+
+    def test_content_length(self):
+        for length, status in (("lots", 400), ("-5", 400), ("1000000", 413)):
+            connection = http.client.HTTPConnection(*self.server.server_address)
+            try:
+                connection.putrequest("POST", "/solve")
+                connection.putheader("Content-Length", length)
+                connection.endheaders()
+                self.assertEqual(connection.getresponse().status, status)
+            finally:
+                connection.close()
+
+    def test_health(self):
+        self.assertEqual(self.request("GET", "/health"), (200, "ok 1"))
+        self.assertEqual(self.request("GET", "/missing")[0], 404)
+
+
+class TestSolveService(unittest.TestCase):
+    def test_workers(self):
+        grid = TestService.grid
+        worker = service.SolveService(processes=2)
+        try:
+            self.assertEqual(
+                worker.solve(grid), utils.values2grid(solution.solve(grid))
+            )
+            self.assertIsNone(worker.solve("11" + "." * 79))
+        finally:
+            worker.close()
+
+    def test_resize(self):
+        grid = TestService.grid
+        worker = service.SolveService()
+        try:
+            for processes in (3, 2, 1):
+                worker.resize(processes)
+                self.assertEqual(worker.processes, processes)
+                self.assertEqual(
+                    worker.solve(grid, time.monotonic() + 1),
+                    utils.values2grid(solution.solve(grid)),
+                )
+            self.assertIsNone(worker.pool)
+        finally:
+            worker.close()
+
+    def test_deadline_exceeded(self):
+        hard = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+        server = service.make_server(port=0, processes=2)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        connection = http.client.HTTPConnection(*server.server_address)
+        try:
+            connection.request("POST", "/solve", hard, {"X-Deadline-Ms": "-1"})
+            response = connection.getresponse()
+            self.assertEqual(response.status, 504)
+        finally:
+            connection.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_deadline_passes_while_waiting(self):
+        hard = [
+            "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+            "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+        ]
+        server = service.make_server(port=0, processes=2)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        connection = http.client.HTTPConnection(*server.server_address)
+        try:
+            # Keep both workers busy so the request is still waiting at its deadline
+            busy = [server.service.pool.submit(grid) for grid in hard * 2]
+            connection.request("POST", "/solve", hard[0], {"X-Deadline-Ms": "10"})
+            response = connection.getresponse()
+            self.assertEqual(response.status, 504)
+            for future in busy:
+                future.result()
+        finally:
+            connection.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_worker_dies(self):
+        hard = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+        server = service.make_server(port=0, processes=2)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        executor = server.service.pool
+        connection = http.client.HTTPConnection(*server.server_address)
+        try:
+            # Stopped workers take the task but cannot answer before they are killed
+            workers = executor.pool.workers
+            for worker in workers:
+                os.kill(worker.pid, signal.SIGSTOP)
+            connection.request("POST", "/solve", hard)
+            started = time.monotonic()
+            while not any(w.task for w in executor.pool._workers):
+                self.assertLess(time.monotonic() - started, 10)
+                time.sleep(0.01)
+            for worker in workers:
+                os.kill(worker.pid, signal.SIGKILL)
+            response = connection.getresponse()
+            self.assertEqual(response.status, 503)
+            # The replacements take the next request
+            response.read()
+            connection.request("POST", "/solve", hard)
+            self.assertEqual(connection.getresponse().status, 200)
+        finally:
+            connection.close()
+            server.shutdown()
+            server.server_close()
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            service.SolveService(method="guess")
+
+
+if __name__ == "__main__":
+    unittest.main()
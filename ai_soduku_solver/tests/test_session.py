@@ -0,0 +1,63 @@
+import unittest
+
+from ai_soduku_solver import session
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+
+
+class TestSudokuSession(unittest.TestCase):
+    grid = "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3.."
+
+    def setUp(self):
+        self.session = session.SudokuSession(self.grid)
+
+    def test_candidates(self):
+        expected = solution.eliminate(utils.grid2values(self.grid))
+        self.assertEqual(self.session.values(), expected)
+
+    def test_set_and_unset(self):
+        before = self.session.values()
+        self.session.set("A1", "4")
+        self.assertEqual(self.session.candidates("A1"), "4")
+        self.assertNotIn("4", self.session.candidates("A2"))
+        self.session.set("A1", "5")
+        self.assertIn("4", self.session.candidates("A2"))
+        self.session.unset("A1")
+        self.assertEqual(self.session.values(), before)
+
+    def test_givens_are_fixed(self):
+        with self.assertRaises(ValueError):
+            self.session.set("A3", "1")
+        with self.assertRaises(ValueError):
+            self.session.unset("A3")
+        with self.assertRaises(ValueError):
+            self.session.set("A1", "0")
+
+    def test_is_solvable(self):
+        answer = solution.solve(self.grid)
+        self.assertTrue(self.session.is_solvable())
+        self.session.set("A1", answer["A1"])
+        self.assertTrue(self.session.is_solvable())
+        wrong = next(d for d in self.session.values()["A2"] if d != answer["A2"])
+        self.session.set("A2", wrong)
+        self.assertFalse(self.session.is_solvable())
+        self.assertIsNone(self.session.hint())
+        self.session.unset("A2")
+        self.assertTrue(self.session.is_solvable())
+
+    def test_conflicts(self):
+        self.session.set("A1", "3")
+        self.assertEqual(sorted(self.session.conflicts()), ["A1", "A3"])
+        self.assertFalse(self.session.is_solvable())
+
+    def test_hints_complete_the_board(self):
+        answer = solution.solve(self.grid)
+        while not self.session.is_complete():
+            box, digit = self.session.hint()
+            self.assertEqual(digit, answer[box])
+            self.session.set(box, digit)
+        self.assertIsNone(self.session.hint())
+
+
+if __name__ == "__main__":
+    unittest.main()
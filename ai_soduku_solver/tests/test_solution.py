@@ -3,8 +3,14 @@ tests does not guarantee that your solution is correct. The Project Asssistant t
 many additional test cases that you must also pass to complete the project. You should write your
 own additional test cases to cover any failed tests shown in the Project Assistant feedback.
 """
+import collections
+import contextlib
+import io
+import os
+import sys
 import unittest
-import solution
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
 
 
 class TestEliminate(unittest.TestCase):
@@ -1328,5 +1334,77 @@ class TestDiagonalSudoku(unittest.TestCase):
         self.assertEqual(solution.solve(self.diagonal_grid), self.solved_diag_sudoku)
 
 
+class TestContradiction(unittest.TestCase):
+    # Two 2s in the first row; 5 has no place left in the first row
+    duplicate_grid = "2.2.............................................................................."
+    no_place_grid = (
+        "......123"
+        "5........"
+        "...5....."
+        "........."
+        "........."
+        "........."
+        "........."
+        "........."
+        "........."
+    )
+
+    def test_eliminate_duplicate(self):
+        values = utils.grid2values(self.duplicate_grid)
+        self.assertIs(solution.eliminate(values), False)
+
+    def test_reduce_puzzle_no_place(self):
+        values = utils.grid2values(self.no_place_grid)
+        self.assertIs(solution.only_choice(solution.eliminate(values)), False)
+        self.assertIs(
+            solution.reduce_puzzle(utils.grid2values(self.no_place_grid)), False
+        )
+
+
+class TestTables(unittest.TestCase):
+    def test_topology(self):
+        self.assertIsInstance(solution.units, collections.defaultdict)
+        self.assertIsInstance(solution.peers, collections.defaultdict)
+        for box in utils.boxes:
+            units = [unit for unit in solution.unitlist if box in unit]
+            self.assertEqual(solution.units[box], units)
+            self.assertEqual(solution.peers[box], set(sum(units, [])) - {box})
+
+    def test_package_imports(self):
+        import ai_soduku_solver
+
+        self.assertIs(solution, ai_soduku_solver.solution)
+        package_dir = os.path.dirname(os.path.abspath(ai_soduku_solver.__file__))
+        self.assertNotIn(package_dir, [os.path.abspath(p) for p in sys.path])
+
+
+class TestMain(unittest.TestCase):
+    easy_grid = "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3.."
+
+    def run_main(self, argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            status = solution.main(argv)
+        return status, out.getvalue()
+
+    def test_solve(self):
+        status, out = self.run_main(["solve", "--method=sat", self.easy_grid])
+        self.assertEqual(status, 0)
+        self.assertEqual(out, utils.values2grid(solution.solve(self.easy_grid)) + "\n")
+
+    def test_unsolvable(self):
+        status, out = self.run_main(["solve", "22" + "." * 79])
+        self.assertEqual((status, out), (1, "\n"))
+
+    def test_usage(self):
+        self.assertEqual(self.run_main([]), (0, solution.USAGE))
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(self.run_main(["solve", "--method", "bogus"])[0], 2)
+            # Only solve and grade read a corpus file
+            for command in ("display", "play", "export"):
+                argv = [command, "--input", "puzzles.sdm", self.easy_grid]
+                self.assertEqual(self.run_main(argv)[0], 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,86 @@
+import threading
+import unittest
+
+from ai_soduku_solver import solution
+from ai_soduku_solver import solver
+from ai_soduku_solver import utils
+from ai_soduku_solver import verify
+
+
+class TestSolver(unittest.TestCase):
+    grid = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+
+    def test_same_as_search(self):
+        stats = solution.SolveStats()
+        expected = solution.search(utils.grid2values(self.grid), stats=stats)
+        context = solver.Solver()
+        self.assertEqual(context.solve(self.grid), expected)
+        self.assertEqual(context.nodes, stats.nodes)
+
+    def test_input_not_modified(self):
+        values = utils.grid2values(self.grid)
+        original = dict(values)
+        context = solver.Solver()
+        context.reduce(values)
+        context.search(values)
+        self.assertEqual(values, original)
+
+    def test_own_topology(self):
+        diagonals = [
+            [r + c for r, c in zip(utils.rows, utils.cols)],
+            [r + c for r, c in zip(utils.rows, reversed(utils.cols))],
+        ]
+        unitlist = solution.unitlist + diagonals
+        result = solver.Solver(unitlist).solve(solution.DIAG_SUDOKU_GRID)
+        self.assertTrue(verify.verify(result, solution.DIAG_SUDOKU_GRID, unitlist))
+        # The module-level topology is untouched
+        self.assertEqual(len(solution.unitlist), 27)
+
+    def test_history(self):
+        context = solver.Solver(record=True)
+        before = dict(utils.history)
+        grid = "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3.."
+        result = context.solve(grid)
+        self.assertEqual(utils.history, before)
+        steps = utils.reconstruct(result, context.history)
+        self.assertEqual(len(steps), grid.count("."))
+        self.assertEqual(context.trace[-1], utils.values2grid(result))
+
+    def test_stats_and_strategies(self):
+        stats = solution.SolveStats()
+        context = solver.Solver(strategies=(solution.naked_twins,), stats=stats)
+        expected = solution.search(
+            utils.grid2values(self.grid),
+            (solution.eliminate, solution.only_choice, solution.naked_twins),
+        )
+        self.assertEqual(context.solve(self.grid), expected)
+        self.assertEqual(set(stats.calls), {"eliminate", "only_choice", "naked_twins"})
+        self.assertEqual(stats.nodes, context.nodes)
+
+    def test_budget(self):
+        result = solver.Solver().solve(self.grid, max_nodes=5)
+        self.assertIsInstance(result, solution.BudgetExceeded)
+        self.assertEqual(result.reason, "max_nodes")
+
+    def test_threads(self):
+        grids = [
+            self.grid,
+            "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+        ]
+        expected = [solution.solve(grid) for grid in grids]
+        results = {}
+
+        def work(i):
+            results[i] = solver.Solver().solve(grids[i % 2])
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i, result in results.items():
+            self.assertEqual(result, expected[i % 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import random
+import unittest
+
+from ai_soduku_solver import solution
+from ai_soduku_solver import symmetry
+from ai_soduku_solver import utils
+
+
+def random_transform(rng):
+    digits = list("123456789")
+    rng.shuffle(digits)
+    return symmetry.Transform(
+        rng.random() < 0.5,
+        rng.choice(symmetry.LINE_ORDERS),
+        rng.choice(symmetry.LINE_ORDERS),
+        dict(zip("123456789", digits)),
+    )
+
+
+class TestSymmetry(unittest.TestCase):
+    grid = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+
+    def test_line_orders(self):
+        self.assertEqual(len(symmetry.LINE_ORDERS), 6**4)
+        self.assertEqual(len(set(symmetry.LINE_ORDERS)), 6**4)
+
+    def test_inverse(self):
+        rng = random.Random(0)
+        for _ in range(10):
+            transform = random_transform(rng)
+            self.assertEqual(
+                transform.inverse().apply(transform.apply(self.grid)), self.grid
+            )
+
+    def test_canonical_form_is_invariant(self):
+        canonical, transform = symmetry.canonical_form(self.grid)
+        self.assertEqual(transform.apply(self.grid), canonical)
+        rng = random.Random(1)
+        for _ in range(5):
+            copy = random_transform(rng).apply(self.grid)
+            self.assertEqual(symmetry.canonical_form(copy)[0], canonical)
+
+    def test_distinct_classes(self):
+        other = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+        self.assertNotEqual(
+            symmetry.canonical_form(self.grid)[0], symmetry.canonical_form(other)[0]
+        )
+
+    def test_empty_grid(self):
+        self.assertEqual(symmetry.canonical_form("." * 81)[0], "." * 81)
+
+    def test_solve_classes(self):
+        rng = random.Random(2)
+        grids = [self.grid] + [random_transform(rng).apply(self.grid) for _ in range(3)]
+        grids.append("11" + "." * 79)
+        self.assertEqual(len(symmetry.group_by_class(grids)), 2)
+
+        calls = []
+
+        def solve(grid):
+            calls.append(grid)
+            return solution.solve(grid)
+
+        results = symmetry.solve_classes(grids, solve)
+        # The propagation pass settles the puzzle with no solution
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(results[-1])
+        for grid, result in zip(grids[:-1], results[:-1]):
+            self.assertEqual(result, utils.values2grid(solution.solve(grid)))
+
+    def test_easy_puzzles_are_not_canonicalized(self):
+        easy = "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3.."
+        calls = []
+
+        def solve(grid):
+            calls.append(grid)
+            return solution.solve(grid)
+
+        grids = [easy, easy, self.grid, self.grid]
+        results = symmetry.solve_classes(grids, solve)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [utils.values2grid(solution.solve(g)) for g in grids])
+
+    def test_non_standard_units(self):
+        diagonals = [[r + c for r, c in zip("ABCDEFGHI", "123456789")]]
+        with self.assertRaises(ValueError):
+            symmetry.solve_classes([self.grid], unitlist=solution.unitlist + diagonals)
+
+
+if __name__ == "__main__":
+    unittest.main()
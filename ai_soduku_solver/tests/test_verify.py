@@ -0,0 +1,74 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+from ai_soduku_solver import verify
+
+
+class TestVerify(unittest.TestCase):
+    puzzle = "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3.."
+
+    def setUp(self):
+        self.solution = utils.values2grid(solution.solve(self.puzzle))
+
+    def test_verify(self):
+        self.assertTrue(verify.verify(solution.solve(self.puzzle), self.puzzle))
+        self.assertTrue(verify.verify(self.solution, self.puzzle))
+        self.assertFalse(verify.verify(False, self.puzzle))
+        self.assertFalse(verify.verify(None, self.puzzle))
+
+    def test_givens_must_be_kept(self):
+        # A valid board that relabels digits 1 and 2 keeps no givens of 1 or 2
+        swapped = self.solution.translate(str.maketrans("12", "21"))
+        self.assertTrue(verify.verify(swapped, "." * 81))
+        self.assertFalse(verify.verify(swapped, self.puzzle))
+
+    def test_units_must_be_permutations(self):
+        broken = "1" + self.solution[1:]
+        self.assertFalse(verify.verify(broken, "." * 81))
+        self.assertFalse(verify.verify(self.puzzle, "." * 81))
+
+    def test_diagonal_units(self):
+        diagonals = [
+            [r + c for r, c in zip(utils.rows, utils.cols)],
+            [r + c for r, c in zip(utils.rows, reversed(utils.cols))],
+        ]
+        grid = solution.DIAG_SUDOKU_GRID
+        result = solution.solve(grid)
+        self.assertFalse(verify.verify(result, grid, solution.unitlist + diagonals))
+
+    def test_search_failure_is_false(self):
+        self.assertIs(solution.search(utils.grid2values("11" + "." * 79)), False)
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestVerifyBatch(unittest.TestCase):
+    puzzle = TestVerify.puzzle
+
+    def test_verify_batch(self):
+        good = utils.values2grid(solution.solve(self.puzzle))
+        swapped = good.translate(str.maketrans("12", "21"))
+        broken = "1" + good[1:]
+        solutions = [good, swapped, broken, self.puzzle]
+        expected = [verify.verify(s, self.puzzle) for s in solutions]
+        self.assertEqual(expected, [True, False, False, False])
+        result = verify.verify_batch(solutions, [self.puzzle] * len(solutions))
+        self.assertEqual(result.tolist(), expected)
+
+    def test_chunks(self):
+        good = utils.values2grid(solution.solve(self.puzzle))
+        count = verify.CHUNK_SIZE + 3
+        solutions = verify.to_array([good] * count)
+        solutions[-1, 0] = 0
+        result = verify.verify_batch(solutions, [self.puzzle] * count)
+        self.assertEqual(result.sum(), count - 1)
+        self.assertFalse(result[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
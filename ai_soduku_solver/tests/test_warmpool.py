@@ -0,0 +1,115 @@
+import gc
+import os
+import signal
+import time
+import unittest
+
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+from ai_soduku_solver import warmpool
+
+
+class TestWarmPool(unittest.TestCase):
+    grids = [
+        "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+        "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+        "11" + "." * 79,
+    ]
+
+    def expected(self):
+        results = []
+        for grid in self.grids:
+            result = solution.solve(grid)
+            results.append(utils.values2grid(result) if result else None)
+        return results
+
+    def test_solve(self):
+        with warmpool.WarmPool(processes=2) as pool:
+            self.assertEqual(pool.processes, 2)
+            self.assertEqual(pool.map(self.grids), self.expected())
+            self.assertEqual(pool.solve(self.grids[0]), self.expected()[0])
+
+    def test_resize(self):
+        with warmpool.WarmPool(processes=1) as pool:
+            pool.resize(3)
+            self.assertEqual(pool.processes, 3)
+            self.assertTrue(all(worker.is_alive() for worker in pool.workers))
+            futures = [pool.submit(grid) for grid in self.grids * 2]
+            pool.resize(1)
+            self.assertEqual(pool.processes, 1)
+            self.assertEqual([f.result() for f in futures], self.expected() * 2)
+            with self.assertRaises(ValueError):
+                pool.resize(0)
+
+    def test_shrink_does_not_wait_for_the_queue(self):
+        hard = self.grids[1]
+        with warmpool.WarmPool(processes=2) as pool:
+            futures = [pool.submit(hard) for _ in range(8)]
+            started = time.perf_counter()
+            pool.resize(1)
+            elapsed = time.perf_counter() - started
+            self.assertEqual(pool.processes, 1)
+            results = [f.result() for f in futures]
+            # Shrinking waits for at most the task in hand, not the whole queue
+            self.assertLess(elapsed, (time.perf_counter() - started) / 2)
+            self.assertEqual(results, [self.expected()[1]] * 8)
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 10
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_idle_worker_dies(self):
+        with warmpool.WarmPool(processes=2) as pool:
+            os.kill(pool.workers[0].pid, signal.SIGKILL)
+            self.wait_for(lambda: pool.replaced == 1)
+            self.assertEqual(pool.processes, 2)
+            self.assertEqual(pool.map(self.grids), self.expected())
+
+    def test_busy_worker_dies(self):
+        with warmpool.WarmPool(processes=1) as pool:
+            future = pool.submit(self.grids[1])
+            queued = pool.submit(self.grids[0])
+            os.kill(pool.workers[0].pid, signal.SIGKILL)
+            with self.assertRaises(warmpool.WorkerDied):
+                future.result(timeout=10)
+            # The queued task goes to the replacement
+            self.assertEqual(queued.result(timeout=10), self.expected()[0])
+            self.assertEqual(pool.processes, 1)
+            self.assertEqual(pool.replaced, 1)
+
+    def test_replacement_fails(self):
+        with warmpool.WarmPool(processes=1) as pool:
+            future = pool.submit(self.grids[1])
+            queued = pool.submit(self.grids[0])
+
+            def fail(count):
+                raise RuntimeError("A worker failed to start")
+
+            pool._start_workers = fail
+            os.kill(pool.workers[0].pid, signal.SIGKILL)
+            with self.assertRaises(warmpool.WorkerDied):
+                future.result(timeout=10)
+            # With no worker left the queued task fails rather than hangs
+            with self.assertRaisesRegex(RuntimeError, "failed to start"):
+                queued.result(timeout=10)
+            self.assertEqual(pool.processes, 0)
+
+    def test_parent_not_frozen(self):
+        with warmpool.WarmPool(processes=1):
+            self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_closed(self):
+        pool = warmpool.WarmPool(processes=1)
+        pool.close()
+        with self.assertRaises(RuntimeError):
+            pool.submit(self.grids[0])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            warmpool.WarmPool(method="guess")
+
+
+if __name__ == "__main__":
+    unittest.main()
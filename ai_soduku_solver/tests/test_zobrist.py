@@ -0,0 +1,57 @@
+import unittest
+
+from ai_soduku_solver import solution
+from ai_soduku_solver import utils
+from ai_soduku_solver import zobrist
+
+
+class TestZobristHash(unittest.TestCase):
+    grid = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+
+    def test_incremental_update(self):
+        values = utils.grid2values(self.grid)
+        key = zobrist.zobrist_hash(values)
+        old = values["A2"]
+        values["A2"] = "5"
+        self.assertEqual(
+            zobrist.update(key, "A2", old, "5"), zobrist.zobrist_hash(values)
+        )
+
+    def test_distinguishes_states(self):
+        values = utils.grid2values(self.grid)
+        other = dict(values, A2="12")
+        self.assertNotEqual(zobrist.zobrist_hash(values), zobrist.zobrist_hash(other))
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_policies(self):
+        always = zobrist.TranspositionTable(size=4, policy="always")
+        depth = zobrist.TranspositionTable(size=4, policy="depth")
+        for table in (always, depth):
+            table.store(1, weight=5)
+            table.store(5, weight=1)  # same slot as 1
+        self.assertNotIn(1, always)
+        self.assertIn(5, always)
+        self.assertIn(1, depth)
+        self.assertNotIn(5, depth)
+        self.assertEqual(len(depth), 1)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            zobrist.TranspositionTable(policy="bogus")
+
+    def test_search_reuses_dead_states(self):
+        grid = TestZobristHash.grid
+        ttable = zobrist.TranspositionTable()
+        first, second = solution.SolveStats(), solution.SolveStats()
+        result = solution.search(utils.grid2values(grid), stats=first, ttable=ttable)
+        self.assertEqual(result, solution.solve(grid))
+        # The dead branches of the first run are pruned on sight the second time
+        result = solution.search(utils.grid2values(grid), stats=second, ttable=ttable)
+        self.assertEqual(result, solution.solve(grid))
+        self.assertLess(second.nodes, first.nodes)
+        self.assertGreater(ttable.hits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Measure how solving throughput scales with threads
+
+Each thread gets its own `solver.Solver` and solves the same share of a fixed
+corpus. On a standard CPython build the GIL serializes the threads, so throughput
+stays flat; on a free-threaded build (3.13t and later) it should grow with the
+number of cores.
+
+usage: python -m ai_soduku_solver.thread_scaling [THREADS ...]
+       (default: 1 2 4 8)
+"""
+import os
+import sys
+import threading
+import time
+
+from . import solver
+
+CORPUS = [
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+    "6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....",
+    "48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5....",
+    "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8..2.3..9..5.1.3..",
+]
+
+
+def run(threads, rounds=1):
+    """Solve the corpus `rounds` times on each of `threads` threads
+
+    Returns
+    -------
+    float
+        the puzzles solved per second over all threads
+    """
+    start = threading.Barrier(threads + 1)
+
+    def work():
+        context = solver.Solver()
+        start.wait()
+        for _ in range(rounds):
+            for grid in CORPUS:
+                context.solve(grid)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    start.wait()
+    began = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return threads * rounds * len(CORPUS) / (time.perf_counter() - began)
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    counts = [int(arg) for arg in argv] or [1, 2, 4, 8]
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, "
+        f"{os.cpu_count()} CPUs"
+    )
+    print(f"{'threads':>7}  {'puzzles/s':>10}  {'speedup':>7}")
+    base = None
+    for threads in counts:
+        rate = run(threads)
+        base = base or rate
+        print(f"{threads:>7}  {rate:>10.1f}  {rate / base:>6.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -27,9 +27,11 @@ def extract_units(unitlist, boxes):
     """
     # the value for keys that aren't in the dictionary are initialized as an empty list
     units = defaultdict(list)
-    for current_box in boxes:
-        for unit in unitlist:
-            if current_box in unit:
+    # One pass over the units rather than one per box keeps importing solution cheap
+    members = set(boxes)
+    for unit in unitlist:
+        for current_box in unit:
+            if current_box in members:
                 # defaultdict avoids this raising a KeyError when new keys are added
                 units[current_box].append(unit)
     return units
@@ -58,15 +60,14 @@ def extract_peers(units, boxes):
     # the value for keys that aren't in the dictionary are initialized as an empty list
     peers = defaultdict(set)  # set avoids duplicates
     for key_box in boxes:
-        for unit in units[key_box]:
-            for peer_box in unit:
-                if peer_box != key_box:
-                    # defaultdict avoids this raising a KeyError when new keys are added
-                    peers[key_box].add(peer_box)
+        peer_boxes = set().union(*units[key_box])
+        peer_boxes.discard(key_box)
+        if peer_boxes:
+            peers[key_box] = peer_boxes
     return peers
 
 
-def assign_value(values, box, value):
+def assign_value(values, box, value, history=history):
     """You must use this function to update your values dictionary if you want to
     try using the provided visualization tool. This function records each assignment
     (in order) for later reconstruction.
@@ -76,6 +77,9 @@ def assign_value(values, box, value):
     values(dict)
         a dictionary of the form {'box_name': '123456789', ...}
 
+    history(dict)
+        where to record the assignment; defaults to the module-level history
+
     Returns
     -------
     dict
@@ -0,0 +1,145 @@
+"""Verification of solved Sudoku boards
+
+`verify` checks one solution the straightforward way. `verify_batch` checks many at
+once with NumPy: the boards are stacked into an (N, 81) array of digits, each
+digit d becomes the bit 1 << d, and a unit is a permutation of 1-9 exactly when
+the OR of its nine bits is 0b1111111110. Each OR runs over a whole chunk of boards
+at once, so the Python loop is per box of a unit, not per board.
+
+Both check against a unit list, by default `solution.unitlist`, so whatever units
+the solver enforces (diagonals included) are verified too.
+
+NumPy is only needed for `verify_batch`.
+"""
+from . import solution
+from . import utils
+
+DIGITS = "123456789"
+ALL_DIGITS_MASK = 0b1111111110
+CHUNK_SIZE = 1 << 16
+
+
+def _grid(board):
+    """Return a board given as a values dictionary or a grid string as a grid string"""
+    if isinstance(board, dict):
+        return utils.values2grid(board)
+    return board
+
+
+def verify(values, puzzle, unitlist=None):
+    """Check that a solution is a completed, valid board for a puzzle
+
+    Parameters
+    ----------
+    values(dict)
+        the solution, a dictionary of the form {'box_name': '1', ...} or a grid
+        string; False or None (as returned for unsolvable puzzles) never verify
+
+    puzzle(string)
+        the puzzle it should solve, as a grid string or a values dictionary
+
+    unitlist(list)
+        the units that must each hold every digit once; defaults to
+        `solution.unitlist`
+
+    Returns
+    -------
+    bool
+        True if every box holds one digit, the givens of the puzzle are kept and
+        every unit is a permutation of 1-9
+    """
+    if not values:
+        return False
+    if unitlist is None:
+        unitlist = solution.unitlist
+    if isinstance(values, str):
+        values = dict(zip(utils.boxes, values))
+    if any(
+        values.get(box, "") not in DIGITS or len(values[box]) != 1
+        for box in utils.boxes
+    ):
+        return False
+    for box, given in zip(utils.boxes, _grid(puzzle)):
+        if given in DIGITS and values[box] != given:
+            return False
+    return all(
+        len(unit) == len(DIGITS) and set(values[box] for box in unit) == set(DIGITS)
+        for unit in unitlist
+    )
+
+
+def to_array(boards):
+    """Stack boards into an (N, 81) uint8 array of digits, 0 for empty boxes
+
+    Parameters
+    ----------
+    boards(iterable)
+        grid strings or values dictionaries, or an array that is returned as is
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+    import numpy as np
+
+    if isinstance(boards, np.ndarray):
+        return boards
+    data = "".join(_grid(board) for board in boards).encode("ascii")
+    digits = np.frombuffer(data, dtype=np.uint8).reshape(-1, len(utils.boxes)) - 48
+    # '.' and anything else that is not a digit is an empty box
+    digits[digits > 9] = 0
+    return digits
+
+
+def verify_batch(solutions, puzzles, unitlist=None):
+    """Check many solutions at once; see `verify`
+
+    Parameters
+    ----------
+    solutions(iterable)
+        the solutions, as grid strings, values dictionaries or an (N, 81) array of
+        digits as returned by `to_array`
+
+    puzzles(iterable)
+        the puzzles they should solve, in the same forms and order
+
+    unitlist(list)
+        the units that must each hold every digit once; defaults to
+        `solution.unitlist`
+
+    Returns
+    -------
+    numpy.ndarray
+        an array of N booleans, True where the solution verifies
+    """
+    import numpy as np
+
+    if unitlist is None:
+        unitlist = solution.unitlist
+    index = {box: i for i, box in enumerate(utils.boxes)}
+    units = np.array([[index[box] for box in unit] for unit in unitlist])
+    if units.shape[1:] != (len(DIGITS),):
+        raise ValueError("Every unit must have 9 boxes")
+
+    solutions = to_array(solutions)
+    puzzles = to_array(puzzles)
+    if solutions.shape != puzzles.shape:
+        raise ValueError("There must be one puzzle per solution")
+
+    valid = np.empty(len(solutions), dtype=bool)
+    for start in range(0, len(solutions), CHUNK_SIZE):
+        board = solutions[start : start + CHUNK_SIZE]
+        given = puzzles[start : start + CHUNK_SIZE]
+        ok = ((board >= 1) & (board <= 9)).all(axis=1)
+        ok &= ((given == 0) | (given == board)).all(axis=1)
+        # Clamp out of range digits so the shift cannot overflow; they already
+        # failed. One row per box keeps each OR over contiguous memory
+        masks = np.left_shift(np.uint16(1), np.minimum(board, 15).astype(np.uint16))
+        masks = np.ascontiguousarray(masks.T)
+        for unit in units:
+            seen = masks[unit[0]] | masks[unit[1]]
+            for box in unit[2:]:
+                seen |= masks[box]
+            ok &= seen == ALL_DIGITS_MASK
+        valid[start : start + len(board)] = ok
+    return valid
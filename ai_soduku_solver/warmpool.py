@@ -0,0 +1,425 @@
+"""A pre-forked pool of warm solver processes
+
+A worker started with spawn (the default on Windows and macOS) imports `solution`
+and `utils` from scratch and re-runs every module-level computation before it can
+solve anything, and even a forked `multiprocessing.Pool` worker pays for its first
+solve's cold caches. `WarmPool` does that work once, in the parent:
+
+- `warm_up` imports the solver modules, which builds the topology tables, and
+  solves a puzzle with every engine the pool will use, so lazily imported
+  engines and interned strings are in place
+- just before forking, `gc.freeze` moves everything the parent has allocated
+  into a permanent generation the collector never scans, so the collectors of
+  the workers do not write to, and so copy, the pages holding the shared tables;
+  the parent unfreezes its own objects again as soon as the workers are forked
+- workers are forked from the warm parent, so they start with the topology and
+  lookup tables already in memory, shared copy-on-write, and can take a request
+  as soon as the fork returns
+
+Every worker has its own pipe and the parent hands a task to one idle worker at a
+time, keeping the rest queued in the parent. The pool therefore always knows
+which task each worker holds: `resize` can retire idle workers at once while
+queued tasks wait for the workers that remain, and a worker that dies is noticed
+through its process sentinel, its task failed with `WorkerDied` and a replacement
+started. New workers are started and waited for without holding the pool's lock,
+so the running workers' results keep being delivered meanwhile.
+
+The first workers are forked before the pool starts its own thread. Workers
+started later, by `resize` or to replace a dead one, are forked from a parent
+that is running threads (the pool's, and those of a server using it). Only the
+forking thread exists in the child, so a lock another thread held at that moment
+stays locked there for good; the workers only use their pipe and the solver
+modules, which take no such locks, but code run in them must not rely on
+locks shared with other parent threads. Where fork is not available the pool
+falls back to the default start method and each worker warms itself up before
+reporting ready.
+"""
+import collections
+import gc
+import itertools
+import multiprocessing
+import threading
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+
+from . import solution
+from . import utils
+
+WARM_UP_GRID = (
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+)
+
+# Tells a worker to exit
+_STOP = None
+# Sent by a worker once it is ready for its first task
+_READY = "ready"
+
+
+class WorkerDied(RuntimeError):
+    """A worker process exited while solving a puzzle"""
+
+
+def warm_up(method="search"):
+    """Load and exercise everything a solve with `method` needs"""
+    result = solution.solve(WARM_UP_GRID, method)
+    return utils.values2grid(result) if result else None
+
+
+def _worker(connection, method, warm):
+    if not warm:
+        warm_up(method)
+    connection.send(_READY)
+    while True:
+        task = connection.recv()
+        if task is _STOP:
+            return
+        key, grid = task
+        try:
+            result = solution.solve(grid, method)
+            connection.send((key, utils.values2grid(result) if result else None, None))
+        except Exception as e:
+            connection.send((key, None, repr(e)))
+
+
+class _Worker:
+    """A worker process, the parent's end of its pipe and the task it holds"""
+
+    def __init__(self, process, connection):
+        self.process = process
+        self.connection = connection
+        self.task = None
+        self.retiring = False
+
+
+class WarmPool:
+    """Long-lived solver processes, forked from a warmed-up parent
+
+    Parameters
+    ----------
+    processes(int)
+        the number of workers to start with; defaults to the number of CPUs
+
+    method(string)
+        the search engine the workers pass on to `solution.solve`
+
+    Attributes
+    ----------
+    start_method(string)
+        "fork" when available, otherwise the default start method
+
+    replaced(int)
+        the number of workers that died and were replaced
+    """
+
+    def __init__(self, processes=None, method="search"):
+        if method not in solution.SEARCH_METHODS:
+            raise ValueError(f"Unknown search method: {method}")
+        self.method = method
+        if "fork" in multiprocessing.get_all_start_methods():
+            self.start_method = "fork"
+        else:
+            self.start_method = multiprocessing.get_start_method()
+        self._context = multiprocessing.get_context(self.start_method)
+        self._warm = self.start_method == "fork"
+        if self._warm:
+            warm_up(method)
+        self.replaced = 0
+        self._keys = itertools.count()
+        # Tasks no worker has taken yet, as (key, grid)
+        self._queue = collections.deque()
+        self._futures = {}
+        self._workers = []
+        self._closed = False
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        # Resizes, and forks with their gc.freeze, take turns under these rather
+        # than the lock the collector needs to deliver results
+        self._resizing = threading.Lock()
+        self._forking = threading.Lock()
+        # Replacements being started for workers that died
+        self._replacing = 0
+        # Written to whenever the set of workers changes, to wake the collector
+        self._wake_reader, self._wake_writer = self._context.Pipe(duplex=False)
+        self.resize(processes or multiprocessing.cpu_count())
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    @property
+    def workers(self):
+        """The processes of the workers that are not retiring"""
+        with self._lock:
+            return [w.process for w in self._workers if not w.retiring]
+
+    @property
+    def processes(self):
+        """The number of live workers that are not retiring"""
+        with self._lock:
+            return sum(
+                1 for w in self._workers if not w.retiring and w.process.is_alive()
+            )
+
+    def _start_workers(self, count):
+        """Fork (or spawn) `count` workers and wait until each is ready
+
+        Call without the lock held: the results of the running workers are
+        delivered while the new ones start and warm up.
+        """
+        started = []
+        with self._forking:
+            if self._warm:
+                gc.freeze()
+            try:
+                for _ in range(count):
+                    parent, child = self._context.Pipe()
+                    process = self._context.Process(
+                        target=_worker,
+                        args=(child, self.method, self._warm),
+                        daemon=True,
+                    )
+                    process.start()
+                    child.close()
+                    started.append(_Worker(process, parent))
+            finally:
+                if self._warm:
+                    gc.unfreeze()
+        for worker in started:
+            try:
+                ready = worker.connection.recv() == _READY
+            except (EOFError, OSError):
+                ready = False
+            if not ready:
+                self._stop(started)
+                raise RuntimeError("A worker failed to start")
+        return started
+
+    def _stop(self, workers):
+        """Stop workers that were never handed to the collector"""
+        for worker in workers:
+            try:
+                worker.connection.send(_STOP)
+            except OSError:
+                pass
+            worker.process.join(1)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            worker.connection.close()
+
+    def _wake(self):
+        self._wake_writer.send_bytes(b"")
+
+    def _dispatch(self):
+        """Hand queued tasks to idle workers; call with the lock held"""
+        for worker in self._workers:
+            if worker.task is not None or not self._queue:
+                continue
+            if worker.retiring:
+                continue
+            worker.task = self._queue.popleft()
+            try:
+                worker.connection.send(worker.task)
+            except OSError:
+                # The worker died; the collector fails the task and replaces it
+                pass
+
+    def _finish(self, key, result=None, error=None):
+        future = self._futures.pop(key, None)
+        if future is None:
+            return
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def _collect(self):
+        """Route results to their futures and replace workers that die"""
+        while True:
+            with self._lock:
+                if self._closed and not self._workers:
+                    return
+                watched = {self._wake_reader: None}
+                for worker in self._workers:
+                    watched[worker.connection] = worker
+                    watched[worker.process.sentinel] = worker
+            for ready in wait(list(watched)):
+                worker = watched[ready]
+                if worker is None:
+                    self._wake_reader.recv_bytes()
+                elif ready is worker.connection:
+                    self._receive(worker)
+                else:
+                    self._exited(worker)
+
+    def _receive(self, worker):
+        try:
+            key, result, error = worker.connection.recv()
+        except (EOFError, OSError):
+            # The sentinel reports the death
+            return
+        with self._lock:
+            worker.task = None
+            if error is not None:
+                error = RuntimeError(f"Worker failed: {error}")
+            self._finish(key, result, error)
+            if worker.retiring:
+                try:
+                    worker.connection.send(_STOP)
+                except OSError:
+                    pass
+            self._dispatch()
+            self._changed.notify_all()
+
+    def _exited(self, worker):
+        worker.process.join()
+        with self._lock:
+            if worker not in self._workers:
+                return
+            self._workers.remove(worker)
+            # A result sent just before exiting may still be in the pipe
+            try:
+                while worker.connection.poll():
+                    key, result, error = worker.connection.recv()
+                    worker.task = None
+                    if error is not None:
+                        error = RuntimeError(f"Worker failed: {error}")
+                    self._finish(key, result, error)
+            except (EOFError, OSError):
+                pass
+            worker.connection.close()
+            died = not worker.retiring and not self._closed
+            if worker.task is not None:
+                key = worker.task[0]
+                self._finish(
+                    key,
+                    error=WorkerDied(
+                        f"Worker {worker.process.pid} exited with code "
+                        f"{worker.process.exitcode}"
+                    ),
+                )
+            if died:
+                # Started on a thread of its own so the collector carries on
+                self._replacing += 1
+                threading.Thread(target=self._replace, daemon=True).start()
+            self._changed.notify_all()
+
+    def _replace(self):
+        """Start a worker in place of one that died"""
+        started, error = [], None
+        try:
+            started = self._start_workers(1)
+        except RuntimeError as e:
+            error = e
+        with self._lock:
+            self._replacing -= 1
+            closed = self._closed
+            if started and not closed:
+                self._workers += started
+                self.replaced += 1
+                self._dispatch()
+            elif error is not None and all(w.retiring for w in self._workers):
+                # No worker is left to take the queued tasks
+                while self._queue:
+                    key, _ = self._queue.popleft()
+                    self._finish(key, error=error)
+            self._changed.notify_all()
+        if started and closed:
+            self._stop(started)
+        self._wake()
+
+    def resize(self, processes):
+        """Grow or shrink the pool, returning once the new size is in effect
+
+        New workers are ready to solve when this returns. Idle workers retire at
+        once and busy ones as soon as they finish the task they are on; queued
+        tasks go to the workers that remain.
+        """
+        if processes < 1:
+            raise ValueError("A pool needs at least one worker")
+        with self._resizing:
+            self._resize(processes)
+
+    def _resize(self, processes):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The pool is closed")
+            active = [w for w in self._workers if not w.retiring]
+            missing = processes - len(active) - self._replacing
+            if len(active) >= processes:
+                # Retire idle workers before busy ones
+                active.sort(key=lambda w: w.task is None, reverse=True)
+                for worker in active[: len(active) - processes]:
+                    worker.retiring = True
+                    if worker.task is None:
+                        try:
+                            worker.connection.send(_STOP)
+                        except OSError:
+                            # It died; the collector removes it
+                            pass
+        if missing > 0:
+            started = self._start_workers(missing)
+            with self._lock:
+                closed = self._closed
+                if not closed:
+                    self._workers += started
+                    self._dispatch()
+            if closed:
+                self._stop(started)
+                raise RuntimeError("The pool is closed")
+        with self._lock:
+            retiring = [w for w in self._workers if w.retiring]
+        if not hasattr(self, "_collector"):
+            return
+        self._wake()
+        with self._lock:
+            while any(w in self._workers for w in retiring):
+                self._changed.wait()
+
+    def submit(self, grid):
+        """Queue a puzzle; returns a Future for its solved grid string or None
+
+        The future raises `WorkerDied` if the worker solving the puzzle exits.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The pool is closed")
+            key = next(self._keys)
+            self._futures[key] = future
+            self._queue.append((key, grid))
+            self._dispatch()
+        return future
+
+    def solve(self, grid, timeout=None):
+        """Return the solved grid string, or None if the puzzle has no solution
+
+        Raises concurrent.futures.TimeoutError if no answer came within `timeout`
+        seconds.
+        """
+        return self.submit(grid).result(timeout)
+
+    def map(self, grids):
+        """Solve many puzzles, returning the results in order"""
+        return [future.result() for future in [self.submit(g) for g in grids]]
+
+    def close(self):
+        """Stop the workers once they finish any queued work"""
+        with self._lock:
+            if self._closed:
+                return
+            while self._queue or any(w.task is not None for w in self._workers):
+                self._changed.wait()
+            self._closed = True
+            for worker in self._workers:
+                worker.retiring = True
+                try:
+                    worker.connection.send(_STOP)
+                except OSError:
+                    pass
+        self._wake()
+        self._collector.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,146 @@
+"""Zobrist hashing of candidate states and a transposition table of dead states
+
+Every (box, digit) candidate gets a fixed random 64-bit key, and the hash of a
+values dictionary is the XOR of the keys of all the candidates it still allows.
+Because XOR is its own inverse, changing one box only needs the keys of its old
+and new candidates, so `solution.search` hashes the board of each guess from its
+parent's in O(1). The board that propagation then reduces it to is rehashed in
+full: propagation can change dozens of boxes, and diffing the two boards (which
+needs a copy, since the strategies work in place) costs more than the 81
+memoized lookups of a rehash.
+
+A candidate state with no solution is dead however it was reached, so the hash
+keys a `TranspositionTable` of dead states: when the search reaches one again by a
+different assignment order it is pruned without re-running `reduce_puzzle` or
+re-exploring the subtree. Within one solve that rarely happens, since a depth
+first search that fixes one box per level seldom reaches the same state twice;
+the table pays off when it is kept across solves of the same or overlapping
+puzzles. The same hash can key any other cache of board states.
+"""
+from . import utils
+
+DIGITS = "123456789"
+SEED = 0x5EED5EED
+MASK = (1 << 64) - 1
+
+# Memoized keys of whole candidate strings, per box; filled in on first use, so
+# importing this module (which `solution` does) costs next to nothing
+_candidate_keys = {box: {} for box in utils.boxes}
+
+
+def digit_key(box, digit):
+    """Return the fixed random 64-bit key of one candidate
+
+    The keys are the SplitMix64 sequence from SEED, computed directly from the
+    candidate's position rather than drawn from `random` in order.
+    """
+    z = (SEED + (utils.boxes.index(box) * 9 + int(digit)) * 0x9E3779B97F4A7C15) & MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK
+    return z ^ (z >> 31)
+
+
+def candidate_key(box, candidates):
+    """Return the XOR of the keys of the candidates a box allows"""
+    keys = _candidate_keys[box]
+    key = keys.get(candidates)
+    if key is None:
+        key = 0
+        for digit in candidates:
+            key ^= digit_key(box, digit)
+        keys[candidates] = key
+    return key
+
+
+def zobrist_hash(values):
+    """Hash a candidate state
+
+    Parameters
+    ----------
+    values(dict)
+        a dictionary of the form {'box_name': '123456789', ...}
+
+    Returns
+    -------
+    int
+        a 64-bit hash of the candidates allowed in every box
+    """
+    key = 0
+    for box, candidates in values.items():
+        key ^= candidate_key(box, candidates)
+    return key
+
+
+def update(key, box, old, new):
+    """Update a hash for one box changing from the `old` to the `new` candidates"""
+    return key ^ candidate_key(box, old) ^ candidate_key(box, new)
+
+
+class TranspositionTable:
+    """A fixed-size hash table of dead candidate states
+
+    Each state hashes to one slot (its key modulo the size), so lookups and stores
+    are O(1) and memory is bounded. When two states compete for a slot the
+    replacement policy decides which one is kept:
+
+    - "always": the newest state replaces the old one
+    - "depth": the state whose subtree took more branches to refute is kept, since
+      it saves the most work if it is reached again
+
+    Parameters
+    ----------
+    size(int)
+        the number of slots
+
+    policy(string)
+        the replacement policy, "always" or "depth"
+    """
+
+    POLICIES = ("always", "depth")
+
+    def __init__(self, size=1 << 16, policy="always"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy!r}")
+        self.size = size
+        self.policy = policy
+        self.keys = [None] * size
+        self.weights = [0] * size
+        self.hits = 0
+        self.stores = 0
+
+    def __contains__(self, key):
+        if self.keys[key % self.size] == key:
+            self.hits += 1
+            return True
+        return False
+
+    def __len__(self):
+        return self.size - self.keys.count(None)
+
+    def store(self, key, weight=0):
+        """Record a dead state
+
+        Parameters
+        ----------
+        key(int)
+            the Zobrist hash of the state
+
+        weight(int)
+            the work it took to refute the state, e.g. the branches explored
+        """
+        i = key % self.size
+        if (
+            self.policy == "depth"
+            and self.keys[i] is not None
+            and self.keys[i] != key
+            and self.weights[i] > weight
+        ):
+            return
+        self.keys[i] = key
+        self.weights[i] = weight
+        self.stores += 1
+
+    def clear(self):
+        """Forget every stored state"""
+        self.keys = [None] * self.size
+        self.weights = [0] * self.size